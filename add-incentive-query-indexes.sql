@@ -0,0 +1,11 @@
+-- Composite indexes matching the incentive lookup query shapes
+-- Requires MySQL 8.0+ for descending index parts
+
+-- find_matching_incentives / find_and_rank_incentives / get_all_incentives:
+-- equality on is_active, then rows already ordered by percentage DESC, with the
+-- remaining filter columns available for index condition pushdown
+CREATE INDEX idx_incentives_active_pct ON film_incentives(is_active, percentage DESC, expires_at, minimum_spend, maximum_spend, current_cap_remaining);
+
+-- get_analysis_incentive_matches: WHERE analysis_id = ? ORDER BY estimated_savings DESC, match_score DESC
+-- (idx_matches_performance orders match_score first, so it cannot serve this ORDER BY)
+CREATE INDEX idx_alm_analysis_savings ON analysis_location_matches(analysis_id, estimated_savings DESC, match_score DESC);
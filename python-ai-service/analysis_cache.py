@@ -0,0 +1,79 @@
+"""
+Analysis Result Cache
+Maps identical screenplay submissions to a previously completed analysis
+"""
+
+import time
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Reuse a completed analysis for a week; the in-process fallback is bounded
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 3600
+ANALYSIS_CACHE_MAX_ENTRIES = 1024
+
+def screenplay_digest(screenplay_text: str) -> str:
+    """SHA-256 of the screenplay with line endings and surrounding whitespace normalized"""
+    normalized = screenplay_text.replace('\r\n', '\n').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def analysis_cache_key(user_id: str, title: str, genre: Optional[str],
+                       budget_estimate: Optional[float], content_digest: str) -> str:
+    """Cache key for one user's submission; every input that changes the analysis is part of it"""
+    header = f"{user_id}|{title.strip()}|{genre or ''}|{budget_estimate or ''}|{content_digest}"
+    return hashlib.sha256(header.encode('utf-8')).hexdigest()
+
+class AnalysisCache:
+    """Submission key -> analysis ID; Redis-backed when configured, else in-process"""
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._local: Dict[str, Tuple[float, str]] = {}
+        self._redis = None
+
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = redis.from_url(redis_url, decode_responses=True)
+
+    @staticmethod
+    def _key(cache_key: str) -> str:
+        return f"analysis:{cache_key}"
+
+    async def get(self, cache_key: str) -> Optional[str]:
+        """Analysis ID previously stored for this submission, if any"""
+        if self._redis is not None:
+            try:
+                return await self._redis.get(self._key(cache_key))
+            except Exception as e:
+                logger.error(f"❌ Analysis cache lookup failed: {e}")
+                return None
+
+        cached = self._local.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
+    async def set(self, cache_key: str, analysis_id: str):
+        """Remember the completed analysis for this submission"""
+        if self._redis is not None:
+            try:
+                await self._redis.set(self._key(cache_key), analysis_id, ex=self.ttl_seconds)
+            except Exception as e:
+                logger.error(f"❌ Analysis cache store failed: {e}")
+            return
+
+        if len(self._local) >= ANALYSIS_CACHE_MAX_ENTRIES:
+            self._local.clear()
+        self._local[cache_key] = (time.monotonic() + self.ttl_seconds, analysis_id)
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self._redis is not None:
+            await self._redis.aclose()
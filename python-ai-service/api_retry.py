@@ -0,0 +1,42 @@
+"""
+API Retry Helper
+Exponential backoff with jitter for rate-limited AI provider calls
+"""
+
+import asyncio
+import random
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Attempts per request, and the longest single wait between them
+API_RETRY_ATTEMPTS = 3
+API_RETRY_MAX_DELAY = 30.0
+
+# Rate limited / temporarily unavailable; other errors are returned to the caller as-is
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Honour a numeric Retry-After header, otherwise back off exponentially with jitter"""
+    retry_after: Optional[str] = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), API_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    return min(2 ** attempt + random.random(), API_RETRY_MAX_DELAY)
+
+async def post_with_backoff(client: httpx.AsyncClient, url: str, provider: str, **kwargs) -> httpx.Response:
+    """POST, retrying 429/5xx-unavailable responses; the last response is returned whatever its status"""
+    for attempt in range(API_RETRY_ATTEMPTS):
+        response = await client.post(url, **kwargs)
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt == API_RETRY_ATTEMPTS - 1:
+            return response
+
+        delay = _retry_delay(response, attempt)
+        logger.warning(f"⚠️ {provider} API returned {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+    return response
@@ -4,7 +4,7 @@ Tracks API usage, costs, and user limits
 """
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from database import ScreenplayDatabase
 
@@ -62,22 +62,11 @@ class CostTracker:
         """Track API usage and update user statistics"""
         
         try:
-            total_tokens = input_tokens + output_tokens
-            
-            usage_data = {
-                'user_id': user_id,
-                'analysis_id': analysis_id,
-                'api_provider': api_provider,
-                'model_name': model_name,
-                'input_tokens': input_tokens,
-                'output_tokens': output_tokens,
-                'total_tokens': total_tokens,
-                'cost': cost,
-                'request_type': 'screenplay_analysis',
-                'processing_time': processing_time,
-                'success': success,
-                'error_message': error_message
-            }
+            usage_data = self._usage_data(
+                user_id, analysis_id, api_provider, model_name, cost, processing_time,
+                success, input_tokens, output_tokens, error_message
+            )
+            total_tokens = usage_data['total_tokens']
             
             # Save to database
             if self.db.track_api_usage(usage_data):
@@ -91,6 +80,46 @@ class CostTracker:
             logger.error(f"❌ Cost tracking error: {e}")
             return False
     
+    def usage_rows(self, user_id: str, analysis_id: str, usages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """api_usage_tracking rows for one analysis, for callers writing them in their own transaction
+
+        Each entry takes the track_usage keyword arguments other than user_id/analysis_id;
+        success defaults to True.
+        """
+        return [
+            self._usage_data(user_id, analysis_id, **{'success': True, **usage})
+            for usage in usages
+        ]
+    
+    @staticmethod
+    def _usage_data(
+        user_id: str,
+        analysis_id: str,
+        api_provider: str,
+        model_name: str,
+        cost: float,
+        processing_time: float,
+        success: bool,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        error_message: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Row for the api_usage_tracking table"""
+        return {
+            'user_id': user_id,
+            'analysis_id': analysis_id,
+            'api_provider': api_provider,
+            'model_name': model_name,
+            'input_tokens': input_tokens,
+            'output_tokens': output_tokens,
+            'total_tokens': input_tokens + output_tokens,
+            'cost': cost,
+            'request_type': 'screenplay_analysis',
+            'processing_time': processing_time,
+            'success': success,
+            'error_message': error_message
+        }
+    
     def get_user_costs(self, user_id: str) -> Dict[str, Any]:
         """Get user cost summary"""
         
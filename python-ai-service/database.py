@@ -11,6 +11,39 @@ load_dotenv(dotenv_path='../.env')
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+_INSERT_API_USAGE_SQL = """
+    INSERT INTO api_usage_tracking (
+        user_id, analysis_id, api_provider, model_name,
+        input_tokens, output_tokens, total_tokens, cost,
+        request_type, processing_time, success, error_message
+    ) VALUES (
+        %(user_id)s, %(analysis_id)s, %(api_provider)s, %(model_name)s,
+        %(input_tokens)s, %(output_tokens)s, %(total_tokens)s, %(cost)s,
+        %(request_type)s, %(processing_time)s, %(success)s, %(error_message)s
+    )
+"""
+
+_UPSERT_USER_USAGE_SUMMARY_SQL = """
+    INSERT INTO user_usage_summary (
+        user_id, monthly_analyses_count, monthly_cost, monthly_tokens,
+        total_analyses_count, total_cost, total_tokens, last_analysis_at
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s, %s, NOW()
+    ) ON DUPLICATE KEY UPDATE
+        monthly_analyses_count = monthly_analyses_count + %s,
+        monthly_cost = monthly_cost + %s,
+        monthly_tokens = monthly_tokens + %s,
+        total_analyses_count = total_analyses_count + %s,
+        total_cost = total_cost + %s,
+        total_tokens = total_tokens + %s,
+        last_analysis_at = NOW()
+"""
+
+def _usage_summary_values(user_id: str, count: int, cost: float, tokens: int) -> tuple:
+    """Parameters for _UPSERT_USER_USAGE_SUMMARY_SQL"""
+    return (user_id, count, cost, tokens, count, cost, tokens,
+            count, cost, tokens, count, cost, tokens)
+
 class ScreenplayDatabase:
     def __init__(self):
         self.host = os.getenv("DB_HOST")
@@ -305,321 +338,349 @@ class ScreenplayDatabase:
         try:
             connection = self.get_connection()
             cursor = connection.cursor()
-            # Defensive: ensure JSON types are serialized
-            try:
-                if isinstance(analysis_data.get('budget_notes'), (dict, list)):
-                    analysis_data['budget_notes'] = json.dumps(analysis_data['budget_notes'])
-            except Exception:
-                pass
-            
-            # Defensive: ensure timestamp format compatible with MySQL for perplexity_research_date
-            try:
-                research_date = analysis_data.get('perplexity_research_date')
-                if research_date:
-                    # Accept datetime, or ISO strings like 2025-08-23T08:15:30.123456
-                    if isinstance(research_date, datetime):
-                        analysis_data['perplexity_research_date'] = research_date.strftime('%Y-%m-%d %H:%M:%S')
-                    elif isinstance(research_date, str):
-                        # Convert ISO 8601 to MySQL DATETIME
-                        iso_str = research_date.replace('Z', '+00:00')
-                        try:
-                            dt = datetime.fromisoformat(iso_str)
-                            analysis_data['perplexity_research_date'] = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except Exception:
-                            # Fallback: try trimming at 'T'
-                            if 'T' in research_date:
-                                analysis_data['perplexity_research_date'] = research_date.split('T')[0] + ' ' + research_date.split('T')[1].split('.')[0]
-                            else:
-                                # As a last resort, drop the value to avoid insert failure
-                                analysis_data['perplexity_research_date'] = None
-            except Exception:
-                # Do not block save on formatting issues
-                pass
-            
-            query = """
-                INSERT INTO screenplay_analyses (
-                    id, user_id, title, original_filename, file_path, file_size,
-                    genre, detected_genre, subgenre, overall_score, recommendation,
-                    one_line_verdict, logline, executive_summary, top_strengths, key_weaknesses,
-                    suggestions, commercial_viability, target_audience, comparable_films,
-                    casting_suggestions, structural_analysis, character_analysis, thematic_depth,
-                    craft_evaluation, genre_mastery, improvement_strategies, casting_vision,
-                    director_recommendation, grok_score, grok_recommendation, grok_verdict, grok_confidence,
-                    grok_cultural_analysis, grok_brutal_honesty, grok_controversy_analysis,
-                    grok_movie_poster_url, grok_poster_prompt,
-                    openai_score, openai_recommendation, openai_verdict, openai_confidence,
-                    openai_commercial_assessment, openai_technical_craft, openai_industry_comparison, openai_raw_response,
-                    openai_movie_poster_url, openai_poster_prompt,
-                    gpt5_score, gpt5_recommendation, gpt5_executive_assessment, gpt5_reasoning_depth,
-                    gpt5_reasoning_tokens, gpt5_confidence, gpt5_processing_time, gpt5_cost,
-                    gpt5_character_voice_analysis, gpt5_dialogue_authenticity, gpt5_prose_quality,
-                    gpt5_emotional_beat_mapping, gpt5_professional_markers, gpt5_amateur_indicators,
-                    gpt5_industry_comparison, gpt5_raw_response,
-                    deepseek_budget_optimization, deepseek_confidence, deepseek_cost, deepseek_error_message,
-                    deepseek_financial_score, deepseek_processing_time, deepseek_production_optimization,
-                    deepseek_raw_response, deepseek_recommendation, deepseek_risk_assessment,
-                    deepseek_roi_analysis, deepseek_success, deepseek_platform_analysis,
-                    perplexity_competitive_advantage, perplexity_competitive_analysis, perplexity_cost,
-                    perplexity_data_freshness, perplexity_distribution_strategy, perplexity_error_message,
-                    perplexity_financial_intelligence, perplexity_industry_reports, perplexity_market_score,
-                    perplexity_market_trends,
-                    perplexity_processing_time, perplexity_recommendation, perplexity_research_date,
-                    perplexity_sources_cited, perplexity_success, perplexity_talent_intelligence,
-                    source_adaptation_notes, source_author, source_commercial_implications,
-                    source_confidence_score, source_cost, source_description, source_error_message,
-                    source_has_material, source_legal_considerations, source_market_advantages,
-                    source_potential_challenges, source_processing_time, source_raw_detection_text,
-                    source_success, source_title, source_type,
-                    poster_collection_title, poster_collection_genre, poster_total_cost,
-                    poster_total_time, poster_success_count, poster_best_url,
-                    poster_best_source, poster_variations_json,
-                    ai_model, confidence_level, processing_time, cost, status, 
-                    raw_api_request, raw_api_response, grok_raw_response,
-                    user_proposed_budget, budget_currency, budget_category,
-                    ai_budget_min, ai_budget_optimal, ai_budget_max, budget_notes
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s,
-                    %s, %s, %s,
-                    %s, %s, %s, %s, %s
-                )
-                ON DUPLICATE KEY UPDATE
-                    user_id = VALUES(user_id),
-                    title = VALUES(title),
-                    original_filename = VALUES(original_filename),
-                    file_path = VALUES(file_path),
-                    file_size = VALUES(file_size),
-                    genre = VALUES(genre),
-                    detected_genre = VALUES(detected_genre),
-                    subgenre = VALUES(subgenre),
-                    overall_score = VALUES(overall_score),
-                    recommendation = VALUES(recommendation),
-                    one_line_verdict = VALUES(one_line_verdict),
-                    logline = VALUES(logline),
-                    executive_summary = VALUES(executive_summary),
-                    top_strengths = VALUES(top_strengths),
-                    key_weaknesses = VALUES(key_weaknesses),
-                    suggestions = VALUES(suggestions),
-                    commercial_viability = VALUES(commercial_viability),
-                    target_audience = VALUES(target_audience),
-                    comparable_films = VALUES(comparable_films),
-                    casting_suggestions = VALUES(casting_suggestions),
-                    structural_analysis = VALUES(structural_analysis),
-                    character_analysis = VALUES(character_analysis),
-                    thematic_depth = VALUES(thematic_depth),
-                    craft_evaluation = VALUES(craft_evaluation),
-                    genre_mastery = VALUES(genre_mastery),
-                    improvement_strategies = VALUES(improvement_strategies),
-                    casting_vision = VALUES(casting_vision),
-                    director_recommendation = VALUES(director_recommendation),
-                    grok_score = VALUES(grok_score),
-                    grok_recommendation = VALUES(grok_recommendation),
-                    grok_verdict = VALUES(grok_verdict),
-                    grok_confidence = VALUES(grok_confidence),
-                    grok_cultural_analysis = VALUES(grok_cultural_analysis),
-                    grok_brutal_honesty = VALUES(grok_brutal_honesty),
-                    grok_controversy_analysis = VALUES(grok_controversy_analysis),
-                    grok_movie_poster_url = VALUES(grok_movie_poster_url),
-                    grok_poster_prompt = VALUES(grok_poster_prompt),
-                    openai_score = VALUES(openai_score),
-                    openai_recommendation = VALUES(openai_recommendation),
-                    openai_verdict = VALUES(openai_verdict),
-                    openai_confidence = VALUES(openai_confidence),
-                    openai_commercial_assessment = VALUES(openai_commercial_assessment),
-                    openai_technical_craft = VALUES(openai_technical_craft),
-                    openai_industry_comparison = VALUES(openai_industry_comparison),
-                    openai_raw_response = VALUES(openai_raw_response),
-                    openai_movie_poster_url = VALUES(openai_movie_poster_url),
-                    openai_poster_prompt = VALUES(openai_poster_prompt),
-                    gpt5_score = VALUES(gpt5_score),
-                    gpt5_recommendation = VALUES(gpt5_recommendation),
-                    gpt5_executive_assessment = VALUES(gpt5_executive_assessment),
-                    gpt5_reasoning_depth = VALUES(gpt5_reasoning_depth),
-                    gpt5_reasoning_tokens = VALUES(gpt5_reasoning_tokens),
-                    gpt5_confidence = VALUES(gpt5_confidence),
-                    gpt5_processing_time = VALUES(gpt5_processing_time),
-                    gpt5_cost = VALUES(gpt5_cost),
-                    gpt5_character_voice_analysis = VALUES(gpt5_character_voice_analysis),
-                    gpt5_dialogue_authenticity = VALUES(gpt5_dialogue_authenticity),
-                    gpt5_prose_quality = VALUES(gpt5_prose_quality),
-                    gpt5_emotional_beat_mapping = VALUES(gpt5_emotional_beat_mapping),
-                    gpt5_professional_markers = VALUES(gpt5_professional_markers),
-                    gpt5_amateur_indicators = VALUES(gpt5_amateur_indicators),
-                    gpt5_industry_comparison = VALUES(gpt5_industry_comparison),
-                    gpt5_raw_response = VALUES(gpt5_raw_response),
-                    deepseek_budget_optimization = VALUES(deepseek_budget_optimization),
-                    deepseek_confidence = VALUES(deepseek_confidence),
-                    deepseek_cost = VALUES(deepseek_cost),
-                    deepseek_error_message = VALUES(deepseek_error_message),
-                    deepseek_financial_score = VALUES(deepseek_financial_score),
-                    deepseek_processing_time = VALUES(deepseek_processing_time),
-                    deepseek_production_optimization = VALUES(deepseek_production_optimization),
-                    deepseek_raw_response = VALUES(deepseek_raw_response),
-                    deepseek_recommendation = VALUES(deepseek_recommendation),
-                    deepseek_risk_assessment = VALUES(deepseek_risk_assessment),
-                    deepseek_roi_analysis = VALUES(deepseek_roi_analysis),
-                    deepseek_success = VALUES(deepseek_success),
-                    deepseek_platform_analysis = VALUES(deepseek_platform_analysis),
-                    perplexity_competitive_advantage = VALUES(perplexity_competitive_advantage),
-                    perplexity_competitive_analysis = VALUES(perplexity_competitive_analysis),
-                    perplexity_cost = VALUES(perplexity_cost),
-                    perplexity_data_freshness = VALUES(perplexity_data_freshness),
-                    perplexity_distribution_strategy = VALUES(perplexity_distribution_strategy),
-                    perplexity_error_message = VALUES(perplexity_error_message),
-                    perplexity_financial_intelligence = VALUES(perplexity_financial_intelligence),
-                    perplexity_industry_reports = VALUES(perplexity_industry_reports),
-                    perplexity_market_score = VALUES(perplexity_market_score),
-                    perplexity_market_trends = VALUES(perplexity_market_trends),
-                    perplexity_processing_time = VALUES(perplexity_processing_time),
-                    perplexity_recommendation = VALUES(perplexity_recommendation),
-                    perplexity_research_date = VALUES(perplexity_research_date),
-                    perplexity_sources_cited = VALUES(perplexity_sources_cited),
-                    perplexity_success = VALUES(perplexity_success),
-                    perplexity_talent_intelligence = VALUES(perplexity_talent_intelligence),
-                    source_adaptation_notes = VALUES(source_adaptation_notes),
-                    source_author = VALUES(source_author),
-                    source_commercial_implications = VALUES(source_commercial_implications),
-                    source_confidence_score = VALUES(source_confidence_score),
-                    source_cost = VALUES(source_cost),
-                    source_description = VALUES(source_description),
-                    source_error_message = VALUES(source_error_message),
-                    source_has_material = VALUES(source_has_material),
-                    source_legal_considerations = VALUES(source_legal_considerations),
-                    source_market_advantages = VALUES(source_market_advantages),
-                    source_potential_challenges = VALUES(source_potential_challenges),
-                    source_processing_time = VALUES(source_processing_time),
-                    source_raw_detection_text = VALUES(source_raw_detection_text),
-                    source_success = VALUES(source_success),
-                    source_title = VALUES(source_title),
-                    source_type = VALUES(source_type),
-                    poster_collection_title = VALUES(poster_collection_title),
-                    poster_collection_genre = VALUES(poster_collection_genre),
-                    poster_total_cost = VALUES(poster_total_cost),
-                    poster_total_time = VALUES(poster_total_time),
-                    poster_success_count = VALUES(poster_success_count),
-                    poster_best_url = VALUES(poster_best_url),
-                    poster_best_source = VALUES(poster_best_source),
-                    poster_variations_json = VALUES(poster_variations_json),
-                    ai_model = VALUES(ai_model),
-                    confidence_level = VALUES(confidence_level),
-                    processing_time = VALUES(processing_time),
-                    cost = VALUES(cost),
-                    status = VALUES(status),
-                    raw_api_request = VALUES(raw_api_request),
-                    raw_api_response = VALUES(raw_api_response),
-                    grok_raw_response = VALUES(grok_raw_response),
-                    user_proposed_budget = VALUES(user_proposed_budget),
-                    budget_currency = VALUES(budget_currency),
-                    budget_category = VALUES(budget_category),
-                    ai_budget_min = VALUES(ai_budget_min),
-                    ai_budget_optimal = VALUES(ai_budget_optimal),
-                    ai_budget_max = VALUES(ai_budget_max),
-                    budget_notes = VALUES(budget_notes),
-                    updated_at = CURRENT_TIMESTAMP
-            """
+            cursor.execute(*self._analysis_statement(analysis_data))
+            connection.commit()
+            return True
             
-            # Convert dictionary to tuple in the correct order, with safe access
-            values = (
-                analysis_data.get('id'), analysis_data.get('user_id'), analysis_data.get('title'), 
-                analysis_data.get('original_filename'), analysis_data.get('file_path'), analysis_data.get('file_size'),
-                analysis_data.get('genre'), analysis_data.get('detected_genre'), analysis_data.get('subgenre'), 
-                analysis_data.get('overall_score'), analysis_data.get('recommendation'),
-                analysis_data.get('one_line_verdict'), analysis_data.get('logline'), analysis_data.get('executive_summary'), 
-                analysis_data.get('top_strengths'), analysis_data.get('key_weaknesses'),
-                analysis_data.get('suggestions'), analysis_data.get('commercial_viability'), analysis_data.get('target_audience'), 
-                analysis_data.get('comparable_films'),
-                analysis_data.get('casting_suggestions'), analysis_data.get('structural_analysis'), analysis_data.get('character_analysis'), 
-                analysis_data.get('thematic_depth'),
-                analysis_data.get('craft_evaluation'), analysis_data.get('genre_mastery'), analysis_data.get('improvement_strategies'), 
-                analysis_data.get('casting_vision'),
-                analysis_data.get('director_recommendation'), analysis_data.get('grok_score'), analysis_data.get('grok_recommendation'), 
-                analysis_data.get('grok_verdict'), analysis_data.get('grok_confidence'),
-                analysis_data.get('grok_cultural_analysis'), analysis_data.get('grok_brutal_honesty'), analysis_data.get('grok_controversy_analysis'),
-                analysis_data.get('grok_movie_poster_url'), analysis_data.get('grok_poster_prompt'),
-                analysis_data.get('openai_score'), analysis_data.get('openai_recommendation'), analysis_data.get('openai_verdict'), 
-                analysis_data.get('openai_confidence'),
-                analysis_data.get('openai_commercial_assessment'), analysis_data.get('openai_technical_craft'), 
-                analysis_data.get('openai_industry_comparison'), analysis_data.get('openai_raw_response'),
-                analysis_data.get('openai_movie_poster_url'), analysis_data.get('openai_poster_prompt'),
-                analysis_data.get('gpt5_score'), analysis_data.get('gpt5_recommendation'), analysis_data.get('gpt5_executive_assessment'),
-                analysis_data.get('gpt5_reasoning_depth'), analysis_data.get('gpt5_reasoning_tokens'), analysis_data.get('gpt5_confidence'),
-                analysis_data.get('gpt5_processing_time'), analysis_data.get('gpt5_cost'),
-                analysis_data.get('gpt5_character_voice_analysis'), analysis_data.get('gpt5_dialogue_authenticity'),
-                analysis_data.get('gpt5_prose_quality'), analysis_data.get('gpt5_emotional_beat_mapping'),
-                analysis_data.get('gpt5_professional_markers'), analysis_data.get('gpt5_amateur_indicators'),
-                analysis_data.get('gpt5_industry_comparison'), analysis_data.get('gpt5_raw_response'),
-                # DeepSeek fields
-                analysis_data.get('deepseek_budget_optimization'), analysis_data.get('deepseek_confidence'), 
-                analysis_data.get('deepseek_cost'), analysis_data.get('deepseek_error_message'),
-                analysis_data.get('deepseek_financial_score'), analysis_data.get('deepseek_processing_time'), 
-                analysis_data.get('deepseek_production_optimization'),
-                analysis_data.get('deepseek_raw_response'), analysis_data.get('deepseek_recommendation'), 
-                analysis_data.get('deepseek_risk_assessment'),
-                analysis_data.get('deepseek_roi_analysis'), analysis_data.get('deepseek_success'), analysis_data.get('deepseek_platform_analysis'),
-                # Perplexity fields
-                analysis_data.get('perplexity_competitive_advantage'), analysis_data.get('perplexity_competitive_analysis'), 
-                analysis_data.get('perplexity_cost'),
-                analysis_data.get('perplexity_data_freshness'), analysis_data.get('perplexity_distribution_strategy'), 
-                analysis_data.get('perplexity_error_message'),
-                analysis_data.get('perplexity_financial_intelligence'), analysis_data.get('perplexity_industry_reports'), 
-                analysis_data.get('perplexity_market_score'), analysis_data.get('perplexity_market_trends'),
-                analysis_data.get('perplexity_processing_time'), analysis_data.get('perplexity_recommendation'), 
-                analysis_data.get('perplexity_research_date'),
-                analysis_data.get('perplexity_sources_cited'), analysis_data.get('perplexity_success'), 
-                analysis_data.get('perplexity_talent_intelligence'),
-                # Source material fields
-                analysis_data.get('source_adaptation_notes'), analysis_data.get('source_author'), 
-                analysis_data.get('source_commercial_implications'),
-                analysis_data.get('source_confidence_score'), analysis_data.get('source_cost'), 
-                analysis_data.get('source_description'), analysis_data.get('source_error_message'),
-                analysis_data.get('source_has_material'), analysis_data.get('source_legal_considerations'), 
-                analysis_data.get('source_market_advantages'),
-                analysis_data.get('source_potential_challenges'), analysis_data.get('source_processing_time'), 
-                analysis_data.get('source_raw_detection_text'),
-                analysis_data.get('source_success'), analysis_data.get('source_title'), analysis_data.get('source_type'),
-                # Poster collection fields
-                analysis_data.get('poster_collection_title'), analysis_data.get('poster_collection_genre'),
-                analysis_data.get('poster_total_cost'), analysis_data.get('poster_total_time'),
-                analysis_data.get('poster_success_count'), analysis_data.get('poster_best_url'),
-                analysis_data.get('poster_best_source'), analysis_data.get('poster_variations_json'),
-                # Standard fields
-                analysis_data.get('ai_model'), analysis_data.get('confidence_level'), analysis_data.get('processing_time'), 
-                analysis_data.get('cost'), analysis_data.get('status'),
-                analysis_data.get('raw_api_request'), analysis_data.get('raw_api_response'), analysis_data.get('grok_raw_response'),
-                # Budget fields
-                analysis_data.get('user_proposed_budget'), analysis_data.get('budget_currency') or 'USD', analysis_data.get('budget_category'),
-                analysis_data.get('ai_budget_min'), analysis_data.get('ai_budget_optimal'), analysis_data.get('ai_budget_max'), analysis_data.get('budget_notes')
-            )
-            cursor.execute(query, values)
+        except Error as e:
+            logger.error(f"❌ Error saving analysis: {e}")
+            return False
+        finally:
+            if connection:
+                connection.close()
+
+    def save_analysis_with_usage(self, analysis_data: Dict[str, Any], usage_rows: List[Dict[str, Any]]) -> bool:
+        """Save analysis results and their API usage rows in one transaction on one pooled connection"""
+        connection = None
+        try:
+            connection = self.get_connection()
+            connection.start_transaction()
+            cursor = connection.cursor()
+            cursor.execute(*self._analysis_statement(analysis_data))
+            self._write_api_usage(cursor, usage_rows)
             connection.commit()
             return True
             
         except Error as e:
             logger.error(f"❌ Error saving analysis: {e}")
+            if connection:
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
             return False
         finally:
             if connection:
                 connection.close()
 
+    def _analysis_statement(self, analysis_data: Dict[str, Any]) -> tuple:
+        """INSERT ... ON DUPLICATE KEY UPDATE statement and parameters for a finished analysis"""
+        # Defensive: ensure JSON types are serialized
+        try:
+            if isinstance(analysis_data.get('budget_notes'), (dict, list)):
+                analysis_data['budget_notes'] = json.dumps(analysis_data['budget_notes'])
+        except Exception:
+            pass
+        
+        # Defensive: ensure timestamp format compatible with MySQL for perplexity_research_date
+        try:
+            research_date = analysis_data.get('perplexity_research_date')
+            if research_date:
+                # Accept datetime, or ISO strings like 2025-08-23T08:15:30.123456
+                if isinstance(research_date, datetime):
+                    analysis_data['perplexity_research_date'] = research_date.strftime('%Y-%m-%d %H:%M:%S')
+                elif isinstance(research_date, str):
+                    # Convert ISO 8601 to MySQL DATETIME
+                    iso_str = research_date.replace('Z', '+00:00')
+                    try:
+                        dt = datetime.fromisoformat(iso_str)
+                        analysis_data['perplexity_research_date'] = dt.strftime('%Y-%m-%d %H:%M:%S')
+                    except Exception:
+                        # Fallback: try trimming at 'T'
+                        if 'T' in research_date:
+                            analysis_data['perplexity_research_date'] = research_date.split('T')[0] + ' ' + research_date.split('T')[1].split('.')[0]
+                        else:
+                            # As a last resort, drop the value to avoid insert failure
+                            analysis_data['perplexity_research_date'] = None
+        except Exception:
+            # Do not block save on formatting issues
+            pass
+        
+        query = """
+            INSERT INTO screenplay_analyses (
+                id, user_id, title, original_filename, file_path, file_size,
+                genre, detected_genre, subgenre, overall_score, recommendation,
+                one_line_verdict, logline, executive_summary, top_strengths, key_weaknesses,
+                suggestions, commercial_viability, target_audience, comparable_films,
+                casting_suggestions, structural_analysis, character_analysis, thematic_depth,
+                craft_evaluation, genre_mastery, improvement_strategies, casting_vision,
+                director_recommendation, grok_score, grok_recommendation, grok_verdict, grok_confidence,
+                grok_cultural_analysis, grok_brutal_honesty, grok_controversy_analysis,
+                grok_movie_poster_url, grok_poster_prompt,
+                openai_score, openai_recommendation, openai_verdict, openai_confidence,
+                openai_commercial_assessment, openai_technical_craft, openai_industry_comparison, openai_raw_response,
+                openai_movie_poster_url, openai_poster_prompt,
+                gpt5_score, gpt5_recommendation, gpt5_executive_assessment, gpt5_reasoning_depth,
+                gpt5_reasoning_tokens, gpt5_confidence, gpt5_processing_time, gpt5_cost,
+                gpt5_character_voice_analysis, gpt5_dialogue_authenticity, gpt5_prose_quality,
+                gpt5_emotional_beat_mapping, gpt5_professional_markers, gpt5_amateur_indicators,
+                gpt5_industry_comparison, gpt5_raw_response,
+                deepseek_budget_optimization, deepseek_confidence, deepseek_cost, deepseek_error_message,
+                deepseek_financial_score, deepseek_processing_time, deepseek_production_optimization,
+                deepseek_raw_response, deepseek_recommendation, deepseek_risk_assessment,
+                deepseek_roi_analysis, deepseek_success, deepseek_platform_analysis,
+                perplexity_competitive_advantage, perplexity_competitive_analysis, perplexity_cost,
+                perplexity_data_freshness, perplexity_distribution_strategy, perplexity_error_message,
+                perplexity_financial_intelligence, perplexity_industry_reports, perplexity_market_score,
+                perplexity_market_trends,
+                perplexity_processing_time, perplexity_recommendation, perplexity_research_date,
+                perplexity_sources_cited, perplexity_success, perplexity_talent_intelligence,
+                source_adaptation_notes, source_author, source_commercial_implications,
+                source_confidence_score, source_cost, source_description, source_error_message,
+                source_has_material, source_legal_considerations, source_market_advantages,
+                source_potential_challenges, source_processing_time, source_raw_detection_text,
+                source_success, source_title, source_type,
+                poster_collection_title, poster_collection_genre, poster_total_cost,
+                poster_total_time, poster_success_count, poster_best_url,
+                poster_best_source, poster_variations_json,
+                ai_model, confidence_level, processing_time, cost, status, 
+                raw_api_request, raw_api_response, grok_raw_response,
+                user_proposed_budget, budget_currency, budget_category,
+                ai_budget_min, ai_budget_optimal, ai_budget_max, budget_notes
+            ) VALUES (
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s,
+                %s, %s, %s,
+                %s, %s, %s, %s, %s
+            )
+            ON DUPLICATE KEY UPDATE
+                user_id = VALUES(user_id),
+                title = VALUES(title),
+                original_filename = VALUES(original_filename),
+                file_path = VALUES(file_path),
+                file_size = VALUES(file_size),
+                genre = VALUES(genre),
+                detected_genre = VALUES(detected_genre),
+                subgenre = VALUES(subgenre),
+                overall_score = VALUES(overall_score),
+                recommendation = VALUES(recommendation),
+                one_line_verdict = VALUES(one_line_verdict),
+                logline = VALUES(logline),
+                executive_summary = VALUES(executive_summary),
+                top_strengths = VALUES(top_strengths),
+                key_weaknesses = VALUES(key_weaknesses),
+                suggestions = VALUES(suggestions),
+                commercial_viability = VALUES(commercial_viability),
+                target_audience = VALUES(target_audience),
+                comparable_films = VALUES(comparable_films),
+                casting_suggestions = VALUES(casting_suggestions),
+                structural_analysis = VALUES(structural_analysis),
+                character_analysis = VALUES(character_analysis),
+                thematic_depth = VALUES(thematic_depth),
+                craft_evaluation = VALUES(craft_evaluation),
+                genre_mastery = VALUES(genre_mastery),
+                improvement_strategies = VALUES(improvement_strategies),
+                casting_vision = VALUES(casting_vision),
+                director_recommendation = VALUES(director_recommendation),
+                grok_score = VALUES(grok_score),
+                grok_recommendation = VALUES(grok_recommendation),
+                grok_verdict = VALUES(grok_verdict),
+                grok_confidence = VALUES(grok_confidence),
+                grok_cultural_analysis = VALUES(grok_cultural_analysis),
+                grok_brutal_honesty = VALUES(grok_brutal_honesty),
+                grok_controversy_analysis = VALUES(grok_controversy_analysis),
+                grok_movie_poster_url = VALUES(grok_movie_poster_url),
+                grok_poster_prompt = VALUES(grok_poster_prompt),
+                openai_score = VALUES(openai_score),
+                openai_recommendation = VALUES(openai_recommendation),
+                openai_verdict = VALUES(openai_verdict),
+                openai_confidence = VALUES(openai_confidence),
+                openai_commercial_assessment = VALUES(openai_commercial_assessment),
+                openai_technical_craft = VALUES(openai_technical_craft),
+                openai_industry_comparison = VALUES(openai_industry_comparison),
+                openai_raw_response = VALUES(openai_raw_response),
+                openai_movie_poster_url = VALUES(openai_movie_poster_url),
+                openai_poster_prompt = VALUES(openai_poster_prompt),
+                gpt5_score = VALUES(gpt5_score),
+                gpt5_recommendation = VALUES(gpt5_recommendation),
+                gpt5_executive_assessment = VALUES(gpt5_executive_assessment),
+                gpt5_reasoning_depth = VALUES(gpt5_reasoning_depth),
+                gpt5_reasoning_tokens = VALUES(gpt5_reasoning_tokens),
+                gpt5_confidence = VALUES(gpt5_confidence),
+                gpt5_processing_time = VALUES(gpt5_processing_time),
+                gpt5_cost = VALUES(gpt5_cost),
+                gpt5_character_voice_analysis = VALUES(gpt5_character_voice_analysis),
+                gpt5_dialogue_authenticity = VALUES(gpt5_dialogue_authenticity),
+                gpt5_prose_quality = VALUES(gpt5_prose_quality),
+                gpt5_emotional_beat_mapping = VALUES(gpt5_emotional_beat_mapping),
+                gpt5_professional_markers = VALUES(gpt5_professional_markers),
+                gpt5_amateur_indicators = VALUES(gpt5_amateur_indicators),
+                gpt5_industry_comparison = VALUES(gpt5_industry_comparison),
+                gpt5_raw_response = VALUES(gpt5_raw_response),
+                deepseek_budget_optimization = VALUES(deepseek_budget_optimization),
+                deepseek_confidence = VALUES(deepseek_confidence),
+                deepseek_cost = VALUES(deepseek_cost),
+                deepseek_error_message = VALUES(deepseek_error_message),
+                deepseek_financial_score = VALUES(deepseek_financial_score),
+                deepseek_processing_time = VALUES(deepseek_processing_time),
+                deepseek_production_optimization = VALUES(deepseek_production_optimization),
+                deepseek_raw_response = VALUES(deepseek_raw_response),
+                deepseek_recommendation = VALUES(deepseek_recommendation),
+                deepseek_risk_assessment = VALUES(deepseek_risk_assessment),
+                deepseek_roi_analysis = VALUES(deepseek_roi_analysis),
+                deepseek_success = VALUES(deepseek_success),
+                deepseek_platform_analysis = VALUES(deepseek_platform_analysis),
+                perplexity_competitive_advantage = VALUES(perplexity_competitive_advantage),
+                perplexity_competitive_analysis = VALUES(perplexity_competitive_analysis),
+                perplexity_cost = VALUES(perplexity_cost),
+                perplexity_data_freshness = VALUES(perplexity_data_freshness),
+                perplexity_distribution_strategy = VALUES(perplexity_distribution_strategy),
+                perplexity_error_message = VALUES(perplexity_error_message),
+                perplexity_financial_intelligence = VALUES(perplexity_financial_intelligence),
+                perplexity_industry_reports = VALUES(perplexity_industry_reports),
+                perplexity_market_score = VALUES(perplexity_market_score),
+                perplexity_market_trends = VALUES(perplexity_market_trends),
+                perplexity_processing_time = VALUES(perplexity_processing_time),
+                perplexity_recommendation = VALUES(perplexity_recommendation),
+                perplexity_research_date = VALUES(perplexity_research_date),
+                perplexity_sources_cited = VALUES(perplexity_sources_cited),
+                perplexity_success = VALUES(perplexity_success),
+                perplexity_talent_intelligence = VALUES(perplexity_talent_intelligence),
+                source_adaptation_notes = VALUES(source_adaptation_notes),
+                source_author = VALUES(source_author),
+                source_commercial_implications = VALUES(source_commercial_implications),
+                source_confidence_score = VALUES(source_confidence_score),
+                source_cost = VALUES(source_cost),
+                source_description = VALUES(source_description),
+                source_error_message = VALUES(source_error_message),
+                source_has_material = VALUES(source_has_material),
+                source_legal_considerations = VALUES(source_legal_considerations),
+                source_market_advantages = VALUES(source_market_advantages),
+                source_potential_challenges = VALUES(source_potential_challenges),
+                source_processing_time = VALUES(source_processing_time),
+                source_raw_detection_text = VALUES(source_raw_detection_text),
+                source_success = VALUES(source_success),
+                source_title = VALUES(source_title),
+                source_type = VALUES(source_type),
+                poster_collection_title = VALUES(poster_collection_title),
+                poster_collection_genre = VALUES(poster_collection_genre),
+                poster_total_cost = VALUES(poster_total_cost),
+                poster_total_time = VALUES(poster_total_time),
+                poster_success_count = VALUES(poster_success_count),
+                poster_best_url = VALUES(poster_best_url),
+                poster_best_source = VALUES(poster_best_source),
+                poster_variations_json = VALUES(poster_variations_json),
+                ai_model = VALUES(ai_model),
+                confidence_level = VALUES(confidence_level),
+                processing_time = VALUES(processing_time),
+                cost = VALUES(cost),
+                status = VALUES(status),
+                raw_api_request = VALUES(raw_api_request),
+                raw_api_response = VALUES(raw_api_response),
+                grok_raw_response = VALUES(grok_raw_response),
+                user_proposed_budget = VALUES(user_proposed_budget),
+                budget_currency = VALUES(budget_currency),
+                budget_category = VALUES(budget_category),
+                ai_budget_min = VALUES(ai_budget_min),
+                ai_budget_optimal = VALUES(ai_budget_optimal),
+                ai_budget_max = VALUES(ai_budget_max),
+                budget_notes = VALUES(budget_notes),
+                updated_at = CURRENT_TIMESTAMP
+        """
+        
+        # Convert dictionary to tuple in the correct order, with safe access
+        values = (
+            analysis_data.get('id'), analysis_data.get('user_id'), analysis_data.get('title'), 
+            analysis_data.get('original_filename'), analysis_data.get('file_path'), analysis_data.get('file_size'),
+            analysis_data.get('genre'), analysis_data.get('detected_genre'), analysis_data.get('subgenre'), 
+            analysis_data.get('overall_score'), analysis_data.get('recommendation'),
+            analysis_data.get('one_line_verdict'), analysis_data.get('logline'), analysis_data.get('executive_summary'), 
+            analysis_data.get('top_strengths'), analysis_data.get('key_weaknesses'),
+            analysis_data.get('suggestions'), analysis_data.get('commercial_viability'), analysis_data.get('target_audience'), 
+            analysis_data.get('comparable_films'),
+            analysis_data.get('casting_suggestions'), analysis_data.get('structural_analysis'), analysis_data.get('character_analysis'), 
+            analysis_data.get('thematic_depth'),
+            analysis_data.get('craft_evaluation'), analysis_data.get('genre_mastery'), analysis_data.get('improvement_strategies'), 
+            analysis_data.get('casting_vision'),
+            analysis_data.get('director_recommendation'), analysis_data.get('grok_score'), analysis_data.get('grok_recommendation'), 
+            analysis_data.get('grok_verdict'), analysis_data.get('grok_confidence'),
+            analysis_data.get('grok_cultural_analysis'), analysis_data.get('grok_brutal_honesty'), analysis_data.get('grok_controversy_analysis'),
+            analysis_data.get('grok_movie_poster_url'), analysis_data.get('grok_poster_prompt'),
+            analysis_data.get('openai_score'), analysis_data.get('openai_recommendation'), analysis_data.get('openai_verdict'), 
+            analysis_data.get('openai_confidence'),
+            analysis_data.get('openai_commercial_assessment'), analysis_data.get('openai_technical_craft'), 
+            analysis_data.get('openai_industry_comparison'), analysis_data.get('openai_raw_response'),
+            analysis_data.get('openai_movie_poster_url'), analysis_data.get('openai_poster_prompt'),
+            analysis_data.get('gpt5_score'), analysis_data.get('gpt5_recommendation'), analysis_data.get('gpt5_executive_assessment'),
+            analysis_data.get('gpt5_reasoning_depth'), analysis_data.get('gpt5_reasoning_tokens'), analysis_data.get('gpt5_confidence'),
+            analysis_data.get('gpt5_processing_time'), analysis_data.get('gpt5_cost'),
+            analysis_data.get('gpt5_character_voice_analysis'), analysis_data.get('gpt5_dialogue_authenticity'),
+            analysis_data.get('gpt5_prose_quality'), analysis_data.get('gpt5_emotional_beat_mapping'),
+            analysis_data.get('gpt5_professional_markers'), analysis_data.get('gpt5_amateur_indicators'),
+            analysis_data.get('gpt5_industry_comparison'), analysis_data.get('gpt5_raw_response'),
+            # DeepSeek fields
+            analysis_data.get('deepseek_budget_optimization'), analysis_data.get('deepseek_confidence'), 
+            analysis_data.get('deepseek_cost'), analysis_data.get('deepseek_error_message'),
+            analysis_data.get('deepseek_financial_score'), analysis_data.get('deepseek_processing_time'), 
+            analysis_data.get('deepseek_production_optimization'),
+            analysis_data.get('deepseek_raw_response'), analysis_data.get('deepseek_recommendation'), 
+            analysis_data.get('deepseek_risk_assessment'),
+            analysis_data.get('deepseek_roi_analysis'), analysis_data.get('deepseek_success'), analysis_data.get('deepseek_platform_analysis'),
+            # Perplexity fields
+            analysis_data.get('perplexity_competitive_advantage'), analysis_data.get('perplexity_competitive_analysis'), 
+            analysis_data.get('perplexity_cost'),
+            analysis_data.get('perplexity_data_freshness'), analysis_data.get('perplexity_distribution_strategy'), 
+            analysis_data.get('perplexity_error_message'),
+            analysis_data.get('perplexity_financial_intelligence'), analysis_data.get('perplexity_industry_reports'), 
+            analysis_data.get('perplexity_market_score'), analysis_data.get('perplexity_market_trends'),
+            analysis_data.get('perplexity_processing_time'), analysis_data.get('perplexity_recommendation'), 
+            analysis_data.get('perplexity_research_date'),
+            analysis_data.get('perplexity_sources_cited'), analysis_data.get('perplexity_success'), 
+            analysis_data.get('perplexity_talent_intelligence'),
+            # Source material fields
+            analysis_data.get('source_adaptation_notes'), analysis_data.get('source_author'), 
+            analysis_data.get('source_commercial_implications'),
+            analysis_data.get('source_confidence_score'), analysis_data.get('source_cost'), 
+            analysis_data.get('source_description'), analysis_data.get('source_error_message'),
+            analysis_data.get('source_has_material'), analysis_data.get('source_legal_considerations'), 
+            analysis_data.get('source_market_advantages'),
+            analysis_data.get('source_potential_challenges'), analysis_data.get('source_processing_time'), 
+            analysis_data.get('source_raw_detection_text'),
+            analysis_data.get('source_success'), analysis_data.get('source_title'), analysis_data.get('source_type'),
+            # Poster collection fields
+            analysis_data.get('poster_collection_title'), analysis_data.get('poster_collection_genre'),
+            analysis_data.get('poster_total_cost'), analysis_data.get('poster_total_time'),
+            analysis_data.get('poster_success_count'), analysis_data.get('poster_best_url'),
+            analysis_data.get('poster_best_source'), analysis_data.get('poster_variations_json'),
+            # Standard fields
+            analysis_data.get('ai_model'), analysis_data.get('confidence_level'), analysis_data.get('processing_time'), 
+            analysis_data.get('cost'), analysis_data.get('status'),
+            analysis_data.get('raw_api_request'), analysis_data.get('raw_api_response'), analysis_data.get('grok_raw_response'),
+            # Budget fields
+            analysis_data.get('user_proposed_budget'), analysis_data.get('budget_currency') or 'USD', analysis_data.get('budget_category'),
+            analysis_data.get('ai_budget_min'), analysis_data.get('ai_budget_optimal'), analysis_data.get('ai_budget_max'), analysis_data.get('budget_notes')
+        )
+        return query, values
+
     def insert_initial_analysis(self, initial_data: Dict[str, Any]) -> bool:
         """Insert an initial minimal analysis row to avoid placeholder mismatches"""
         connection = None
@@ -755,19 +816,7 @@ class ScreenplayDatabase:
             connection = self.get_connection()
             cursor = connection.cursor()
             
-            query = """
-                INSERT INTO api_usage_tracking (
-                    user_id, analysis_id, api_provider, model_name,
-                    input_tokens, output_tokens, total_tokens, cost,
-                    request_type, processing_time, success, error_message
-                ) VALUES (
-                    %(user_id)s, %(analysis_id)s, %(api_provider)s, %(model_name)s,
-                    %(input_tokens)s, %(output_tokens)s, %(total_tokens)s, %(cost)s,
-                    %(request_type)s, %(processing_time)s, %(success)s, %(error_message)s
-                )
-            """
-            
-            cursor.execute(query, usage_data)
+            cursor.execute(_INSERT_API_USAGE_SQL, usage_data)
             connection.commit()
             
             # Update user usage summary
@@ -790,23 +839,7 @@ class ScreenplayDatabase:
             cursor = connection.cursor()
             
             # Insert or update user usage summary
-            query = """
-                INSERT INTO user_usage_summary (
-                    user_id, monthly_analyses_count, monthly_cost, monthly_tokens,
-                    total_analyses_count, total_cost, total_tokens, last_analysis_at
-                ) VALUES (
-                    %s, 1, %s, %s, 1, %s, %s, NOW()
-                ) ON DUPLICATE KEY UPDATE
-                    monthly_analyses_count = monthly_analyses_count + 1,
-                    monthly_cost = monthly_cost + %s,
-                    monthly_tokens = monthly_tokens + %s,
-                    total_analyses_count = total_analyses_count + 1,
-                    total_cost = total_cost + %s,
-                    total_tokens = total_tokens + %s,
-                    last_analysis_at = NOW()
-            """
-            
-            cursor.execute(query, (user_id, cost, tokens, cost, tokens, cost, tokens, cost, tokens))
+            cursor.execute(_UPSERT_USER_USAGE_SUMMARY_SQL, _usage_summary_values(user_id, 1, cost, tokens))
             connection.commit()
             return True
             
@@ -817,6 +850,25 @@ class ScreenplayDatabase:
             if connection:
                 connection.close()
     
+    @staticmethod
+    def _write_api_usage(cursor, usage_rows: List[Dict[str, Any]]):
+        """Insert usage rows with one executemany and roll them into user_usage_summary"""
+        if not usage_rows:
+            return
+        cursor.executemany(_INSERT_API_USAGE_SQL, usage_rows)
+        
+        # Each row still counts towards the summary exactly as a single track_api_usage call would
+        summaries: Dict[str, List[float]] = {}
+        for row in usage_rows:
+            summary = summaries.setdefault(row['user_id'], [0, 0.0, 0])
+            summary[0] += 1
+            summary[1] += row['cost']
+            summary[2] += row['total_tokens']
+        # One execute per user: executemany would batch-rewrite the upsert from its VALUES group alone,
+        # leaving the ON DUPLICATE KEY UPDATE parameters unbound
+        for user_id, (count, cost, tokens) in summaries.items():
+            cursor.execute(_UPSERT_USER_USAGE_SUMMARY_SQL, _usage_summary_values(user_id, count, cost, tokens))
+    
     def get_user_usage_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user usage statistics"""
         connection = None
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
+from api_retry import post_with_backoff
 
 load_dotenv()
 
@@ -64,7 +66,8 @@ class DeepSeekResult:
 class DeepSeekAnalyzer:
     """DeepSeek AI integration for advanced financial modeling and box office prediction"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("DEEPSEEK_API_KEY")
         self.api_url = os.getenv("DEEPSEEK_API_URL", "https://api.deepseek.com/v1/chat/completions")
         self.model = "deepseek-reasoner"  # Use reasoning model for financial analysis
@@ -446,18 +449,18 @@ Provide comprehensive, mathematically sound financial analysis with clear reason
             
             # Use reasonable timeout - fallback if DeepSeek takes too long
             timeout = httpx.Timeout(connect=30.0, read=90.0, write=30.0, pool=30.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(self.api_url, headers=headers, json=payload)
+            client = self._http_client or get_shared_http_client()
+            response = await post_with_backoff(client, self.api_url, "DeepSeek", headers=headers, json=payload, timeout=timeout)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('choices') and len(result['choices']) > 0:
-                        return result['choices'][0]['message']['content']
-                    else:
-                        raise Exception("No response content from DeepSeek")
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('choices') and len(result['choices']) > 0:
+                    return result['choices'][0]['message']['content']
                 else:
-                    error_text = response.text
-                    raise Exception(f"DeepSeek API error {response.status_code}: {error_text}")
+                    raise Exception("No response content from DeepSeek")
+            else:
+                error_text = response.text
+                raise Exception(f"DeepSeek API error {response.status_code}: {error_text}")
                     
         except Exception as e:
             logger.error(f"❌ DeepSeek API call failed: {e}")
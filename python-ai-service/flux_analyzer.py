@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
 
 load_dotenv()
 
@@ -34,7 +35,8 @@ class FluxResult:
 class FluxAnalyzer:
     """Flux Pro integration for Hollywood movie poster generation via Replicate"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("REPLICATE_API_TOKEN")
         self.api_url = "https://api.replicate.com/v1/predictions"
         
@@ -230,73 +232,75 @@ Technical quality: Professional poster design studio standard, theatrical market
             
             logger.info(f"🔄 Creating Flux Pro prediction for '{title}'...")
             
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                # Create prediction
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload
-                )
+            client = self._http_client or get_shared_http_client()
+            # Create prediction
+            response = await client.post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=120.0
+            )
                 
-                if response.status_code != 201:
-                    logger.error(f"❌ Flux Pro prediction creation failed: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code != 201:
+                logger.error(f"❌ Flux Pro prediction creation failed: {response.status_code} - {response.text}")
+                return None
                 
-                prediction_data = response.json()
-                prediction_id = prediction_data.get('id')
+            prediction_data = response.json()
+            prediction_id = prediction_data.get('id')
                 
-                if not prediction_id:
-                    logger.error("❌ No prediction ID returned from Replicate")
-                    return None
+            if not prediction_id:
+                logger.error("❌ No prediction ID returned from Replicate")
+                return None
                 
-                logger.info(f"✅ Flux Pro prediction created: {prediction_id}")
+            logger.info(f"✅ Flux Pro prediction created: {prediction_id}")
                 
-                # Poll for completion
-                max_attempts = 60  # 10 minutes max
-                attempt = 0
+            # Poll for completion
+            max_attempts = 60  # 10 minutes max
+            attempt = 0
                 
-                while attempt < max_attempts:
-                    await asyncio.sleep(10)  # Wait 10 seconds between checks
-                    attempt += 1
+            while attempt < max_attempts:
+                await asyncio.sleep(10)  # Wait 10 seconds between checks
+                attempt += 1
                     
-                    # Check prediction status
-                    status_response = await client.get(
-                        f"{self.api_url}/{prediction_id}",
-                        headers=headers
-                    )
+                # Check prediction status
+                status_response = await client.get(
+                    f"{self.api_url}/{prediction_id}",
+                    headers=headers,
+                    timeout=120.0
+                )
                     
-                    if status_response.status_code != 200:
-                        logger.error(f"❌ Failed to check prediction status: {status_response.status_code}")
-                        continue
+                if status_response.status_code != 200:
+                    logger.error(f"❌ Failed to check prediction status: {status_response.status_code}")
+                    continue
                     
-                    status_data = status_response.json()
-                    status = status_data.get('status')
+                status_data = status_response.json()
+                status = status_data.get('status')
                     
-                    logger.info(f"🔄 Prediction {prediction_id} status: {status} (attempt {attempt}/{max_attempts})")
+                logger.info(f"🔄 Prediction {prediction_id} status: {status} (attempt {attempt}/{max_attempts})")
                     
-                    if status == 'succeeded':
-                        # Get the generated image URL
-                        output = status_data.get('output')
-                        if output and len(output) > 0:
-                            image_url = output[0]
-                            logger.info(f"✅ Flux Pro poster generated: {image_url}")
+                if status == 'succeeded':
+                    # Get the generated image URL
+                    output = status_data.get('output')
+                    if output and len(output) > 0:
+                        image_url = output[0]
+                        logger.info(f"✅ Flux Pro poster generated: {image_url}")
                             
-                            # Save image locally
-                            saved_url = await self._save_poster_image(image_url, title)
-                            return saved_url or image_url
-                        else:
-                            logger.error("❌ No output in succeeded prediction")
-                            return None
-                    
-                    elif status == 'failed':
-                        error_msg = status_data.get('error', 'Unknown error')
-                        logger.error(f"❌ Flux Pro prediction failed: {error_msg}")
+                        # Save image locally
+                        saved_url = await self._save_poster_image(image_url, title)
+                        return saved_url or image_url
+                    else:
+                        logger.error("❌ No output in succeeded prediction")
                         return None
                     
-                    # Continue polling if status is 'starting' or 'processing'
+                elif status == 'failed':
+                    error_msg = status_data.get('error', 'Unknown error')
+                    logger.error(f"❌ Flux Pro prediction failed: {error_msg}")
+                    return None
+                    
+                # Continue polling if status is 'starting' or 'processing'
                 
-                logger.error(f"❌ Flux Pro prediction timed out after {max_attempts} attempts")
-                return None
+            logger.error(f"❌ Flux Pro prediction timed out after {max_attempts} attempts")
+            return None
                 
         except Exception as e:
             logger.error(f"❌ Flux Pro API call failed: {e}")
@@ -320,23 +324,23 @@ Technical quality: Professional poster design studio standard, theatrical market
             logger.info(f"💾 Saving to: {filepath}")
             
             # Download and save image
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(image_url)
-                if response.status_code == 200:
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
+            client = self._http_client or get_shared_http_client()
+            response = await client.get(image_url, timeout=30.0)
+            if response.status_code == 200:
+                with open(filepath, 'wb') as f:
+                    f.write(response.content)
                     
-                    # Verify file was saved and return proper URL
-                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                        relative_url = f"/uploads/posters/{filename}"
-                        logger.info(f"✅ Flux Pro poster saved: {relative_url} ({os.path.getsize(filepath)} bytes)")
-                        return relative_url
-                    else:
-                        logger.error(f"❌ File not saved or empty: {filepath}")
-                        return None
+                # Verify file was saved and return proper URL
+                if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+                    relative_url = f"/uploads/posters/{filename}"
+                    logger.info(f"✅ Flux Pro poster saved: {relative_url} ({os.path.getsize(filepath)} bytes)")
+                    return relative_url
                 else:
-                    logger.error(f"❌ Failed to download image: {response.status_code} - {response.text}")
+                    logger.error(f"❌ File not saved or empty: {filepath}")
                     return None
+            else:
+                logger.error(f"❌ Failed to download image: {response.status_code} - {response.text}")
+                return None
                     
         except Exception as e:
             logger.error(f"❌ Failed to save Flux Pro poster image: {e}")
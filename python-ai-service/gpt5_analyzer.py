@@ -14,6 +14,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
+from api_retry import post_with_backoff
 from budget_utils import format_budget_context_for_ai, estimate_budget_from_screenplay, get_casting_suggestions_by_budget
 
 load_dotenv()
@@ -54,7 +56,8 @@ class GPT5Result:
 class GPT5Analyzer:
     """GPT-5 API integration for advanced screenplay writing analysis"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_url = "https://api.openai.com/v1/chat/completions"
         self.model = "gpt-5-chat-latest"  # Latest GPT-5 model
@@ -321,22 +324,25 @@ Think deeply about elements that require professional expertise to evaluate prop
             "stream": False
         }
         
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                self.api_url,
-                headers=headers,
-                json=payload
-            )
+        client = self._http_client or get_shared_http_client()
+        response = await post_with_backoff(
+            client,
+            self.api_url,
+            "GPT-5",
+            headers=headers,
+            json=payload,
+            timeout=120.0
+        )
             
-            if response.status_code != 200:
-                raise Exception(f"GPT-5 API error: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"GPT-5 API error: {response.status_code} - {response.text}")
             
-            data = response.json()
+        data = response.json()
             
-            if 'choices' not in data or not data['choices']:
-                raise Exception("Invalid GPT-5 API response format")
+        if 'choices' not in data or not data['choices']:
+            raise Exception("Invalid GPT-5 API response format")
             
-            return data['choices'][0]['message']['content']
+        return data['choices'][0]['message']['content']
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse GPT-5 response with writing excellence focus"""
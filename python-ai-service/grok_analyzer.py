@@ -5,16 +5,23 @@ Provides secondary AI evaluation alongside Claude Opus 4.1
 """
 
 import os
-import json
+import re
+import fcntl
+import asyncio
 import time
 import logging
+import random
+import hashlib
 import base64
 import uuid
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 import httpx
+import orjson
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
+from api_retry import post_with_backoff
 from budget_utils import format_budget_context_for_ai, estimate_budget_from_screenplay, get_casting_suggestions_by_budget
 
 load_dotenv()
@@ -23,6 +30,66 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Anything but word characters, spaces and hyphens is stripped from poster filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]')
+
+# Chunk size for streaming poster downloads to disk
+POSTER_CHUNK_SIZE = 128 * 1024
+
+def _existing_file_size(filepath: str) -> int:
+    """Size of a file in bytes, or 0 if it does not exist"""
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return 0
+
+def _open_poster_file(filepath: str):
+    """Open a poster file for writing, asking macOS not to cache it (F_NOCACHE)"""
+    # 128KB buffer rather than the 8KB default; full-size chunks bypass the buffer copy
+    f = open(filepath, 'wb', buffering=POSTER_CHUNK_SIZE)
+    if hasattr(fcntl, 'F_NOCACHE'):
+        try:
+            fcntl.fcntl(f.fileno(), fcntl.F_NOCACHE, 1)
+        except OSError:
+            pass
+    return f
+
+def _release_page_cache(f) -> None:
+    """Flush a written poster and let Linux drop it from the page cache; nginx re-reads it on demand"""
+    f.flush()
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            # DONTNEED only drops clean pages, so write them back first
+            os.fsync(f.fileno())
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+# Concurrent poster downloads allowed, and attempts per download on 429/5xx
+POSTER_DOWNLOAD_CONCURRENCY = 16
+POSTER_DOWNLOAD_ATTEMPTS = 5
+_poster_download_semaphore = asyncio.Semaphore(POSTER_DOWNLOAD_CONCURRENCY)
+
+# Shared keep-alive client for poster downloads, created on first use
+_poster_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_poster_http_client() -> httpx.AsyncClient:
+    """Return the shared poster download client, creating it if needed"""
+    global _poster_http_client
+    if _poster_http_client is None or _poster_http_client.is_closed:
+        _poster_http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+        )
+    return _poster_http_client
+
+async def close_poster_http_client():
+    """Close the shared poster download client (call on service shutdown)"""
+    global _poster_http_client
+    if _poster_http_client is not None:
+        await _poster_http_client.aclose()
+        _poster_http_client = None
+
 @dataclass
 class GrokResult:
     """Grok 4 analysis result with enhanced cultural and market insights"""
@@ -43,10 +110,94 @@ class GrokResult:
     movie_poster_url: Optional[str] = None
     poster_generation_prompt: Optional[str] = None
 
+@dataclass
+class CulturalRealityCheck:
+    """Cultural reality check section of a Grok response"""
+    cringe_factor: int = 5  # 1-10
+    meme_potential: str = 'Low meme potential'
+    twitter_discourse: str = 'Neutral reception expected'
+    zeitgeist_score: int = 5  # 1-10
+    hello_fellow_kids_energy: str = 'No obvious pandering detected'
+    
+    def __post_init__(self):
+        self.cringe_factor = min(10, max(1, self.cringe_factor))
+        self.zeitgeist_score = min(10, max(1, self.zeitgeist_score))
+
+@dataclass
+class DemographicAuthenticityAudit:
+    """Demographic authenticity audit section of a Grok response"""
+    gen_z_dialogue_authenticity: str = 'Authenticity unclear'
+    subculture_authenticity_rating: str = 'No specific subcultures identified'
+    social_media_realism: str = 'Social media usage not prominent'
+    demographic_accuracy: str = 'General demographic representation'
+
+@dataclass
+class BrutalHonestyAssessment:
+    """Brutal honesty section of a Grok response"""
+    protagonist_reality_check: str = 'Protagonist assessment unclear'
+    tiktok_brain_pacing: str = 'Pacing analysis needed'
+    competition_brutality: str = 'Competitive analysis needed'
+    production_reality: str = 'Production feasibility unclear'
+
+@dataclass
+class DiscoursePredictionEngine:
+    """Discourse prediction section of a Grok response"""
+    think_piece_titles: list = field(default_factory=list)
+    twitter_drama_assessment: str = 'Low drama potential'
+    quote_tweet_predictions: list = field(default_factory=list)
+    viral_moment_scanner: str = 'No obvious viral moments'
+
+@dataclass
+class GenreFreshnessAssessment:
+    """Genre freshness section of a Grok response"""
+    innovation_scale: str = 'Standard genre execution'
+    twitter_joke_fodder: str = 'No obvious joke fodder'
+    self_awareness_check: str = 'Self-awareness level unclear'
+    freshness_reality: str = 'Freshness assessment needed'
+
+@dataclass
+class MarketPositioningIntelligence:
+    """Market positioning section of a Grok response"""
+    platform_fit: str = 'Platform fit unclear'
+    target_demo_reality: str = 'Target demographic unclear'
+    oscar_bait_detection: str = 'Oscar potential unclear'
+    comp_title_brutality: str = 'Comparable titles analysis needed'
+
+@dataclass
+class ControversyAnalysis:
+    """Legacy controversy analysis section of a Grok response"""
+    representation_risk: str = 'Low risk'
+    backlash_potential: str = 'Minimal backlash expected'
+    polarization_level: str = 'Low polarization'
+    boundary_assessment: str = 'Within acceptable boundaries'
+
+# Response key -> section schema, in the order sections are emitted
+ENHANCED_SECTION_SCHEMAS = {
+    'cultural_reality_check': CulturalRealityCheck,
+    'demographic_authenticity_audit': DemographicAuthenticityAudit,
+    'brutal_honesty_assessment': BrutalHonestyAssessment,
+    'discourse_prediction_engine': DiscoursePredictionEngine,
+    'genre_freshness_assessment': GenreFreshnessAssessment,
+    'market_positioning_intelligence': MarketPositioningIntelligence,
+    'controversy_analysis': ControversyAnalysis,  # Legacy support
+}
+
+# Field names per schema, resolved once instead of on every response
+_SECTION_FIELD_NAMES = {
+    schema: frozenset(f.name for f in fields(schema))
+    for schema in ENHANCED_SECTION_SCHEMAS.values()
+}
+
+def _build_section(schema, section: Dict[str, Any]) -> Dict[str, Any]:
+    """Populate a section schema from raw response data, filling defaults for missing keys"""
+    names = _SECTION_FIELD_NAMES[schema]
+    return vars(schema(**{k: v for k, v in section.items() if k in names}))
+
 class GrokAnalyzer:
     """Grok 4 API integration for screenplay analysis with enhanced cultural insights"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("XAI_API_KEY")
         self.api_url = "https://api.x.ai/v1/chat/completions"
         self.model = "grok-4-latest"
@@ -127,12 +278,25 @@ class GrokAnalyzer:
             return result
             
         except Exception as e:
-            logger.error(f"❌ Grok analysis failed: {type(e).__name__}: {str(e)}")
-            logger.error(f"❌ Grok error details: {repr(e)}")
-            import traceback
-            logger.error(f"❌ Grok traceback: {traceback.format_exc()}")
+            logger.exception("❌ Grok analysis failed: %s: %s", type(e).__name__, e)
             return None
     
+    async def analyze_many(self, batch: List[Tuple[str, str, str, Optional[float]]], concurrency: int = 8) -> List[Optional[GrokResult]]:
+        """Analyze a slate of screenplays concurrently
+        
+        Each item is (screenplay_text, title, genre, budget_estimate). Results are
+        returned in input order; failed items map to None, same as analyze().
+        """
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _analyze_one(args: Tuple[str, str, str, Optional[float]]) -> Optional[GrokResult]:
+            async with semaphore:
+                return await self.analyze(*args)
+        
+        results = await asyncio.gather(*(_analyze_one(args) for args in batch), return_exceptions=True)
+        return [None if isinstance(result, BaseException) else result for result in results]
+    
     def _create_prompt(self, screenplay_text: str, title: str, genre: str, budget_estimate: Optional[float] = None) -> str:
         """Create enhanced prompt for Grok 4 with Phase 1 cultural analysis"""
         
@@ -307,32 +471,35 @@ Provide analysis as JSON with these exact keys:
             "stream": False
         }
         
-        async with httpx.AsyncClient(timeout=90.0) as client:  # Increased timeout
-            try:
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload
-                )
-            except httpx.ReadTimeout:
-                logger.error("❌ Grok API timeout after 90 seconds")
-                raise Exception("Grok API timeout - service may be overloaded")
-            except httpx.ConnectTimeout:
-                logger.error("❌ Grok API connection timeout")
-                raise Exception("Grok API connection timeout")
-            except Exception as e:
-                logger.error(f"❌ Grok API request failed: {e}")
-                raise
+        client = self._http_client or get_shared_http_client()
+        try:
+            response = await post_with_backoff(
+                client,
+                self.api_url,
+                "Grok",
+                headers=headers,
+                json=payload,
+                timeout=90.0  # Increased timeout
+            )
+        except httpx.ReadTimeout:
+            logger.error("❌ Grok API timeout after 90 seconds")
+            raise Exception("Grok API timeout - service may be overloaded")
+        except httpx.ConnectTimeout:
+            logger.error("❌ Grok API connection timeout")
+            raise Exception("Grok API connection timeout")
+        except Exception as e:
+            logger.error(f"❌ Grok API request failed: {e}")
+            raise
             
-            if response.status_code != 200:
-                raise Exception(f"Grok API error: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"Grok API error: {response.status_code} - {response.text}")
             
-            data = response.json()
+        data = orjson.loads(response.content)
             
-            if 'choices' not in data or not data['choices']:
-                raise Exception("Invalid Grok API response format")
+        if 'choices' not in data or not data['choices']:
+            raise Exception("Invalid Grok API response format")
             
-            return data['choices'][0]['message']['content']
+        return data['choices'][0]['message']['content']
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse enhanced Grok response into structured data"""
@@ -354,7 +521,7 @@ Provide analysis as JSON with these exact keys:
                 # Try to fix truncated JSON by adding missing closing braces
                 json_str = self._fix_truncated_json(json_str)
                 
-                parsed_data = json.loads(json_str)
+                parsed_data = orjson.loads(json_str)
                 logger.info("✅ Successfully parsed JSON on first attempt")
                 
                 # Validate and structure the enhanced response
@@ -364,7 +531,7 @@ Provide analysis as JSON with these exact keys:
                 logger.warning("⚠️  No JSON found in Grok response, using fallback parsing")
                 return self._fallback_parse(response)
                 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(f"⚠️  JSON parsing failed: {e}, attempting enhanced repair")
             
             # Try multiple JSON extraction and repair strategies
@@ -386,7 +553,7 @@ Provide analysis as JSON with these exact keys:
                 try:
                     json_str = strategy(response)
                     if json_str:
-                        parsed_data = json.loads(json_str)
+                        parsed_data = orjson.loads(json_str)
                         logger.info(f"✅ Successfully parsed JSON using repair strategy {i}")
                         return self._validate_enhanced_response(parsed_data)
                 except Exception as strategy_error:
@@ -660,71 +827,10 @@ Provide analysis as JSON with these exact keys:
             'confidence': data.get('confidence', 0.7)
         }
         
-        # Validate Enhanced Analysis Categories
-        if 'cultural_reality_check' in data:
-            cultural = data['cultural_reality_check']
-            validated['cultural_reality_check'] = {
-                'cringe_factor': min(10, max(1, cultural.get('cringe_factor', 5))),
-                'meme_potential': cultural.get('meme_potential', 'Low meme potential'),
-                'twitter_discourse': cultural.get('twitter_discourse', 'Neutral reception expected'),
-                'zeitgeist_score': min(10, max(1, cultural.get('zeitgeist_score', 5))),
-                'hello_fellow_kids_energy': cultural.get('hello_fellow_kids_energy', 'No obvious pandering detected')
-            }
-        
-        if 'demographic_authenticity_audit' in data:
-            demo = data['demographic_authenticity_audit']
-            validated['demographic_authenticity_audit'] = {
-                'gen_z_dialogue_authenticity': demo.get('gen_z_dialogue_authenticity', 'Authenticity unclear'),
-                'subculture_authenticity_rating': demo.get('subculture_authenticity_rating', 'No specific subcultures identified'),
-                'social_media_realism': demo.get('social_media_realism', 'Social media usage not prominent'),
-                'demographic_accuracy': demo.get('demographic_accuracy', 'General demographic representation')
-            }
-        
-        if 'brutal_honesty_assessment' in data:
-            brutal = data['brutal_honesty_assessment']
-            validated['brutal_honesty_assessment'] = {
-                'protagonist_reality_check': brutal.get('protagonist_reality_check', 'Protagonist assessment unclear'),
-                'tiktok_brain_pacing': brutal.get('tiktok_brain_pacing', 'Pacing analysis needed'),
-                'competition_brutality': brutal.get('competition_brutality', 'Competitive analysis needed'),
-                'production_reality': brutal.get('production_reality', 'Production feasibility unclear')
-            }
-        
-        if 'discourse_prediction_engine' in data:
-            discourse = data['discourse_prediction_engine']
-            validated['discourse_prediction_engine'] = {
-                'think_piece_titles': discourse.get('think_piece_titles', []),
-                'twitter_drama_assessment': discourse.get('twitter_drama_assessment', 'Low drama potential'),
-                'quote_tweet_predictions': discourse.get('quote_tweet_predictions', []),
-                'viral_moment_scanner': discourse.get('viral_moment_scanner', 'No obvious viral moments')
-            }
-        
-        if 'genre_freshness_assessment' in data:
-            genre_fresh = data['genre_freshness_assessment']
-            validated['genre_freshness_assessment'] = {
-                'innovation_scale': genre_fresh.get('innovation_scale', 'Standard genre execution'),
-                'twitter_joke_fodder': genre_fresh.get('twitter_joke_fodder', 'No obvious joke fodder'),
-                'self_awareness_check': genre_fresh.get('self_awareness_check', 'Self-awareness level unclear'),
-                'freshness_reality': genre_fresh.get('freshness_reality', 'Freshness assessment needed')
-            }
-        
-        if 'market_positioning_intelligence' in data:
-            market = data['market_positioning_intelligence']
-            validated['market_positioning_intelligence'] = {
-                'platform_fit': market.get('platform_fit', 'Platform fit unclear'),
-                'target_demo_reality': market.get('target_demo_reality', 'Target demographic unclear'),
-                'oscar_bait_detection': market.get('oscar_bait_detection', 'Oscar potential unclear'),
-                'comp_title_brutality': market.get('comp_title_brutality', 'Comparable titles analysis needed')
-            }
-        
-        # Legacy support for old controversy_analysis field
-        if 'controversy_analysis' in data:
-            controversy = data['controversy_analysis']
-            validated['controversy_analysis'] = {
-                'representation_risk': controversy.get('representation_risk', 'Low risk'),
-                'backlash_potential': controversy.get('backlash_potential', 'Minimal backlash expected'),
-                'polarization_level': controversy.get('polarization_level', 'Low polarization'),
-                'boundary_assessment': controversy.get('boundary_assessment', 'Within acceptable boundaries')
-            }
+        # Validate Enhanced Analysis Categories against their section schemas
+        for key, schema in ENHANCED_SECTION_SCHEMAS.items():
+            if key in data:
+                validated[key] = _build_section(schema, data[key])
         
         return validated
     
@@ -873,28 +979,29 @@ Provide analysis as JSON with these exact keys:
                 "style": "vivid"
             }
             
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/images/generations",
-                    headers=headers,
-                    json=payload
-                )
+            client = self._http_client or get_shared_http_client()
+            response = await client.post(
+                "https://api.openai.com/v1/images/generations",
+                headers=headers,
+                json=payload,
+                timeout=120.0
+            )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('data') and len(data['data']) > 0:
-                        image_url = data['data'][0]['url']
-                        logger.info(f"🎬 Generated poster image for '{title}'")
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                if data.get('data') and len(data['data']) > 0:
+                    image_url = data['data'][0]['url']
+                    logger.info(f"🎬 Generated poster image for '{title}'")
                         
-                        # Save image locally (optional)
-                        saved_url = await self._save_poster_image(image_url, title)
-                        return saved_url or image_url
-                    else:
-                        logger.error("No image data in DALL-E response")
-                        return None
+                    # Save image locally (optional)
+                    saved_url = await self._save_poster_image(image_url, title)
+                    return saved_url or image_url
                 else:
-                    logger.error(f"DALL-E API error: {response.status_code} - {response.text}")
+                    logger.error("No image data in DALL-E response")
                     return None
+            else:
+                logger.error(f"DALL-E API error: {response.status_code} - {response.text}")
+                return None
                     
         except Exception as e:
             logger.error(f"❌ Image generation failed: {e}")
@@ -906,35 +1013,56 @@ Provide analysis as JSON with these exact keys:
         try:
             # Create uploads directory if it doesn't exist
             poster_dir = "uploads/posters"
-            os.makedirs(poster_dir, exist_ok=True)
+            await asyncio.to_thread(os.makedirs, poster_dir, exist_ok=True)
             
-            # Generate filename
-            safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_title = safe_title.replace(' ', '_')
-            filename = f"{safe_title}_{int(time.time())}.png"
+            # Content-addressed filename: the same image URL always maps to the same file
+            safe_title = _UNSAFE_FILENAME_CHARS.sub('', title).rstrip().replace(' ', '_')
+            url_hash = hashlib.blake2b(image_url.encode(), digest_size=16).hexdigest()
+            filename = f"{safe_title[:40]}_{url_hash}.png"
             filepath = os.path.join(poster_dir, filename)
+            relative_url = f"/uploads/posters/{filename}"
+            
+            if await asyncio.to_thread(_existing_file_size, filepath) > 0:
+                logger.info(f"♻️  Poster already downloaded: {relative_url}")
+                return relative_url
             
             logger.info(f"🔄 Downloading poster from: {image_url}")
             logger.info(f"💾 Saving to: {filepath}")
             
-            # Download and save image
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(image_url)
-                if response.status_code == 200:
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
+            # Stream the image to disk in 128KB chunks, bounding concurrent downloads
+            # and backing off on rate limits / server errors
+            client = _get_poster_http_client()
+            async with _poster_download_semaphore:
+                for attempt in range(POSTER_DOWNLOAD_ATTEMPTS):
+                    async with client.stream("GET", image_url) as response:
+                        if response.status_code == 200:
+                            # Write to a temp name so a failed download never looks like a cache hit
+                            partial_path = filepath + ".part"
+                            with await asyncio.to_thread(_open_poster_file, partial_path) as f:
+                                async for chunk in response.aiter_bytes(POSTER_CHUNK_SIZE):
+                                    await asyncio.to_thread(f.write, chunk)
+                                await asyncio.to_thread(_release_page_cache, f)
+                            await asyncio.to_thread(os.replace, partial_path, filepath)
+                            break
+                        
+                        retryable = response.status_code == 429 or response.status_code >= 500
+                        if not retryable or attempt == POSTER_DOWNLOAD_ATTEMPTS - 1:
+                            await response.aread()
+                            logger.error(f"❌ Failed to download image: {response.status_code} - {response.text}")
+                            return None
                     
-                    # Verify file was saved and return proper URL
-                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                        relative_url = f"/uploads/posters/{filename}"
-                        logger.info(f"✅ Poster saved: {relative_url} ({os.path.getsize(filepath)} bytes)")
-                        return relative_url
-                    else:
-                        logger.error(f"❌ File not saved or empty: {filepath}")
-                        return None
-                else:
-                    logger.error(f"❌ Failed to download image: {response.status_code} - {response.text}")
-                    return None
+                    delay = 2 ** attempt + random.random()
+                    logger.warning(f"⚠️  Poster download returned {response.status_code}, retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+            
+            # Verify file was saved and return proper URL
+            saved_size = await asyncio.to_thread(_existing_file_size, filepath)
+            if saved_size > 0:
+                logger.info(f"✅ Poster saved: {relative_url} ({saved_size} bytes)")
+                return relative_url
+            else:
+                logger.error(f"❌ File not saved or empty: {filepath}")
+                return None
                     
         except Exception as e:
             logger.error(f"❌ Failed to save poster image: {e}")
@@ -1111,9 +1239,9 @@ Provide analysis as JSON with these exact keys:
             enhanced_analysis['controversy_analysis'] = result.controversy_analysis
             
         # Store all enhanced analysis in the cultural_analysis field for now (backward compatibility)
-        db_data['grok_cultural_analysis'] = json.dumps(enhanced_analysis) if enhanced_analysis else None
-        db_data['grok_brutal_honesty'] = json.dumps(result.brutal_honesty_assessment) if result.brutal_honesty_assessment else None
-        db_data['grok_controversy_analysis'] = json.dumps(result.controversy_analysis) if result.controversy_analysis else None
+        db_data['grok_cultural_analysis'] = orjson.dumps(enhanced_analysis).decode() if enhanced_analysis else None
+        db_data['grok_brutal_honesty'] = orjson.dumps(result.brutal_honesty_assessment).decode() if result.brutal_honesty_assessment else None
+        db_data['grok_controversy_analysis'] = orjson.dumps(result.controversy_analysis).decode() if result.controversy_analysis else None
         
         # Add Phase 2 enhancement - Movie Poster
         db_data['grok_movie_poster_url'] = result.movie_poster_url
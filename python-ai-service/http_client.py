@@ -0,0 +1,34 @@
+"""
+Shared HTTP Client
+One pooled httpx.AsyncClient for all AI provider calls
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Shared across analyzers so TLS sessions are reused and same-host calls multiplex over HTTP/2;
+# individual calls pass their own timeout
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Return the shared provider client, creating it if needed"""
+    global _shared_http_client
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(120.0, connect=10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+        )
+        logger.info("🌐 Shared HTTP/2 client created for AI providers")
+    return _shared_http_client
+
+async def close_shared_http_client():
+    """Close the shared provider client (call on service shutdown)"""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
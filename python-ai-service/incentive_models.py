@@ -5,20 +5,159 @@ Provides data access layer for film incentive tracking system
 """
 
 import os
-import json
+import time
 import logging
+import threading
 import mysql.connector
+import mysql.connector.pooling
 from mysql.connector import Error
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, date
-from dataclasses import dataclass, asdict
+from operator import itemgetter
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path='../.env')
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Process-wide MySQL connection pool, created on first IncentiveDatabase use
+_connection_pool = None
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a JSON column value (non-str keys allowed, matching json.dumps)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def _decode_json_column(row: Dict[str, Any], key: str) -> None:
+    """Decode a JSON column in place; the driver may hand back str or raw bytes"""
+    value = row[key]
+    if value and isinstance(value, (str, bytes, bytearray)):
+        try:
+            row[key] = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            row[key] = {}
+
+def _iter_rows(cursor, size: int = 256):
+    """Yield rows from an unbuffered cursor in fetchmany() batches"""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+# Incentive data changes on the order of days (the updater runs from cron in its
+# own process), so read queries are cached in-process for a few minutes
+INCENTIVE_CACHE_TTL_SECONDS = 600
+INCENTIVE_CACHE_MAX_ENTRIES = 128
+_incentive_cache: Dict[Tuple, Tuple[float, List[Any]]] = {}
+_incentive_cache_lock = threading.Lock()
+
+def _ttl_cached(method):
+    """Cache a read-only IncentiveDatabase method's result list by its arguments"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _incentive_cache_lock:
+            cached = _incentive_cache.get(key)
+        if cached and now - cached[0] < INCENTIVE_CACHE_TTL_SECONDS:
+            return list(cached[1])
+        
+        result = method(self, *args, **kwargs)
+        if result:  # Don't cache empty results, which also cover query errors
+            with _incentive_cache_lock:
+                if len(_incentive_cache) >= INCENTIVE_CACHE_MAX_ENTRIES:
+                    _incentive_cache.clear()  # Budget-keyed entries are unbounded; start over
+                _incentive_cache[key] = (now, result)
+        return list(result)
+    return wrapper
+
+def clear_incentive_cache() -> None:
+    """Drop all cached incentive reads (called after writes to film_incentives)"""
+    with _incentive_cache_lock:
+        _incentive_cache.clear()
+
+# Column list shared by every FilmIncentive SELECT; must stay in dataclass field order (see from_row)
+_INCENTIVE_COLUMNS = """
+    id, country, region, incentive_type, percentage, max_credit,
+    requirements, application_deadline, current_cap_remaining,
+    is_active, minimum_spend, maximum_spend, processing_time_days,
+    created_at, updated_at, expires_at
+"""
+_SELECT_INCENTIVES = f"SELECT {_INCENTIVE_COLUMNS} FROM film_incentives"
+
+# Requirement keys that make an incentive harder to obtain, in bit order.
+# find_and_rank_incentives encodes their presence as an integer bitmap in SQL,
+# so scoring never has to fetch or decode the requirements JSON.
+COMPLEXITY_REQUIREMENT_KEYS = (
+    'cultural_test', 'canadian_content', 'european_content',
+    'local_crew_requirement', 'resident_workers', 'labour_requirement'
+)
+# NULL when there are no requirements at all (scored differently from "none of the complex ones")
+_REQUIREMENT_FLAGS_SQL = "CASE WHEN requirements IS NULL OR JSON_LENGTH(requirements) = 0 THEN NULL ELSE {} END".format(
+    " | ".join(
+        f"(JSON_CONTAINS_PATH(requirements, 'one', '$.{key}') << {bit})"
+        for bit, key in enumerate(COMPLEXITY_REQUIREMENT_KEYS)
+    )
+)
+
+# INSERT statements shared by the single-row and bulk create methods
+_INSERT_INCENTIVE_SQL = """
+    INSERT INTO film_incentives (
+        country, region, incentive_type, percentage, max_credit,
+        requirements, application_deadline, current_cap_remaining,
+        is_active, minimum_spend, maximum_spend, processing_time_days,
+        expires_at
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+_INSERT_LOCATION_REQUIREMENT_SQL = """
+    INSERT INTO location_requirements (
+        analysis_id, location_type, description, script_mentions,
+        feasibility_score, estimated_days, special_requirements
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+_INSERT_INCENTIVE_MATCH_SQL = """
+    INSERT INTO analysis_location_matches (
+        analysis_id, incentive_id, location_requirement_id,
+        match_score, estimated_savings, notes
+    ) VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        match_score = VALUES(match_score),
+        estimated_savings = VALUES(estimated_savings),
+        notes = VALUES(notes)
+"""
+
+def _incentive_values(incentive: 'FilmIncentive') -> Tuple:
+    """Row values for _INSERT_INCENTIVE_SQL"""
+    return (
+        incentive.country, incentive.region, incentive.incentive_type,
+        incentive.percentage, incentive.max_credit,
+        _json_dumps(incentive.requirements) if incentive.requirements else None,
+        incentive.application_deadline, incentive.current_cap_remaining,
+        incentive.is_active, incentive.minimum_spend, incentive.maximum_spend,
+        incentive.processing_time_days, incentive.expires_at
+    )
+
+def _location_requirement_values(requirement: 'LocationRequirement') -> Tuple:
+    """Row values for _INSERT_LOCATION_REQUIREMENT_SQL"""
+    return (
+        requirement.analysis_id, requirement.location_type, requirement.description,
+        requirement.script_mentions, requirement.feasibility_score, requirement.estimated_days,
+        _json_dumps(requirement.special_requirements) if requirement.special_requirements else None
+    )
+
+def _incentive_match_values(match: 'AnalysisLocationMatch') -> Tuple:
+    """Row values for _INSERT_INCENTIVE_MATCH_SQL"""
+    return (
+        match.analysis_id, match.incentive_id, match.location_requirement_id,
+        match.match_score, match.estimated_savings, match.notes
+    )
+
+@dataclass(slots=True)
 class FilmIncentive:
     """Film incentive data model"""
     id: Optional[int] = None
@@ -37,8 +176,13 @@ class FilmIncentive:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     expires_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'FilmIncentive':
+        """Build from a _SELECT_INCENTIVES row; columns are selected in field order, so bind positionally"""
+        return cls(*row.values())
 
-@dataclass
+@dataclass(slots=True)
 class LocationRequirement:
     """Location requirement data model"""
     id: Optional[int] = None
@@ -50,8 +194,27 @@ class LocationRequirement:
     estimated_days: Optional[int] = None
     special_requirements: Optional[Dict[str, Any]] = None
     created_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'LocationRequirement':
+        """Build from a location_requirements row selected in field order, binding positionally"""
+        return cls(*row.values())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict of fields (avoids asdict's recursive deep copy)"""
+        return {
+            'id': self.id,
+            'analysis_id': self.analysis_id,
+            'location_type': self.location_type,
+            'description': self.description,
+            'script_mentions': self.script_mentions,
+            'feasibility_score': self.feasibility_score,
+            'estimated_days': self.estimated_days,
+            'special_requirements': self.special_requirements,
+            'created_at': self.created_at
+        }
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisLocationMatch:
     """Analysis to incentive match data model"""
     id: Optional[int] = None
@@ -82,46 +245,52 @@ class IncentiveDatabase:
                 self.password = self.password.replace('\\$', '$')
         
         self.database = os.getenv("DB_NAME")
-        self.connection = None
+        
+        # Pool shared by every IncentiveDatabase in the process
+        self.pool_config = {
+            'pool_name': 'incentive_pool',
+            'pool_size': 8,
+            'pool_reset_session': True,
+            'host': self.host,
+            'user': self.user,
+            'password': self.password,
+            'database': self.database,
+            'autocommit': True,
+            'charset': 'utf8mb4',
+            'use_unicode': True,
+            'use_pure': False  # Use the bundled C extension (libmysqlclient) for row decoding
+        }
         self.connect()
     
     def connect(self):
-        """Establish database connection"""
+        """Create the shared connection pool if it does not exist yet"""
+        global _connection_pool
+        if _connection_pool:
+            return
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                autocommit=True,
-                charset='utf8mb4',
-                use_unicode=True
-            )
-            logger.info("✅ Incentive database connected successfully")
+            _connection_pool = mysql.connector.pooling.MySQLConnectionPool(**self.pool_config)
+            logger.info(f"✅ Incentive database connection pool created (size: {self.pool_config['pool_size']})")
         except Error as e:
             logger.error(f"❌ Incentive database connection error: {e}")
             raise
 
     def get_connection(self):
-        """Get database connection, reconnect if needed"""
-        if not self.connection or not self.connection.is_connected():
+        """Get a pooled database connection; callers must close() it to return it to the pool"""
+        if not _connection_pool:
             self.connect()
-        return self.connection
+        return _connection_pool.get_connection()
 
     # ==================== FILM INCENTIVE CRUD ====================
     
+    @_ttl_cached
     def get_all_incentives(self, active_only: bool = True) -> List[FilmIncentive]:
         """Get all film incentives"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor(dictionary=True)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
             
-            query = """
-                SELECT id, country, region, incentive_type, percentage, max_credit,
-                       requirements, application_deadline, current_cap_remaining,
-                       is_active, minimum_spend, maximum_spend, processing_time_days,
-                       created_at, updated_at, expires_at
-                FROM film_incentives
-            """
+            query = _SELECT_INCENTIVES
             
             if active_only:
                 query += " WHERE is_active = TRUE AND (expires_at IS NULL OR expires_at > NOW())"
@@ -129,18 +298,14 @@ class IncentiveDatabase:
             query += " ORDER BY percentage DESC"
             
             cursor.execute(query)
-            results = cursor.fetchall()
             
+            # Stream the unbounded result set in chunks rather than fetchall()
             incentives = []
-            for row in results:
+            for row in _iter_rows(cursor):
                 # Parse JSON requirements if present
-                if row['requirements']:
-                    try:
-                        row['requirements'] = json.loads(row['requirements']) if isinstance(row['requirements'], str) else row['requirements']
-                    except (json.JSONDecodeError, TypeError):
-                        row['requirements'] = {}
+                _decode_json_column(row, 'requirements')
                 
-                incentives.append(FilmIncentive(**row))
+                incentives.append(FilmIncentive.from_row(row))
             
             logger.info(f"📋 Retrieved {len(incentives)} incentives")
             return incentives
@@ -148,53 +313,50 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error retrieving incentives: {e}")
             return []
+        finally:
+            if connection:
+                connection.close()
 
+    @_ttl_cached
     def get_incentives_by_country(self, country: str) -> List[FilmIncentive]:
         """Get incentives for a specific country"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor(dictionary=True)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
             
-            query = """
-                SELECT id, country, region, incentive_type, percentage, max_credit,
-                       requirements, application_deadline, current_cap_remaining,
-                       is_active, minimum_spend, maximum_spend, processing_time_days,
-                       created_at, updated_at, expires_at
-                FROM film_incentives
+            query = _SELECT_INCENTIVES + """
                 WHERE country = %s AND is_active = TRUE 
                 AND (expires_at IS NULL OR expires_at > NOW())
                 ORDER BY percentage DESC
             """
             
             cursor.execute(query, (country,))
-            results = cursor.fetchall()
             
             incentives = []
-            for row in results:
-                if row['requirements']:
-                    try:
-                        row['requirements'] = json.loads(row['requirements']) if isinstance(row['requirements'], str) else row['requirements']
-                    except (json.JSONDecodeError, TypeError):
-                        row['requirements'] = {}
+            for row in _iter_rows(cursor):
+                _decode_json_column(row, 'requirements')
                 
-                incentives.append(FilmIncentive(**row))
+                incentives.append(FilmIncentive.from_row(row))
             
             return incentives
             
         except Error as e:
             logger.error(f"❌ Error retrieving incentives for {country}: {e}")
             return []
+        finally:
+            if connection:
+                connection.close()
 
+    @_ttl_cached
     def find_matching_incentives(self, budget: float, min_percentage: float = 0.0) -> List[FilmIncentive]:
         """Find incentives matching budget and minimum percentage criteria"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor(dictionary=True)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
             
-            query = """
-                SELECT id, country, region, incentive_type, percentage, max_credit,
-                       requirements, application_deadline, current_cap_remaining,
-                       is_active, minimum_spend, maximum_spend, processing_time_days,
-                       created_at, updated_at, expires_at
-                FROM film_incentives
+            query = _SELECT_INCENTIVES + """
                 WHERE is_active = TRUE 
                 AND (expires_at IS NULL OR expires_at > NOW())
                 AND (minimum_spend IS NULL OR minimum_spend <= %s)
@@ -210,13 +372,9 @@ class IncentiveDatabase:
             
             incentives = []
             for row in results:
-                if row['requirements']:
-                    try:
-                        row['requirements'] = json.loads(row['requirements']) if isinstance(row['requirements'], str) else row['requirements']
-                    except (json.JSONDecodeError, TypeError):
-                        row['requirements'] = {}
+                _decode_json_column(row, 'requirements')
                 
-                incentives.append(FilmIncentive(**row))
+                incentives.append(FilmIncentive.from_row(row))
             
             logger.info(f"🎯 Found {len(incentives)} matching incentives for ${budget:,.0f} budget")
             return incentives
@@ -224,33 +382,67 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error finding matching incentives: {e}")
             return []
+        finally:
+            if connection:
+                connection.close()
 
-    def create_incentive(self, incentive: FilmIncentive) -> Optional[int]:
-        """Create new film incentive"""
+    @_ttl_cached
+    def find_and_rank_incentives(self, budget: float, min_percentage: float = 0.0, limit: int = 5) -> List[Dict[str, Any]]:
+        """Find matching incentives with savings computed and ranked in SQL"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor()
-            
-            query = """
-                INSERT INTO film_incentives (
-                    country, region, incentive_type, percentage, max_credit,
-                    requirements, application_deadline, current_cap_remaining,
-                    is_active, minimum_spend, maximum_spend, processing_time_days,
-                    expires_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
+            
+            # Same eligibility filters as find_matching_incentives; zero caps mean "no cap".
+            # The requirements JSON is deliberately not selected, so the hot path decodes none;
+            # only its complexity bitmap comes back.
+            query = f"""
+                SELECT id, country, region, incentive_type, percentage,
+                       qualifying_spend, gross_savings, requirement_flags,
+                       LEAST(gross_savings, IFNULL(max_credit, gross_savings)) AS final_savings,
+                       gross_savings > IFNULL(max_credit, gross_savings) AS max_credit_applied
+                FROM (
+                    SELECT id, country, region, incentive_type, percentage,
+                           {_REQUIREMENT_FLAGS_SQL} AS requirement_flags,
+                           NULLIF(max_credit, 0) AS max_credit,
+                           LEAST(%s, IFNULL(NULLIF(maximum_spend, 0), %s)) AS qualifying_spend,
+                           LEAST(%s, IFNULL(NULLIF(maximum_spend, 0), %s)) * percentage / 100 AS gross_savings
+                    FROM film_incentives
+                    WHERE is_active = TRUE 
+                    AND (expires_at IS NULL OR expires_at > NOW())
+                    AND (minimum_spend IS NULL OR minimum_spend <= %s)
+                    AND (maximum_spend IS NULL OR maximum_spend >= %s)
+                    AND percentage >= %s AND percentage > 0
+                    AND (current_cap_remaining IS NULL OR current_cap_remaining > minimum_spend)
+                ) matching
+                ORDER BY final_savings DESC
+                LIMIT %s
             """
             
-            requirements_json = json.dumps(incentive.requirements) if incentive.requirements else None
+            cursor.execute(query, (budget, budget, budget, budget, budget, budget, min_percentage, limit))
+            results = cursor.fetchall()
+            
+            logger.info(f"🎯 Ranked {len(results)} matching incentives for ${budget:,.0f} budget")
+            return results
             
-            values = (
-                incentive.country, incentive.region, incentive.incentive_type,
-                incentive.percentage, incentive.max_credit, requirements_json,
-                incentive.application_deadline, incentive.current_cap_remaining,
-                incentive.is_active, incentive.minimum_spend, incentive.maximum_spend,
-                incentive.processing_time_days, incentive.expires_at
-            )
+        except Error as e:
+            logger.error(f"❌ Error ranking matching incentives: {e}")
+            return []
+        finally:
+            if connection:
+                connection.close()
+
+    def create_incentive(self, incentive: FilmIncentive) -> Optional[int]:
+        """Create new film incentive"""
+        connection = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
             
-            cursor.execute(query, values)
+            cursor.execute(_INSERT_INCENTIVE_SQL, _incentive_values(incentive))
             incentive_id = cursor.lastrowid
+            clear_incentive_cache()
             
             logger.info(f"✅ Created incentive ID {incentive_id} for {incentive.country}")
             return incentive_id
@@ -258,13 +450,39 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error creating incentive: {e}")
             return None
+        finally:
+            if connection:
+                connection.close()
+
+    def create_incentives_bulk(self, incentives: List[FilmIncentive]) -> int:
+        """Insert many incentives in one executemany batch; returns rows written"""
+        if not incentives:
+            return 0
+        connection = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.executemany(_INSERT_INCENTIVE_SQL, [_incentive_values(incentive) for incentive in incentives])
+            clear_incentive_cache()
+            
+            logger.info(f"✅ Created {cursor.rowcount} incentives in bulk")
+            return cursor.rowcount
+            
+        except Error as e:
+            logger.error(f"❌ Error bulk creating incentives: {e}")
+            return 0
+        finally:
+            if connection:
+                connection.close()
 
     # ==================== LOCATION REQUIREMENT CRUD ====================
     
     def get_location_requirements(self, analysis_id: str) -> List[LocationRequirement]:
         """Get location requirements for an analysis"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor(dictionary=True)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
             
             query = """
                 SELECT id, analysis_id, location_type, description, script_mentions,
@@ -279,41 +497,27 @@ class IncentiveDatabase:
             
             requirements = []
             for row in results:
-                if row['special_requirements']:
-                    try:
-                        row['special_requirements'] = json.loads(row['special_requirements']) if isinstance(row['special_requirements'], str) else row['special_requirements']
-                    except (json.JSONDecodeError, TypeError):
-                        row['special_requirements'] = {}
+                _decode_json_column(row, 'special_requirements')
                 
-                requirements.append(LocationRequirement(**row))
+                requirements.append(LocationRequirement.from_row(row))
             
             return requirements
             
         except Error as e:
             logger.error(f"❌ Error retrieving location requirements: {e}")
             return []
+        finally:
+            if connection:
+                connection.close()
 
     def create_location_requirement(self, requirement: LocationRequirement) -> Optional[int]:
         """Create new location requirement"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor()
+            connection = self.get_connection()
+            cursor = connection.cursor()
             
-            query = """
-                INSERT INTO location_requirements (
-                    analysis_id, location_type, description, script_mentions,
-                    feasibility_score, estimated_days, special_requirements
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            special_req_json = json.dumps(requirement.special_requirements) if requirement.special_requirements else None
-            
-            values = (
-                requirement.analysis_id, requirement.location_type, requirement.description,
-                requirement.script_mentions, requirement.feasibility_score,
-                requirement.estimated_days, special_req_json
-            )
-            
-            cursor.execute(query, values)
+            cursor.execute(_INSERT_LOCATION_REQUIREMENT_SQL, _location_requirement_values(requirement))
             requirement_id = cursor.lastrowid
             
             logger.info(f"✅ Created location requirement ID {requirement_id}")
@@ -322,31 +526,40 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error creating location requirement: {e}")
             return None
+        finally:
+            if connection:
+                connection.close()
+
+    def create_location_requirements_bulk(self, requirements: List[LocationRequirement]) -> int:
+        """Insert many location requirements in one executemany batch; returns rows written"""
+        if not requirements:
+            return 0
+        connection = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.executemany(_INSERT_LOCATION_REQUIREMENT_SQL, [_location_requirement_values(requirement) for requirement in requirements])
+            
+            logger.info(f"✅ Created {cursor.rowcount} location requirements in bulk")
+            return cursor.rowcount
+            
+        except Error as e:
+            logger.error(f"❌ Error bulk creating location requirements: {e}")
+            return 0
+        finally:
+            if connection:
+                connection.close()
 
     # ==================== ANALYSIS LOCATION MATCH CRUD ====================
     
     def create_incentive_match(self, match: AnalysisLocationMatch) -> Optional[int]:
         """Create new analysis-incentive match"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor()
+            connection = self.get_connection()
+            cursor = connection.cursor()
             
-            query = """
-                INSERT INTO analysis_location_matches (
-                    analysis_id, incentive_id, location_requirement_id,
-                    match_score, estimated_savings, notes
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    match_score = VALUES(match_score),
-                    estimated_savings = VALUES(estimated_savings),
-                    notes = VALUES(notes)
-            """
-            
-            values = (
-                match.analysis_id, match.incentive_id, match.location_requirement_id,
-                match.match_score, match.estimated_savings, match.notes
-            )
-            
-            cursor.execute(query, values)
+            cursor.execute(_INSERT_INCENTIVE_MATCH_SQL, _incentive_match_values(match))
             match_id = cursor.lastrowid
             
             logger.info(f"✅ Created incentive match ID {match_id}")
@@ -355,11 +568,36 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error creating incentive match: {e}")
             return None
+        finally:
+            if connection:
+                connection.close()
+
+    def create_incentive_matches_bulk(self, matches: List[AnalysisLocationMatch]) -> int:
+        """Insert many incentive matches in one executemany batch; returns rows written"""
+        if not matches:
+            return 0
+        connection = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            cursor.executemany(_INSERT_INCENTIVE_MATCH_SQL, [_incentive_match_values(match) for match in matches])
+            
+            logger.info(f"✅ Created {cursor.rowcount} incentive matches in bulk")
+            return cursor.rowcount
+            
+        except Error as e:
+            logger.error(f"❌ Error bulk creating incentive matches: {e}")
+            return 0
+        finally:
+            if connection:
+                connection.close()
 
     def get_analysis_incentive_matches(self, analysis_id: str) -> List[Dict[str, Any]]:
         """Get incentive matches for an analysis with full incentive details"""
+        connection = None
         try:
-            cursor = self.get_connection().cursor(dictionary=True)
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=True)
             
             query = """
                 SELECT 
@@ -376,7 +614,8 @@ class IncentiveDatabase:
                     fi.minimum_spend,
                     fi.requirements,
                     lr.location_type,
-                    lr.description as location_description
+                    lr.description as location_description,
+                    SUM(alm.estimated_savings) OVER () as total_savings
                 FROM analysis_location_matches alm
                 JOIN film_incentives fi ON alm.incentive_id = fi.id
                 JOIN location_requirements lr ON alm.location_requirement_id = lr.id
@@ -389,11 +628,7 @@ class IncentiveDatabase:
             
             matches = []
             for row in results:
-                if row['requirements']:
-                    try:
-                        row['requirements'] = json.loads(row['requirements']) if isinstance(row['requirements'], str) else row['requirements']
-                    except (json.JSONDecodeError, TypeError):
-                        row['requirements'] = {}
+                _decode_json_column(row, 'requirements')
                 
                 matches.append(row)
             
@@ -403,6 +638,9 @@ class IncentiveDatabase:
         except Error as e:
             logger.error(f"❌ Error retrieving incentive matches: {e}")
             return []
+        finally:
+            if connection:
+                connection.close()
 
     # ==================== UTILITY METHODS ====================
     
@@ -414,24 +652,21 @@ class IncentiveDatabase:
             if not incentive.percentage:
                 continue
             
+            # Convert DECIMAL columns to float once per incentive
+            percentage = float(incentive.percentage)
+            minimum_spend = float(incentive.minimum_spend) if incentive.minimum_spend else 0.0
+            maximum_spend = float(incentive.maximum_spend) if incentive.maximum_spend else None
+            max_credit = float(incentive.max_credit) if incentive.max_credit else None
+            
             # Calculate qualifying spend
-            qualifying_spend = budget
-            if incentive.minimum_spend and budget < incentive.minimum_spend:
+            if budget < minimum_spend:
                 continue  # Not eligible
-            if incentive.maximum_spend and budget > incentive.maximum_spend:
-                qualifying_spend = incentive.maximum_spend
+            qualifying_spend = maximum_spend if maximum_spend is not None and budget > maximum_spend else budget
             
-            # Calculate savings (convert decimal to float for calculation)
-            gross_savings = qualifying_spend * (float(incentive.percentage) / 100)
-            
-            # Apply max credit cap if exists (convert decimal to float)
-            final_savings = gross_savings
-            if incentive.max_credit and gross_savings > float(incentive.max_credit):
-                final_savings = float(incentive.max_credit)
-            
-            # Calculate net production cost
-            net_cost = budget - final_savings
-            savings_percentage = (final_savings / budget) * 100
+            # Calculate savings, applying max credit cap if exists
+            gross_savings = qualifying_spend * (percentage / 100)
+            max_credit_applied = max_credit is not None and gross_savings > max_credit
+            final_savings = max_credit if max_credit_applied else gross_savings
             
             savings_data.append({
                 'incentive_id': incentive.id,
@@ -442,35 +677,53 @@ class IncentiveDatabase:
                 'qualifying_spend': qualifying_spend,
                 'gross_savings': gross_savings,
                 'final_savings': final_savings,
-                'net_production_cost': net_cost,
-                'savings_percentage': savings_percentage,
-                'max_credit_applied': incentive.max_credit and gross_savings > incentive.max_credit
+                'net_production_cost': budget - final_savings,
+                'savings_percentage': (final_savings / budget) * 100,
+                'max_credit_applied': max_credit_applied
             })
         
         # Sort by final savings descending
-        savings_data.sort(key=lambda x: x['final_savings'], reverse=True)
+        savings_data.sort(key=itemgetter('final_savings'), reverse=True)
         
         logger.info(f"💰 Calculated savings for {len(savings_data)} incentives")
         return savings_data
 
 # ==================== SERVICE FUNCTIONS ====================
 
+@lru_cache(maxsize=1)
 def get_incentive_service() -> IncentiveDatabase:
-    """Get incentive database service instance"""
+    """Get the shared incentive database service instance"""
     return IncentiveDatabase()
 
-def find_best_incentives_for_budget(budget: float, limit: int = 5) -> List[Dict[str, Any]]:
-    """Find and calculate the best incentives for a given budget"""
+def find_best_incentives_for_budget(budget: float, limit: int = 5, with_requirement_flags: bool = False) -> List[Dict[str, Any]]:
+    """Find and calculate the best incentives for a given budget
+
+    with_requirement_flags adds the internal requirement_flags bitmap used for scoring;
+    it is not part of the public result shape.
+    """
     db = get_incentive_service()
     
-    # Find matching incentives
-    matching_incentives = db.find_matching_incentives(budget, min_percentage=15.0)
-    
-    # Calculate potential savings
-    savings_data = db.calculate_potential_savings(budget, matching_incentives)
+    # Savings math and ranking happen in SQL; only shape the rows here
+    savings_data = []
+    for row in db.find_and_rank_incentives(budget, min_percentage=15.0, limit=limit):
+        final_savings = float(row['final_savings'])
+        savings_data.append({
+            'incentive_id': row['id'],
+            'country': row['country'],
+            'region': row['region'],
+            'incentive_type': row['incentive_type'],
+            'percentage': row['percentage'],
+            'qualifying_spend': float(row['qualifying_spend']),
+            'gross_savings': float(row['gross_savings']),
+            'final_savings': final_savings,
+            'net_production_cost': budget - final_savings,
+            'savings_percentage': (final_savings / budget) * 100,
+            'max_credit_applied': bool(row['max_credit_applied'])
+        })
+        if with_requirement_flags:
+            savings_data[-1]['requirement_flags'] = row['requirement_flags']
     
-    # Return top results
-    return savings_data[:limit]
+    return savings_data
 
 def get_incentives_by_analysis(analysis_id: str) -> Dict[str, Any]:
     """Get comprehensive incentive data for a specific analysis"""
@@ -482,12 +735,12 @@ def get_incentives_by_analysis(analysis_id: str) -> Dict[str, Any]:
     # Get incentive matches
     matches = db.get_analysis_incentive_matches(analysis_id)
     
-    # Calculate totals
-    total_savings = sum(match.get('estimated_savings', 0) for match in matches)
+    # Total is computed in SQL and repeated on every match row
+    total_savings = (matches[0]['total_savings'] or 0) if matches else 0
     
     return {
         'analysis_id': analysis_id,
-        'location_requirements': [asdict(loc) for loc in locations],
+        'location_requirements': [loc.to_dict() for loc in locations],
         'incentive_matches': matches,
         'total_estimated_savings': total_savings,
         'matched_incentive_count': len(matches)
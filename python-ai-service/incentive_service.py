@@ -4,21 +4,74 @@ Film Incentive Lookup Service
 Business logic layer for film incentive analysis and matching
 """
 
+import copy
+import time
+import heapq
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Tuple, NamedTuple
 from dataclasses import asdict
 from datetime import datetime, date
+from decimal import Decimal
 
 from incentive_models import (
     IncentiveDatabase, 
     FilmIncentive, 
     LocationRequirement, 
     AnalysisLocationMatch,
-    find_best_incentives_for_budget
+    find_best_incentives_for_budget,
+    INCENTIVE_CACHE_TTL_SECONDS,
+    COMPLEXITY_REQUIREMENT_KEYS
 )
 
 logger = logging.getLogger(__name__)
 
+# Finished analyses keyed by (budget, genre, locations, weeks); shares the DB read-cache TTL
+OPTIMAL_INCENTIVES_CACHE_MAX_ENTRIES = 512
+_optimal_incentives_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+_optimal_incentives_cache_lock = threading.Lock()
+
+# Requirement keys that make an incentive harder to obtain
+_COMPLEXITY_FACTORS = frozenset(COMPLEXITY_REQUIREMENT_KEYS)
+_APPLICATION_EASE_SCORES = (1.2, 1.1, 1.0, 0.9)
+_TIMING_FEASIBILITY_SCORES = (1.2, 1.1, 1.0, 0.9, 0.7)
+
+class _IncentiveTotals(NamedTuple):
+    """Running totals over the ranked options, shared by recommendations and summary"""
+    total_savings: float
+    total_percentage: float
+    best_savings: float
+    top_three_savings: float
+    countries: set
+
+# Executive summary layout, already trimmed so callers never need .strip()
+_EXECUTIVE_SUMMARY_TEMPLATE = (
+    "INCENTIVE ANALYSIS EXECUTIVE SUMMARY\n"
+    "\n"
+    "Production Budget: ${budget:,.0f}\n"
+    "Best Incentive Option: {best_location}\n"
+    "Maximum Potential Savings: ${best_savings:,.0f} ({best_percentage}% of budget)\n"
+    "Total Qualified Options: {total_options}\n"
+    "\n"
+    "RECOMMENDATION: {reason}"
+)
+
+# Genre-specific incentive preferences: genre -> (preferred countries, bonus)
+_GENRE_PREFERENCES: Dict[str, Tuple[frozenset, float]] = {
+    'action': (frozenset({'united states', 'canada', 'united kingdom'}), 1.1),
+    'drama': (frozenset({'canada', 'ireland', 'united kingdom'}), 1.15),
+    'comedy': (frozenset({'united states', 'canada', 'australia'}), 1.05),
+    'thriller': (frozenset({'united states', 'united kingdom', 'canada'}), 1.1),
+    'horror': (frozenset({'united states', 'canada', 'ireland'}), 1.05),
+    'romance': (frozenset({'ireland', 'united kingdom', 'australia'}), 1.1),
+    'sci-fi': (frozenset({'united states', 'united kingdom', 'canada'}), 1.15),
+    'fantasy': (frozenset({'united kingdom', 'ireland', 'united states'}), 1.15),
+    'documentary': (frozenset({'canada', 'ireland', 'united kingdom'}), 1.2)
+}
+_NO_GENRE_PREFERENCE: Tuple[frozenset, float] = (frozenset(), 1.0)
+
 class IncentiveLookupService:
     """Business logic service for film incentive analysis"""
     
@@ -32,7 +85,8 @@ class IncentiveLookupService:
         budget: float, 
         genre: Optional[str] = None,
         shooting_locations: Optional[List[str]] = None,
-        production_duration_weeks: Optional[int] = None
+        production_duration_weeks: Optional[int] = None,
+        analysis_timestamp: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Find optimal incentives for a film production with enhanced business logic
@@ -42,15 +96,35 @@ class IncentiveLookupService:
             genre: Film genre (affects incentive eligibility)
             shooting_locations: Preferred or required shooting locations
             production_duration_weeks: Estimated production duration
+            analysis_timestamp: ISO timestamp to stamp the result with (defaults to now)
             
         Returns:
             Comprehensive incentive analysis with recommendations
         """
+        # Repeated what-if lookups for the same inputs reuse the finished analysis
+        cache_key = (
+            budget,
+            genre.lower() if genre else None,
+            tuple(sorted(shooting_locations)) if shooting_locations else (),
+            production_duration_weeks
+        )
+        if analysis_timestamp is None:
+            analysis_timestamp = datetime.now().isoformat()
+        now = time.monotonic()
+        with _optimal_incentives_cache_lock:
+            cached = _optimal_incentives_cache.get(cache_key)
+        if cached and now - cached[0] < INCENTIVE_CACHE_TTL_SECONDS:
+            result = copy.deepcopy(cached[1])  # Callers may mutate the result
+            # The key ignores genre casing, so echo this caller's own spelling
+            result['genre'] = genre
+            result['analysis_timestamp'] = analysis_timestamp
+            return result
+        
         try:
             logger.info(f"🔍 Finding optimal incentives for ${budget:,.0f} {genre or 'unknown genre'} production")
             
             # Get base incentive matches
-            base_incentives = find_best_incentives_for_budget(budget, limit=15)
+            base_incentives = find_best_incentives_for_budget(budget, limit=15, with_requirement_flags=True)
             
             # Apply business logic filters and scoring
             enhanced_incentives = self._enhance_incentive_analysis(
@@ -60,16 +134,19 @@ class IncentiveLookupService:
                 production_duration_weeks
             )
             
+            # One pass over the selected options feeds both recommendations and summary
+            totals = self._accumulate_incentive_totals(enhanced_incentives)
+            
             # Generate recommendations
-            recommendations = self._generate_incentive_recommendations(enhanced_incentives, budget)
+            recommendations = self._generate_incentive_recommendations(enhanced_incentives, budget, totals)
             
             # Calculate summary metrics
-            summary = self._calculate_incentive_summary(enhanced_incentives, budget)
+            summary = self._calculate_incentive_summary(enhanced_incentives, budget, totals)
             
             result = {
                 'budget': budget,
                 'genre': genre,
-                'analysis_timestamp': datetime.now().isoformat(),
+                'analysis_timestamp': analysis_timestamp,
                 'incentive_options': enhanced_incentives,
                 'recommendations': recommendations,
                 'summary': summary,
@@ -78,6 +155,12 @@ class IncentiveLookupService:
             }
             
             logger.info(f"✅ Found {len(enhanced_incentives)} qualified incentive options")
+            
+            if enhanced_incentives:  # Don't cache empty results, which also cover DB errors
+                with _optimal_incentives_cache_lock:
+                    if len(_optimal_incentives_cache) >= OPTIMAL_INCENTIVES_CACHE_MAX_ENTRIES:
+                        _optimal_incentives_cache.clear()
+                    _optimal_incentives_cache[cache_key] = (now, copy.deepcopy(result))
             return result
             
         except Exception as e:
@@ -101,8 +184,18 @@ class IncentiveLookupService:
         
         enhanced = []
         
+        # The genre is fixed for the whole analysis, so resolve its preferences up front
+        genre_countries, genre_bonus = _GENRE_PREFERENCES.get(genre.lower(), _NO_GENRE_PREFERENCE) if genre else _NO_GENRE_PREFERENCE
+        
+        # Normalize locations once; '\n' never occurs in a place name, so a
+        # substring hit on the joined text is always a hit on a single location
+        locations_lower = '\n'.join(shooting_locations).lower() if shooting_locations else None
+        # Many incentives share a country (e.g. per-state US programs); search each name once
+        location_hits: Dict[str, bool] = {}
+        
         for incentive in base_incentives:
-            enhanced_incentive = incentive.copy()
+            country = incentive.get('country', '').lower()
+            region = (incentive.get('region') or '').lower()
             
             # Initialize enhancement scores
             location_match_score = 1.0
@@ -111,20 +204,22 @@ class IncentiveLookupService:
             ease_of_application_score = 1.0
             
             # Location matching logic
-            if shooting_locations:
-                country = incentive.get('country', '').lower()
-                region = incentive.get('region', '').lower() if incentive.get('region') else ''
-                
-                location_matches = any(
-                    country in loc.lower() or (region and region in loc.lower())
-                    for loc in shooting_locations
-                )
+            if locations_lower is not None:
+                # An empty country matches any location; an empty region matches none
+                country_hit = location_hits.get(country)
+                if country_hit is None:
+                    country_hit = location_hits[country] = country in locations_lower
+                region_hit = False
+                if region:
+                    region_hit = location_hits.get(region)
+                    if region_hit is None:
+                        region_hit = location_hits[region] = region in locations_lower
+                location_matches = country_hit or region_hit
                 location_match_score = 1.2 if location_matches else 0.8
             
             # Genre compatibility scoring
-            if genre:
-                genre_score = self._calculate_genre_compatibility(genre, incentive)
-                genre_compatibility_score = genre_score
+            if country in genre_countries:
+                genre_compatibility_score = genre_bonus
             
             # Production timing analysis
             if production_duration_weeks and incentive.get('processing_time_days'):
@@ -146,51 +241,24 @@ class IncentiveLookupService:
                 ease_of_application_score
             )
             
-            # Apply enhancement
-            enhanced_incentive['enhanced_score'] = enhancement_multiplier
-            enhanced_incentive['enhanced_savings'] = float(incentive['final_savings']) * min(enhancement_multiplier, 1.2)
-            enhanced_incentive['location_match_score'] = location_match_score
-            enhanced_incentive['genre_compatibility_score'] = genre_compatibility_score
-            enhanced_incentive['timing_feasibility_score'] = timing_feasibility_score
-            enhanced_incentive['ease_of_application_score'] = ease_of_application_score
-            
-            # Add business insights
-            enhanced_incentive['business_insights'] = self._generate_business_insights(
-                incentive, enhancement_multiplier
-            )
+            # The bitmap is a scoring input only; keep it out of the returned options
+            incentive.pop('requirement_flags', None)
             
-            enhanced.append(enhanced_incentive)
-        
-        # Sort by enhanced score
-        enhanced.sort(key=lambda x: x['enhanced_score'], reverse=True)
-        
-        return enhanced[:10]  # Return top 10 enhanced options
-    
-    def _calculate_genre_compatibility(self, genre: str, incentive: Dict[str, Any]) -> float:
-        """Calculate how well a genre matches an incentive program"""
-        
-        # Genre-specific incentive preferences
-        genre_preferences = {
-            'action': {'countries': ['united states', 'canada', 'united kingdom'], 'bonus': 1.1},
-            'drama': {'countries': ['canada', 'ireland', 'united kingdom'], 'bonus': 1.15},
-            'comedy': {'countries': ['united states', 'canada', 'australia'], 'bonus': 1.05},
-            'thriller': {'countries': ['united states', 'united kingdom', 'canada'], 'bonus': 1.1},
-            'horror': {'countries': ['united states', 'canada', 'ireland'], 'bonus': 1.05},
-            'romance': {'countries': ['ireland', 'united kingdom', 'australia'], 'bonus': 1.1},
-            'sci-fi': {'countries': ['united states', 'united kingdom', 'canada'], 'bonus': 1.15},
-            'fantasy': {'countries': ['united kingdom', 'ireland', 'united states'], 'bonus': 1.15},
-            'documentary': {'countries': ['canada', 'ireland', 'united kingdom'], 'bonus': 1.2}
-        }
-        
-        genre_lower = genre.lower()
-        country_lower = incentive.get('country', '').lower()
-        
-        if genre_lower in genre_preferences:
-            prefs = genre_preferences[genre_lower]
-            if country_lower in prefs['countries']:
-                return prefs['bonus']
-        
-        return 1.0  # Neutral score
+            # Apply enhancement and business insights, building the row in one go
+            # rather than copying the incentive and growing the copy key by key
+            enhanced.append({
+                **incentive,
+                'enhanced_score': enhancement_multiplier,
+                'enhanced_savings': float(incentive['final_savings']) * min(enhancement_multiplier, 1.2),
+                'location_match_score': location_match_score,
+                'genre_compatibility_score': genre_compatibility_score,
+                'timing_feasibility_score': timing_feasibility_score,
+                'ease_of_application_score': ease_of_application_score,
+                'business_insights': self._generate_business_insights(incentive, enhancement_multiplier)
+            })
+        
+        # Top 10 enhanced options by enhanced score (same order as a stable sort + slice)
+        return heapq.nlargest(10, enhanced, key=itemgetter('enhanced_score'))
     
     def _calculate_timing_feasibility(self, production_weeks: int, processing_days: int) -> float:
         """Calculate timing feasibility based on production schedule"""
@@ -198,43 +266,37 @@ class IncentiveLookupService:
         # Convert production weeks to total timeline including pre-production
         total_timeline_days = (production_weeks * 7) + 60  # Add 60 days for pre-production
         
-        if processing_days <= 30:
-            return 1.2  # Fast processing is excellent
-        elif processing_days <= 60:
-            return 1.1  # Reasonable processing time
-        elif processing_days <= total_timeline_days * 0.5:
-            return 1.0  # Acceptable timing
-        elif processing_days <= total_timeline_days:
-            return 0.9  # Tight but manageable
-        else:
-            return 0.7  # May cause delays
+        # Fast (<=30d) 1.2, reasonable (<=60d) 1.1, within half the timeline 1.0,
+        # within the timeline 0.9, otherwise 0.7. The timeline thresholds only
+        # apply past 60 days, so floor them there to keep the count monotonic.
+        index = (
+            (processing_days > 30) +
+            (processing_days > 60) +
+            (processing_days > max(60, total_timeline_days * 0.5)) +
+            (processing_days > max(60, total_timeline_days))
+        )
+        return _TIMING_FEASIBILITY_SCORES[index]
     
     def _calculate_application_ease(self, incentive: Dict[str, Any]) -> float:
         """Calculate how easy an incentive is to apply for and obtain"""
         
         base_score = 1.0
-        requirements = incentive.get('requirements', {})
-        
-        if not requirements:
-            return base_score
-        
-        # Penalize complex requirements
-        complexity_factors = [
-            'cultural_test', 'canadian_content', 'european_content',
-            'local_crew_requirement', 'resident_workers', 'labour_requirement'
-        ]
-        
-        complexity_count = sum(1 for factor in complexity_factors if factor in requirements)
         
-        # Easier incentives get higher scores
-        if complexity_count == 0:
-            return 1.2  # Very straightforward
-        elif complexity_count <= 2:
-            return 1.1  # Reasonable requirements
-        elif complexity_count <= 4:
-            return 1.0  # Standard complexity
+        # Ranked rows carry a bitmap of COMPLEXITY_REQUIREMENT_KEYS instead of the JSON
+        if 'requirement_flags' in incentive:
+            flags = incentive['requirement_flags']
+            if flags is None:
+                return base_score
+            complexity_count = int(flags).bit_count()
         else:
-            return 0.9  # Complex requirements
+            requirements = incentive.get('requirements', {})
+            if not requirements:
+                return base_score
+            complexity_count = len(_COMPLEXITY_FACTORS.intersection(requirements))
+        
+        # Penalize complex requirements; easier incentives get higher scores:
+        # none 1.2, up to 2 → 1.1, up to 4 → 1.0, more → 0.9
+        return _APPLICATION_EASE_SCORES[(complexity_count > 0) + (complexity_count > 2) + (complexity_count > 4)]
     
     def _generate_business_insights(self, incentive: Dict[str, Any], enhancement_score: float) -> List[str]:
         """Generate business insights for an incentive"""
@@ -270,7 +332,27 @@ class IncentiveLookupService:
         
         return insights
     
-    def _generate_incentive_recommendations(self, incentives: List[Dict[str, Any]], budget: float) -> Dict[str, Any]:
+    def _accumulate_incentive_totals(self, incentives: List[Dict[str, Any]]) -> '_IncentiveTotals':
+        """Single pass over the ranked options, casting each figure once"""
+        total_savings = 0.0
+        total_percentage = 0.0
+        best_savings = 0.0
+        top_three_savings = 0.0
+        countries = set()
+        for position, inc in enumerate(incentives):
+            savings = float(inc['final_savings'])
+            total_savings += savings
+            total_percentage += float(inc['percentage'])
+            if savings > best_savings:
+                best_savings = savings
+            if position < 3:
+                top_three_savings += savings
+            countries.add(inc['country'])
+        return _IncentiveTotals(total_savings, total_percentage, best_savings, top_three_savings, countries)
+    
+    def _generate_incentive_recommendations(
+        self, incentives: List[Dict[str, Any]], budget: float, totals: '_IncentiveTotals'
+    ) -> Dict[str, Any]:
         """Generate strategic recommendations based on incentive analysis"""
         
         if not incentives:
@@ -290,10 +372,9 @@ class IncentiveLookupService:
         }
         
         # Strategic insights
-        total_savings = sum(float(inc['final_savings']) for inc in incentives[:3])
         if len(incentives) >= 3:
             recommendations['strategy_insights'].append(
-                f"Multi-location strategy could yield ${total_savings:,.0f} in combined savings"
+                f"Multi-location strategy could yield ${totals.top_three_savings:,.0f} in combined savings"
             )
         
         if top_incentive['enhanced_score'] > 1.1:
@@ -310,26 +391,23 @@ class IncentiveLookupService:
         
         return recommendations
     
-    def _calculate_incentive_summary(self, incentives: List[Dict[str, Any]], budget: float) -> Dict[str, Any]:
+    def _calculate_incentive_summary(
+        self, incentives: List[Dict[str, Any]], budget: float, totals: '_IncentiveTotals'
+    ) -> Dict[str, Any]:
         """Calculate summary statistics for incentive analysis"""
         
         if not incentives:
             return {}
         
-        total_potential_savings = sum(float(inc['final_savings']) for inc in incentives)
-        average_percentage = sum(float(inc['percentage']) for inc in incentives) / len(incentives)
-        best_savings = max(float(inc['final_savings']) for inc in incentives)
-        
-        # Find countries represented
-        countries = list(set(inc['country'] for inc in incentives))
+        average_percentage = totals.total_percentage / len(incentives)
         
         return {
             'total_options': len(incentives),
-            'total_potential_savings': total_potential_savings,
-            'best_single_savings': best_savings,
+            'total_potential_savings': totals.total_savings,
+            'best_single_savings': totals.best_savings,
             'average_incentive_percentage': round(average_percentage, 1),
-            'countries_available': countries,
-            'budget_optimization_potential': round((best_savings / budget) * 100, 1)
+            'countries_available': list(totals.countries),
+            'budget_optimization_potential': round((totals.best_savings / budget) * 100, 1)
         }
     
     def analyze_location_requirements(self, screenplay_text: str, title: str) -> List[Dict[str, Any]]:
@@ -373,13 +451,16 @@ class IncentiveLookupService:
         """
         Create a comprehensive incentive analysis report for a screenplay
         """
+        # One timestamp for the report and the analysis inside it
+        report_timestamp = datetime.now().isoformat()
         try:
             logger.info(f"📊 Creating comprehensive incentive report for analysis {analysis_id}")
             
             # Get optimal incentives
             incentive_analysis = self.find_optimal_incentives_for_production(
                 budget=budget,
-                genre=genre
+                genre=genre,
+                analysis_timestamp=report_timestamp
             )
             
             # Analyze locations if screenplay provided
@@ -390,7 +471,7 @@ class IncentiveLookupService:
             # Create comprehensive report
             report = {
                 'analysis_id': analysis_id,
-                'report_timestamp': datetime.now().isoformat(),
+                'report_timestamp': report_timestamp,
                 'production_details': {
                     'title': title,
                     'genre': genre,
@@ -410,7 +491,7 @@ class IncentiveLookupService:
             return {
                 'analysis_id': analysis_id,
                 'error': str(e),
-                'report_timestamp': datetime.now().isoformat()
+                'report_timestamp': report_timestamp
             }
     
     def _create_executive_summary(self, incentive_analysis: Dict[str, Any], budget: float) -> str:
@@ -429,18 +510,14 @@ class IncentiveLookupService:
         primary_rec = recommendations.get('primary_recommendation', {})
         best_location = primary_rec.get('location', 'Unknown')
         
-        summary_text = f"""
-INCENTIVE ANALYSIS EXECUTIVE SUMMARY
-
-Production Budget: ${budget:,.0f}
-Best Incentive Option: {best_location}
-Maximum Potential Savings: ${best_savings:,.0f} ({best_percentage}% of budget)
-Total Qualified Options: {total_options}
-
-RECOMMENDATION: {primary_rec.get('reason', 'Consider available incentive programs to optimize production costs.')}
-        """.strip()
-        
-        return summary_text
+        return _EXECUTIVE_SUMMARY_TEMPLATE.format(
+            budget=budget,
+            best_location=best_location,
+            best_savings=best_savings,
+            best_percentage=best_percentage,
+            total_options=total_options,
+            reason=primary_rec.get('reason', 'Consider available incentive programs to optimize production costs.')
+        )
     
     def _generate_next_steps(self, incentive_analysis: Dict[str, Any]) -> List[str]:
         """Generate actionable next steps"""
@@ -459,8 +536,19 @@ RECOMMENDATION: {primary_rec.get('reason', 'Consider available incentive program
             "Plan production timeline around incentive requirements"
         ]
 
+# ==================== SERIALIZATION ====================
+
+def orjson_default(value: Any) -> Any:
+    """orjson fallback for DB types; Decimals become numbers the way FastAPI's encoder does it"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
 # ==================== SERVICE INSTANCE ====================
 
+@lru_cache(maxsize=1)
 def get_incentive_service() -> IncentiveLookupService:
-    """Get the incentive lookup service instance"""
+    """Get the shared (per-process) incentive lookup service instance"""
     return IncentiveLookupService()
@@ -5,15 +5,16 @@ Automated service to keep film incentive data up-to-date through web scraping an
 """
 
 import os
-import json
+import time
+import hashlib
 import logging
 import asyncio
 import aiohttp
-import requests
+import orjson
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
 from dotenv import load_dotenv
 
@@ -32,6 +33,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Source health checks run at once, and how long each may take
+HEALTH_CHECK_CONCURRENCY = 10
+HEALTH_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# First "NN%" / "NN.N %" figure on a page
+_PERCENTAGE_RE = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+# Elements that usually carry a programme's headline rate
+_TEXT_BLOCK_SELECTOR = 'h1, h2, h3, p, li, td, th, span'
+
+# Raw page/API bodies cached on disk so re-runs within a few hours (--force, retries after a
+# failed run) skip the network; kept well below any update_frequency. Disable with --no-cache
+HTTP_CACHE_DIR = os.getenv('INCENTIVE_HTTP_CACHE_DIR', 'cache/incentive_sources')
+HTTP_CACHE_TTL_SECONDS = int(os.getenv('INCENTIVE_HTTP_CACHE_TTL_SECONDS', str(6 * 3600)))
+
+# Per-source sync state (HTTP validators, last update) kept between cron runs
+SOURCE_STATE_FILE = os.getenv('INCENTIVE_SOURCE_STATE_FILE', 'incentive_source_state.json')
+
 @dataclass
 class IncentiveSource:
     """Configuration for an incentive data source"""
@@ -43,16 +61,96 @@ class IncentiveSource:
     update_frequency: int  # days between updates
     last_updated: Optional[datetime] = None
     is_active: bool = True
+    requires_fetch: bool = True  # False while the parser returns built-in data without reading the page
+    etag: Optional[str] = None  # HTTP validators from the last full fetch
+    last_modified: Optional[str] = None
 
 class IncentiveUpdaterService:
     """Service to automatically update film incentive data"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.db = IncentiveDatabase()
-        self.session = None
+        self.use_cache = use_cache
+        self.session: Optional[aiohttp.ClientSession] = None  # Created lazily inside the event loop
+        self._existing_index: Dict[tuple, List[FilmIncentive]] = {}  # Populated for the duration of an update run
+        # (ETag, Last-Modified) from a 200 by source name, applied only once that source's update succeeds
+        self._staged_validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
         self.sources = self._load_incentive_sources()
+        self._load_source_state()
+        # Source-specific parsers by source name; others use _parse_generic_incentives
+        self._parsers = {
+            "Georgia Film Office": self._parse_georgia_incentives,
+            "Louisiana Film Office": self._parse_louisiana_incentives,
+            "New York State Film Office": self._parse_newyork_incentives,
+            "Telefilm Canada": self._parse_telefilm_incentives,
+            "Ontario Creates": self._parse_ontario_incentives,
+            "BFI Film Fund": self._parse_bfi_incentives,
+            "Screen Australia": self._parse_screenaustralia_incentives,
+            "MEDIA Programme": self._parse_media_incentives
+        }
         logger.info("🔄 Incentive Updater Service initialized")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, so update and health runs reuse keep-alive connections and DNS"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                # Politeness is enforced per host here, so distinct sites fetch in parallel
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=2,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                ),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'Mozilla/5.0 (compatible; FilmIncentiveBot/1.0)'}
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
+    def _load_source_state(self):
+        """Restore per-source validators and timestamps saved by the previous run"""
+        try:
+            with open(SOURCE_STATE_FILE, 'rb') as f:
+                state = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable source state {SOURCE_STATE_FILE}: {e}")
+            return
+        
+        for source in self.sources:
+            saved = state.get(source.name)
+            if not saved:
+                continue
+            source.etag = saved.get('etag')
+            source.last_modified = saved.get('last_modified')
+            if saved.get('last_updated'):
+                source.last_updated = datetime.fromisoformat(saved['last_updated'])
+    
+    def _save_source_state(self):
+        """Persist per-source validators and timestamps for the next run"""
+        state = {
+            source.name: {
+                'etag': source.etag,
+                'last_modified': source.last_modified,
+                'last_updated': source.last_updated.isoformat() if source.last_updated else None
+            }
+            for source in self.sources
+        }
+        try:
+            tmp_path = f"{SOURCE_STATE_FILE}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_path, SOURCE_STATE_FILE)
+        except OSError as e:
+            logger.error(f"❌ Error saving source state: {str(e)}")
+    
     def _load_incentive_sources(self) -> List[IncentiveSource]:
         """Load configured incentive data sources"""
         sources = [
@@ -67,7 +165,8 @@ class IncentiveUpdaterService:
                     "requirements": ".requirements-list",
                     "cap": ".annual-cap"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             IncentiveSource(
@@ -80,7 +179,8 @@ class IncentiveUpdaterService:
                     "requirements": ".eligibility-requirements",
                     "minimum_spend": ".minimum-spend"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             IncentiveSource(
@@ -93,7 +193,8 @@ class IncentiveUpdaterService:
                     "cap": ".program-cap",
                     "requirements": ".program-requirements"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             # Canada - Provincial Film Offices
@@ -107,7 +208,8 @@ class IncentiveUpdaterService:
                     "amounts": ".funding-amount",
                     "requirements": ".eligibility-criteria"
                 },
-                update_frequency=14
+                update_frequency=14,
+                requires_fetch=False
             ),
             
             IncentiveSource(
@@ -120,7 +222,8 @@ class IncentiveUpdaterService:
                     "cap": ".annual-allocation",
                     "requirements": ".eligibility-requirements"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             # United Kingdom
@@ -134,7 +237,8 @@ class IncentiveUpdaterService:
                     "requirements": ".cultural-test",
                     "minimum_spend": ".minimum-uk-spend"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             # Australia
@@ -148,7 +252,8 @@ class IncentiveUpdaterService:
                     "offset": ".location-offset",
                     "requirements": ".australian-content"
                 },
-                update_frequency=30
+                update_frequency=30,
+                requires_fetch=False
             ),
             
             # European Union
@@ -162,16 +267,25 @@ class IncentiveUpdaterService:
                     "requirements": ".eligibility-criteria",
                     "deadlines": ".application-deadlines"
                 },
-                update_frequency=7
+                update_frequency=7,
+                requires_fetch=False
             )
         ]
         
         logger.info(f"📋 Loaded {len(sources)} incentive data sources")
         return sources
     
-    async def update_all_incentives(self) -> Dict[str, Any]:
-        """Update all incentive data from configured sources"""
+    def _is_source_due(self, source: IncentiveSource, now: datetime) -> bool:
+        """Whether a source's update_frequency window has elapsed since its last update"""
+        return (
+            source.last_updated is None or
+            now - source.last_updated >= timedelta(days=source.update_frequency)
+        )
+    
+    async def update_all_incentives(self, force: bool = False) -> Dict[str, Any]:
+        """Update incentive data from configured sources that are due (all active ones if force)"""
         logger.info("🚀 Starting comprehensive incentive data update")
+        started = time.monotonic()
         
         results = {
             'started_at': datetime.now().isoformat(),
@@ -182,42 +296,54 @@ class IncentiveUpdaterService:
             'summary': {}
         }
         
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30),
-            headers={'User-Agent': 'Mozilla/5.0 (compatible; FilmIncentiveBot/1.0)'}
-        ) as session:
-            self.session = session
-            
-            # Process sources in parallel batches to avoid overwhelming servers
-            batch_size = 3
-            for i in range(0, len(self.sources), batch_size):
-                batch = self.sources[i:i + batch_size]
-                batch_tasks = [self._update_source(source) for source in batch]
-                
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                for source, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        error_msg = f"Failed to update {source.name}: {str(result)}"
-                        logger.error(error_msg)
-                        results['errors'].append(error_msg)
-                    else:
-                        results['sources_processed'] += 1
-                        results['incentives_updated'] += result.get('updated', 0)
-                        results['incentives_added'] += result.get('added', 0)
-                        results['summary'][source.name] = result
-                
-                # Brief pause between batches
-                await asyncio.sleep(2)
+        now = datetime.now()
+        due_sources = []
+        for source in self.sources:
+            if not source.is_active:
+                continue
+            if force or self._is_source_due(source, now):
+                due_sources.append(source)
+            else:
+                results['summary'][source.name] = {'source': source.name, 'skipped': True}
+        
+        skipped = len(results['summary'])
+        if skipped:
+            logger.info(f"⏭️ Skipping {skipped} sources not yet due for update")
+        
+        await self._get_session()
+        
+        # One SELECT up front instead of a lookup per parsed incentive
+        existing_incentives = await asyncio.to_thread(self.db.get_all_incentives, True)
+        self._existing_index = {}
+        for inc in existing_incentives:
+            self._existing_index.setdefault((inc.country, inc.region, inc.incentive_type), []).append(inc)
+        
+        # Every source is on its own host; the session's connector caps
+        # connections per host, so all sources can be launched at once
+        source_results = await asyncio.gather(
+            *(self._update_source(source) for source in due_sources),
+            return_exceptions=True
+        )
+        
+        for source, result in zip(due_sources, source_results):
+            if isinstance(result, Exception):
+                error_msg = f"Failed to update {source.name}: {str(result)}"
+                logger.error(error_msg)
+                results['errors'].append(error_msg)
+            else:
+                results['sources_processed'] += 1
+                results['incentives_updated'] += result.get('updated', 0)
+                results['incentives_added'] += result.get('added', 0)
+                results['summary'][source.name] = result
+        
+        self._existing_index = {}
         
         # Update database statistics
         await self._update_database_stats()
+        self._save_source_state()
         
         results['completed_at'] = datetime.now().isoformat()
-        results['duration_minutes'] = (
-            datetime.fromisoformat(results['completed_at']) - 
-            datetime.fromisoformat(results['started_at'])
-        ).total_seconds() / 60
+        results['duration_minutes'] = (time.monotonic() - started) / 60
         
         logger.info(f"✅ Update completed: {results['sources_processed']} sources, "
                    f"{results['incentives_updated']} updated, {results['incentives_added']} added")
@@ -239,70 +365,127 @@ class IncentiveUpdaterService:
                 logger.warning(f"⚠️ Unsupported scraper type: {source.scraper_type}")
                 return result
             
-            # Process and save incentives
+            # Process incentives; new ones are written together after the loop
+            to_add = []
+            defaults = self._incentive_defaults(source)
             for incentive_data in incentives:
                 try:
-                    incentive = self._create_incentive_from_data(incentive_data, source)
+                    incentive = self._create_incentive_from_data(incentive_data, defaults)
                     
                     # Check if incentive already exists
                     existing = self._find_existing_incentive(incentive)
                     
-                    if existing:
-                        if self._incentive_needs_update(existing, incentive):
-                            self._update_existing_incentive(existing, incentive)
-                            result['updated'] += 1
-                    else:
-                        self.db.create_incentive(incentive)
-                        result['added'] += 1
+                    # Known incentives are left as they are: parsers fill fields they don't scrape
+                    # with placeholders that would overwrite the curated values
+                    if not existing:
+                        to_add.append(incentive)
                         
                 except Exception as e:
                     error_msg = f"Error processing incentive: {str(e)}"
                     logger.error(error_msg)
                     result['errors'].append(error_msg)
             
-            # Update source last_updated timestamp
-            source.last_updated = datetime.now()
+            # One executemany round trip per source, off the event loop
+            if to_add:
+                result['added'] = await asyncio.to_thread(self.db.create_incentives_bulk, to_add)
+                if result['added'] < len(to_add):
+                    result['errors'].append(f"Only {result['added']} of {len(to_add)} new incentives were saved")
+            
+            # Only a run that produced incentives and saved them cleanly pushes the next one out by
+            # update_frequency; fetch/parse failures come back as [] and DB failures as errors
+            if incentives and not result['errors']:
+                source.last_updated = datetime.now()
+                if source.name in self._staged_validators:
+                    source.etag, source.last_modified = self._staged_validators[source.name]
             
         except Exception as e:
             error_msg = f"Error updating source {source.name}: {str(e)}"
             logger.error(error_msg)
             result['errors'].append(error_msg)
         
+        # A failed run drops its validators, so the next one re-downloads the page rather than trusting a 304
+        self._staged_validators.pop(source.name, None)
         return result
     
+    def _cache_path(self, source: IncentiveSource) -> str:
+        """Disk cache file for a source URL"""
+        return os.path.join(HTTP_CACHE_DIR, hashlib.sha1(source.url.encode()).hexdigest())
+    
+    def _read_cached_body(self, source: IncentiveSource) -> Optional[bytes]:
+        """Cached body for a source if it was fetched within HTTP_CACHE_TTL_SECONDS"""
+        if not self.use_cache:
+            return None
+        path = self._cache_path(source)
+        try:
+            if time.time() - os.path.getmtime(path) >= HTTP_CACHE_TTL_SECONDS:
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _write_cached_body(self, source: IncentiveSource, body: bytes):
+        """Store a fetched body in the disk cache (best effort)"""
+        if not self.use_cache:
+            return
+        try:
+            os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+            path = self._cache_path(source)
+            with open(f"{path}.tmp", 'wb') as f:
+                f.write(body)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache response for {source.url}: {e}")
+    
     async def _scrape_html_source(self, source: IncentiveSource) -> List[Dict[str, Any]]:
         """Scrape incentive data from HTML source"""
         incentives = []
         
+        # Parsers that return built-in data don't need the page at all
+        parser = self._parsers.get(source.name)
+        if parser and not source.requires_fetch:
+            incentives = parser(None)
+            logger.info(f"📊 Loaded {len(incentives)} built-in incentives for {source.name} (no fetch)")
+            return incentives
+        
         try:
-            async with self.session.get(source.url) as response:
-                if response.status != 200:
-                    logger.warning(f"⚠️ HTTP {response.status} for {source.url}")
-                    return incentives
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+            # Cached copy (stored as UTF-8) skips the network entirely
+            html = await asyncio.to_thread(self._read_cached_body, source)
+            if html is not None:
+                html = html.decode('utf-8', errors='replace')
+                logger.info(f"💾 Using cached page for {source.name}")
+            else:
+                # Conditional GET: unchanged pages come back as a bodyless 304
+                headers = {}
+                if source.etag:
+                    headers['If-None-Match'] = source.etag
+                if source.last_modified:
+                    headers['If-Modified-Since'] = source.last_modified
                 
-                # Extract incentive data based on source-specific logic
-                if source.name == "Georgia Film Office":
-                    incentives = self._parse_georgia_incentives(soup)
-                elif source.name == "Louisiana Film Office":
-                    incentives = self._parse_louisiana_incentives(soup)
-                elif source.name == "New York State Film Office":
-                    incentives = self._parse_newyork_incentives(soup)
-                elif source.name == "Telefilm Canada":
-                    incentives = self._parse_telefilm_incentives(soup)
-                elif source.name == "Ontario Creates":
-                    incentives = self._parse_ontario_incentives(soup)
-                elif source.name == "BFI Film Fund":
-                    incentives = self._parse_bfi_incentives(soup)
-                elif source.name == "Screen Australia":
-                    incentives = self._parse_screenaustralia_incentives(soup)
-                elif source.name == "MEDIA Programme":
-                    incentives = self._parse_media_incentives(soup)
-                else:
-                    # Generic parsing fallback
-                    incentives = self._parse_generic_incentives(soup, source)
+                async with self.session.get(source.url, headers=headers) as response:
+                    if response.status == 304:
+                        logger.info(f"♻️ {source.name} unchanged since last fetch, skipping parse")
+                        return incentives
+                    if response.status != 200:
+                        logger.warning(f"⚠️ HTTP {response.status} for {source.url}")
+                        return incentives
+                    
+                    # Decode the raw body directly; response.text() would sniff the charset first
+                    raw = await response.read()
+                    html = raw.decode(response.charset or 'utf-8', errors='replace')
+                    self._staged_validators[source.name] = (
+                        response.headers.get('ETag'), response.headers.get('Last-Modified')
+                    )
+                await asyncio.to_thread(self._write_cached_body, source, html.encode('utf-8'))
+            
+            tree = LexborHTMLParser(html)
+            
+            # Extract incentive data based on source-specific logic
+            if parser:
+                incentives = parser(tree)
+            else:
+                # Generic parsing fallback
+                incentives = self._parse_generic_incentives(tree, source)
                 
         except Exception as e:
             logger.error(f"❌ Error scraping {source.url}: {str(e)}")
@@ -310,7 +493,7 @@ class IncentiveUpdaterService:
         logger.info(f"📊 Extracted {len(incentives)} incentives from {source.name}")
         return incentives
     
-    def _parse_georgia_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_georgia_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse Georgia-specific incentive data"""
         incentives = []
         
@@ -333,7 +516,7 @@ class IncentiveUpdaterService:
         incentives.append(base_incentive)
         return incentives
     
-    def _parse_louisiana_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_louisiana_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse Louisiana-specific incentive data"""
         incentives = []
         
@@ -356,7 +539,7 @@ class IncentiveUpdaterService:
         incentives.append(base_incentive)
         return incentives
     
-    def _parse_newyork_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_newyork_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse New York-specific incentive data"""
         incentives = []
         
@@ -395,7 +578,7 @@ class IncentiveUpdaterService:
         incentives.extend([film_credit, post_credit])
         return incentives
     
-    def _parse_telefilm_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_telefilm_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse Telefilm Canada incentive data"""
         incentives = []
         
@@ -419,7 +602,7 @@ class IncentiveUpdaterService:
         incentives.append(base_incentive)
         return incentives
     
-    def _parse_ontario_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_ontario_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse Ontario Creates incentive data"""
         incentives = []
         
@@ -441,7 +624,7 @@ class IncentiveUpdaterService:
         incentives.append(oftc)
         return incentives
     
-    def _parse_bfi_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_bfi_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse BFI UK incentive data"""
         incentives = []
         
@@ -463,7 +646,7 @@ class IncentiveUpdaterService:
         incentives.append(film_relief)
         return incentives
     
-    def _parse_screenaustralia_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_screenaustralia_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse Screen Australia incentive data"""
         incentives = []
         
@@ -500,7 +683,7 @@ class IncentiveUpdaterService:
         incentives.extend([producer_rebate, location_offset])
         return incentives
     
-    def _parse_media_incentives(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def _parse_media_incentives(self, tree: Optional[LexborHTMLParser] = None) -> List[Dict[str, Any]]:
         """Parse EU MEDIA Programme incentive data"""
         incentives = []
         
@@ -523,18 +706,31 @@ class IncentiveUpdaterService:
         incentives.append(development)
         return incentives
     
-    def _parse_generic_incentives(self, soup: BeautifulSoup, source: IncentiveSource) -> List[Dict[str, Any]]:
+    def _parse_generic_incentives(self, tree: LexborHTMLParser, source: IncentiveSource) -> List[Dict[str, Any]]:
         """Generic fallback parser for unknown sources"""
         incentives = []
         
         # Try to extract basic information using common patterns
         try:
-            # Look for percentage patterns
-            percentage_text = soup.get_text()
-            percentage_matches = re.findall(r'(\d+(?:\.\d+)?)\s*%', percentage_text)
+            # Look for percentage patterns in the source's percentage selector
+            # first, then in text blocks in document order, stopping at the first hit
+            percentage_match = None
+            selector = source.selectors.get('percentage')
+            scoped = tree.css_first(selector) if selector else None
+            if scoped is not None:
+                percentage_match = _PERCENTAGE_RE.search(scoped.text(deep=True))
+            if percentage_match is None:
+                tree.strip_tags(['script', 'style'])
+                for node in tree.css(_TEXT_BLOCK_SELECTOR):
+                    percentage_match = _PERCENTAGE_RE.search(node.text(deep=True))
+                    if percentage_match:
+                        break
+            # Last resort: text outside the usual blocks (e.g. bare divs)
+            if percentage_match is None and tree.body is not None:
+                percentage_match = _PERCENTAGE_RE.search(tree.body.text(deep=True))
             
-            if percentage_matches:
-                percentage = float(percentage_matches[0])
+            if percentage_match:
+                percentage = float(percentage_match.group(1))
                 
                 base_incentive = {
                     'country': source.country,
@@ -558,13 +754,18 @@ class IncentiveUpdaterService:
         incentives = []
         
         try:
-            async with self.session.get(source.url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Process API response based on source format
-                    incentives = self._process_api_data(data, source)
-                else:
-                    logger.warning(f"⚠️ API returned status {response.status} for {source.url}")
+            body = await asyncio.to_thread(self._read_cached_body, source)
+            if body is None:
+                async with self.session.get(source.url) as response:
+                    if response.status != 200:
+                        logger.warning(f"⚠️ API returned status {response.status} for {source.url}")
+                        return incentives
+                    body = await response.read()
+                await asyncio.to_thread(self._write_cached_body, source, body)
+            
+            data = orjson.loads(body)
+            # Process API response based on source format
+            incentives = self._process_api_data(data, source)
         
         except Exception as e:
             logger.error(f"❌ Error fetching API data from {source.url}: {str(e)}")
@@ -580,28 +781,33 @@ class IncentiveUpdaterService:
         
         return incentives
     
-    def _create_incentive_from_data(self, data: Dict[str, Any], source: IncentiveSource) -> FilmIncentive:
-        """Create FilmIncentive object from scraped data"""
-        return FilmIncentive(
-            country=data.get('country', source.country),
-            region=data.get('region'),
-            incentive_type=data.get('incentive_type', 'tax_credit'),
-            percentage=data.get('percentage'),
-            max_credit=data.get('max_credit'),
-            minimum_spend=data.get('minimum_spend'),
-            maximum_spend=data.get('maximum_spend'),
-            requirements=data.get('requirements', {}),
-            processing_time_days=data.get('processing_time_days', 90),
-            current_cap_remaining=data.get('current_cap_remaining'),
-            is_active=True,
-            updated_at=datetime.now()
-        )
+    def _incentive_defaults(self, source: IncentiveSource) -> Dict[str, Any]:
+        """FilmIncentive arguments shared by every incentive parsed from one source"""
+        return {
+            'country': source.country,
+            'incentive_type': 'tax_credit',
+            'processing_time_days': 90,
+            'is_active': True,
+            'updated_at': datetime.now()
+        }
+    
+    def _create_incentive_from_data(self, data: Dict[str, Any], defaults: Dict[str, Any]) -> FilmIncentive:
+        """Create FilmIncentive object from scraped data (keys are FilmIncentive field names)"""
+        return FilmIncentive(**{**defaults, **data, 'is_active': True})
     
     def _find_existing_incentive(self, incentive: FilmIncentive) -> Optional[FilmIncentive]:
-        """Find existing incentive in database"""
-        # This would query the database to find matching incentive
-        # For now, return None (always create new)
-        return None
+        """Find existing incentive in the index loaded at the start of the update run
+
+        (country, region, type) isn't unique - New York's film and post-production credits are
+        both tax credits - so candidates are told apart by minimum spend, then percentage.
+        A changed percentage still matches (and isn't re-added) when the minimum spend identifies a single program.
+        """
+        candidates = self._existing_index.get((incentive.country, incentive.region, incentive.incentive_type), [])
+        same_spend = [inc for inc in candidates if inc.minimum_spend == incentive.minimum_spend]
+        for inc in same_spend:
+            if inc.percentage == incentive.percentage:
+                return inc
+        return same_spend[0] if len(same_spend) == 1 else None
     
     def _incentive_needs_update(self, existing: FilmIncentive, new: FilmIncentive) -> bool:
         """Check if existing incentive needs to be updated"""
@@ -613,11 +819,6 @@ class IncentiveUpdaterService:
             existing.requirements != new.requirements
         )
     
-    def _update_existing_incentive(self, existing: FilmIncentive, new: FilmIncentive):
-        """Update existing incentive with new data"""
-        # This would update the existing incentive in the database
-        pass
-    
     async def _update_database_stats(self):
         """Update database statistics after update"""
         try:
@@ -626,6 +827,42 @@ class IncentiveUpdaterService:
         except Exception as e:
             logger.error(f"❌ Error updating database stats: {str(e)}")
     
+    async def _check_source_health(
+        self,
+        session: aiohttp.ClientSession,
+        source: IncentiveSource,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """HEAD one source URL (GET if HEAD isn't allowed) and report its status"""
+        last_updated = source.last_updated.isoformat() if source.last_updated else None
+        loop = asyncio.get_running_loop()
+        
+        async with semaphore:
+            try:
+                start_time = loop.time()
+                async with session.head(source.url, allow_redirects=True, timeout=HEALTH_CHECK_TIMEOUT) as response:
+                    status_code = response.status
+                if status_code in (405, 501):
+                    async with session.get(source.url, timeout=HEALTH_CHECK_TIMEOUT) as response:
+                        status_code = response.status
+                response_time = loop.time() - start_time
+                
+                return {
+                    'url': source.url,
+                    'status_code': status_code,
+                    'response_time_seconds': response_time,
+                    'healthy': status_code == 200,
+                    'last_updated': last_updated
+                }
+            
+            except Exception as e:
+                return {
+                    'url': source.url,
+                    'error': str(e),
+                    'healthy': False,
+                    'last_updated': last_updated
+                }
+    
     async def check_sources_health(self) -> Dict[str, Any]:
         """Check health status of all incentive sources"""
         logger.info("🏥 Checking health of incentive sources")
@@ -637,37 +874,20 @@ class IncentiveUpdaterService:
             'unhealthy_count': 0
         }
         
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10)
-        ) as session:
-            
-            for source in self.sources:
-                try:
-                    start_time = datetime.now()
-                    async with session.get(source.url) as response:
-                        response_time = (datetime.now() - start_time).total_seconds()
-                        
-                        health_report['sources'][source.name] = {
-                            'url': source.url,
-                            'status_code': response.status,
-                            'response_time_seconds': response_time,
-                            'healthy': response.status == 200,
-                            'last_updated': source.last_updated.isoformat() if source.last_updated else None
-                        }
-                        
-                        if response.status == 200:
-                            health_report['healthy_count'] += 1
-                        else:
-                            health_report['unhealthy_count'] += 1
-                
-                except Exception as e:
-                    health_report['sources'][source.name] = {
-                        'url': source.url,
-                        'error': str(e),
-                        'healthy': False,
-                        'last_updated': source.last_updated.isoformat() if source.last_updated else None
-                    }
-                    health_report['unhealthy_count'] += 1
+        session = await self._get_session()
+        semaphore = asyncio.Semaphore(HEALTH_CHECK_CONCURRENCY)
+        
+        # Check every source at once; total time is the slowest source, not the sum
+        checks = await asyncio.gather(
+            *(self._check_source_health(session, source, semaphore) for source in self.sources)
+        )
+        
+        for source, status in zip(self.sources, checks):
+            health_report['sources'][source.name] = status
+            if status['healthy']:
+                health_report['healthy_count'] += 1
+            else:
+                health_report['unhealthy_count'] += 1
         
         logger.info(f"🏥 Health check complete: {health_report['healthy_count']} healthy, "
                    f"{health_report['unhealthy_count']} unhealthy")
@@ -683,6 +903,8 @@ async def main():
     parser = argparse.ArgumentParser(description='Film Incentive Data Updater')
     parser.add_argument('--update', action='store_true', help='Update all incentive data')
     parser.add_argument('--health', action='store_true', help='Check source health')
+    parser.add_argument('--force', action='store_true', help='Update every source, even if not yet due')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and skip writing the on-disk response cache')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
     
     args = parser.parse_args()
@@ -690,18 +912,21 @@ async def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    updater = IncentiveUpdaterService()
-    
-    if args.health:
-        health_report = await updater.check_sources_health()
-        print(json.dumps(health_report, indent=2))
-    
-    elif args.update:
-        update_results = await updater.update_all_incentives()
-        print(json.dumps(update_results, indent=2))
+    updater = IncentiveUpdaterService(use_cache=not args.no_cache)
     
-    else:
-        print("Use --update to update incentives or --health to check source health")
+    try:
+        if args.health:
+            health_report = await updater.check_sources_health()
+            print(orjson.dumps(health_report, option=orjson.OPT_INDENT_2).decode())
+        
+        elif args.update:
+            update_results = await updater.update_all_incentives(force=args.force)
+            print(orjson.dumps(update_results, option=orjson.OPT_INDENT_2).decode())
+        
+        else:
+            print("Use --update to update incentives or --health to check source health")
+    finally:
+        await updater.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
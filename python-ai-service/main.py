@@ -3,14 +3,21 @@ Quilty Screenplay Analysis Service
 Python backend for AI-powered screenplay analysis with Claude Opus 4.1
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any, AsyncGenerator
+from starlette.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sse_starlette.sse import EventSourceResponse
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional, List, Dict, Any, AsyncGenerator, Tuple
+from functools import lru_cache, partial
+from dataclasses import dataclass
 import os
-import json
-import uuid
+import orjson
+import ulid
+import hashlib
+import aiofiles
+import aiofiles.os
 import time
 import logging
 from datetime import datetime
@@ -20,7 +27,8 @@ import asyncio
 # Import our custom modules
 from database import ScreenplayDatabase
 from claude_analyzer import ClaudeOpusAnalyzer, AnalysisResult
-from grok_analyzer import GrokAnalyzer
+from grok_analyzer import GrokAnalyzer, close_poster_http_client
+from http_client import close_shared_http_client
 from openai_analyzer import OpenAIAnalyzer
 from gpt5_analyzer import GPT5Analyzer
 # from piapi_analyzer import PiAPIAnalyzer  # Commented out - not working
@@ -30,9 +38,12 @@ from source_material_analyzer import SourceMaterialAnalyzer
 from deepseek_analyzer import DeepSeekAnalyzer
 from perplexity_analyzer import PerplexityAnalyzer
 from pdf_processor import PDFProcessor
+from progress_store import ProgressStore
+from analysis_cache import AnalysisCache, analysis_cache_key, screenplay_digest
 from cost_tracker import CostTracker
 from budget_utils import estimate_budget_from_screenplay, categorize_budget
 from incentive_models import IncentiveDatabase, FilmIncentive, find_best_incentives_for_budget, get_incentives_by_analysis
+from incentive_service import orjson_default, get_incentive_service as get_incentive_lookup_service
 from pydantic import BaseModel
 
 load_dotenv(dotenv_path='../.env')
@@ -47,11 +58,78 @@ MAX_CONCURRENT_ANALYSES = 3  # Limit concurrent analyses
 analysis_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
 analysis_queue_size = 0
 
+# Analyzer fan-out limits: overall, and per API provider so one slow or
+# rate-limited provider can't hold every slot
+MAX_CONCURRENT_ANALYZERS = int(os.getenv("MAX_CONCURRENT_ANALYZERS", "6"))
+MAX_CONCURRENT_PER_PROVIDER = int(os.getenv("MAX_CONCURRENT_PER_PROVIDER", "3"))
+analyzer_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYZERS)
+provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+async def gated(provider: str, coro, shared: bool = True):
+    """Run an analyzer call once both its provider slot and a global slot are free
+
+    shared=False skips the global slot, for work that talks to different upstreams
+    (poster generation) and shouldn't queue behind or crowd out the text models.
+    """
+    semaphore = provider_semaphores.get(provider)
+    if semaphore is None:
+        semaphore = provider_semaphores[provider] = asyncio.Semaphore(MAX_CONCURRENT_PER_PROVIDER)
+    # Provider first, so calls queued behind a busy provider don't tie up global slots
+    async with semaphore:
+        if not shared:
+            return await coro
+        async with analyzer_semaphore:
+            return await coro
+
+async def _named_result(name: str, coro) -> tuple:
+    """Await an analyzer call, pairing its result (or exception) with its name"""
+    try:
+        return name, await coro
+    except Exception as e:
+        return name, e
+
+async def run_parallel_analyses(tasks: Dict[str, Any], handle_result, start_progress: int, end_progress: int) -> Dict[str, Any]:
+    """Run analyzer calls concurrently, handing each result to handle_result(name, value, progress) as it finishes"""
+    results: Dict[str, Any] = {}
+    step = (end_progress - start_progress) / max(len(tasks), 1)
+    running = [asyncio.create_task(_named_result(name, coro), name=f"analyzer:{name}") for name, coro in tasks.items()]
+    try:
+        for done, next_result in enumerate(asyncio.as_completed(running), 1):
+            name, value = await next_result
+            # Progress follows completion order so it never moves backwards
+            results[name] = handle_result(name, value, start_progress + round(step * done))
+    finally:
+        # If reporting fails or the analysis is cancelled, don't leave provider calls running unobserved
+        for task in running:
+            if not task.done():
+                task.cancel()
+    return results
+
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZip for regular responses; SSE progress streams pass through so events aren't held in the compressor"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/progress"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+class AppJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also encodes MySQL Decimal columns (as jsonable_encoder would)
+
+    Naive datetimes are written by orjson in the same form as datetime.isoformat(),
+    so rows can be returned without converting their timestamp columns first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Quilty Screenplay Analysis Service",
     description="Advanced screenplay analysis platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=AppJSONResponse
 )
 
 # Enable CORS for SvelteKit frontend
@@ -67,120 +145,246 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON (completed analyses run to hundreds of KB); small responses skip it
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=4096, compresslevel=5)
+
+# Analysis engines are built on first use, so cold starts and workers that only
+# serve reads don't pay for API clients they never call
+@lru_cache(maxsize=1)
+def get_claude_analyzer() -> ClaudeOpusAnalyzer:
+    return ClaudeOpusAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_grok_analyzer() -> GrokAnalyzer:
+    return GrokAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_openai_analyzer() -> OpenAIAnalyzer:
+    return OpenAIAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_gpt5_analyzer() -> GPT5Analyzer:
+    return GPT5Analyzer()
+
+@lru_cache(maxsize=1)
+def get_flux_analyzer() -> FluxAnalyzer:
+    return FluxAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_poster_manager() -> Optional[PosterManager]:
+    return PosterManager() if POSTER_GENERATION_ENABLED else None
+
+@lru_cache(maxsize=1)
+def get_source_material_analyzer() -> SourceMaterialAnalyzer:
+    return SourceMaterialAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_deepseek_analyzer() -> DeepSeekAnalyzer:
+    return DeepSeekAnalyzer()
+
+@lru_cache(maxsize=1)
+def get_perplexity_analyzer() -> PerplexityAnalyzer:
+    return PerplexityAnalyzer()
+
 # Initialize services
 try:
     db = ScreenplayDatabase()
-    claude_analyzer = ClaudeOpusAnalyzer()
-    grok_analyzer = GrokAnalyzer()
-    openai_analyzer = OpenAIAnalyzer()
-    gpt5_analyzer = GPT5Analyzer()
     # piapi_analyzer = PiAPIAnalyzer()  # Commented out - not working
-    flux_analyzer = FluxAnalyzer()
-    poster_manager = PosterManager() if POSTER_GENERATION_ENABLED else None
-    source_material_analyzer = SourceMaterialAnalyzer()
-    deepseek_analyzer = DeepSeekAnalyzer()
-    perplexity_analyzer = PerplexityAnalyzer()
     pdf_processor = PDFProcessor()
     cost_tracker = CostTracker()
     incentive_db = IncentiveDatabase()
-    logger.info("✅ All analysis engines initialized successfully")
+    get_incentive_lookup_service()  # Build the shared lookup service at startup, not on the first DeepSeek request
+    logger.info("✅ Core services initialized successfully (analysis engines load on first use)")
     
-    # Progress tracking store
-    progress_store: Dict[str, Dict[str, Any]] = {}
+    # Progress tracking store (shared through Redis when REDIS_URL is set)
+    progress_store = ProgressStore(os.getenv("REDIS_URL"))
+    # Completed analyses by submission content, so resubmissions skip the AI pipeline
+    analysis_cache = AnalysisCache(os.getenv("REDIS_URL"))
 except Exception as e:
     logger.error(f"❌ Service initialization failed: {e}")
     raise
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Release shared HTTP connection pools"""
+    await close_poster_http_client()
+    await close_shared_http_client()
+    await progress_store.close()
+    await analysis_cache.close()
+
 # Progress tracking functions
 def update_progress(analysis_id: str, stage: str, progress: int, message: str, details: Optional[Dict] = None):
     """Update progress for an analysis"""
-    progress_store[analysis_id] = {
+    progress_store.set(analysis_id, {
         'stage': stage,
         'progress': progress,
         'message': message,
         'details': details or {},
         'timestamp': time.time()
-    }
-    logger.info(f"📊 Progress {analysis_id}: {stage} ({progress}%) - {message}")
+    })
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"📊 Progress {analysis_id}: {stage} ({progress}%) - {message}")
 
-def get_progress(analysis_id: str) -> Dict[str, Any]:
+async def get_progress(analysis_id: str) -> Dict[str, Any]:
     """Get current progress for an analysis"""
-    return progress_store.get(analysis_id, {
+    return await progress_store.get(analysis_id) or {
         'stage': 'unknown',
         'progress': 0,
         'message': 'Analysis not found',
         'details': {},
         'timestamp': time.time()
-    })
+    }
+
+@dataclass(frozen=True)
+class ResultSpec:
+    """How one parallel analyzer's result is reported as progress"""
+    label: str                                # Used in the failure log line
+    headline_attr: str = ""                   # Result attribute shown in the completion message
+    complete_message: Optional[str] = None    # Formatted with the headline; None reports failures only
+    details: Tuple[Tuple[str, str], ...] = () # (progress detail key, result attribute)
+    skipped_message: Optional[str] = None     # Sent when the analyzer returned nothing usable
+    cost_key: str = "cost"
+    cost_attr: str = "cost"
+    headline_required: bool = False           # Treat a zero headline (e.g. no posters) as skipped
+
+_SCORE_DETAILS = (("score", "score"), ("recommendation", "recommendation"))
+
+_POSTER_RESULT_SPEC = ResultSpec(
+    "Poster collection generation", "success_count", "Generated {} movie posters!",
+    (("success_count", "success_count"), ("best_poster_url", "best_poster_url"), ("best_source", "best_poster_source")),
+    "Poster generation skipped (no APIs available)",
+    cost_key="total_cost", cost_attr="total_cost", headline_required=True
+)
+
+TEXT_RESULT_SPECS: Dict[str, ResultSpec] = {
+    'grok': ResultSpec("Reality check analysis", "score", "Reality check complete! Score: {}/10", _SCORE_DETAILS),
+    'openai': ResultSpec("Commercial analysis", "score", "Commercial analysis complete! Score: {}/10", _SCORE_DETAILS,
+                         "Commercial analysis skipped (service unavailable)"),
+    'gpt5': ResultSpec("Excellence analysis", "score", "GPT-5 Writing Excellence complete! Score: {}/10",
+                       _SCORE_DETAILS + (("reasoning_depth", "reasoning_depth"),),
+                       "Excellence analysis skipped (service unavailable)"),
+    'deepseek': ResultSpec("DeepSeek analysis", "overall_financial_score", "Financial analysis complete! Score: {}/10",
+                           (("financial_score", "overall_financial_score"), ("recommendation", "recommendation")),
+                           "DeepSeek analysis skipped (API unavailable)"),
+    'perplexity': ResultSpec("Perplexity research", "market_opportunity_score", "Market research complete! Score: {}/10",
+                             (("market_score", "market_opportunity_score"), ("recommendation", "market_recommendation")),
+                             "Perplexity research skipped (API unavailable)"),
+    'posters': _POSTER_RESULT_SPEC,
+}
+
+# The PDF flow reports DeepSeek / Perplexity through the final summary only
+PDF_RESULT_SPECS: Dict[str, ResultSpec] = {
+    'grok': ResultSpec("Reality check analysis", "score", "Reality check complete! Score: {}/10", _SCORE_DETAILS,
+                       "Reality check skipped (service unavailable)"),
+    'openai': TEXT_RESULT_SPECS['openai'],
+    'gpt5': ResultSpec("Excellence analysis", "score", "Excellence analysis complete! Score: {}/10",
+                       _SCORE_DETAILS + (("reasoning_depth", "reasoning_depth"),),
+                       "GPT-5 analysis skipped (API unavailable)"),
+    'deepseek': ResultSpec("DeepSeek analysis"),
+    'perplexity': ResultSpec("Perplexity research"),
+    'posters': _POSTER_RESULT_SPEC,
+}
 
-async def progress_stream(analysis_id: str) -> AsyncGenerator[str, None]:
-    """Stream progress updates for an analysis with improved error handling"""
+def report_parallel_result(analysis_id: str, specs: Dict[str, ResultSpec], name: str, value: Any, progress: int) -> Any:
+    """Report one finished analyzer per its spec; failures are logged and become None"""
+    spec = specs.get(name)
+    if isinstance(value, Exception):
+        logger.error(f"{spec.label if spec else name} failed: {value}")
+        return None
+    if spec is None or spec.complete_message is None:
+        return value
+
+    headline = getattr(value, spec.headline_attr) if value else None
+    if value and (headline > 0 or not spec.headline_required):
+        details = {key: getattr(value, attr) for key, attr in spec.details}
+        details[spec.cost_key] = f"${getattr(value, spec.cost_attr):.4f}"
+        update_progress(analysis_id, f"{name}_complete", progress, spec.complete_message.format(headline), details)
+    elif spec.skipped_message:
+        update_progress(analysis_id, f"{name}_skipped", progress, spec.skipped_message)
+    return value
+
+# Connection confirmation is identical for every stream, so it is framed once
+CONNECTED_EVENT = b'data: {"heartbeat":true,"connected":true}\n\n'
+
+def sse_data(payload: Dict[str, Any]) -> bytes:
+    """Frame an SSE data event as bytes; EventSourceResponse sends bytes as-is, so nothing is re-encoded.
+    orjson output is a single line, so one data: field is always enough"""
+    return b"data: " + orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+async def progress_stream(analysis_id: str) -> AsyncGenerator[bytes, None]:
+    """Stream progress updates for an analysis; keep-alive pings come from EventSourceResponse"""
     last_update = 0
-    timeout_count = 0
-    max_timeout = 600  # 10 minutes timeout (increased for long analyses)
-    heartbeat_interval = 5  # Send heartbeat every 5 seconds
+    max_idle = 600  # 10 minutes without progress (increased for long analyses)
+    loop = asyncio.get_running_loop()
+    idle_deadline = loop.time() + max_idle
     
     logger.info(f"📊 Starting progress stream for analysis: {analysis_id}")
     
     try:
         # Send initial connection confirmation
-        yield f"data: {json.dumps({'heartbeat': True, 'connected': True, 'timestamp': time.time()})}\n\n"
+        yield CONNECTED_EVENT
         
-        while timeout_count < max_timeout:
-            try:
-                current_progress = get_progress(analysis_id)
-                current_time = current_progress.get('timestamp', 0)
+        async with progress_store.updates(analysis_id) as wait_for_update:
+            while loop.time() < idle_deadline:
+                try:
+                    current_progress = await get_progress(analysis_id)
+                    current_time = current_progress.get('timestamp', 0)
                 
-                # Send update if there's new progress
-                if current_time > last_update:
-                    data = json.dumps(current_progress)
-                    yield f"data: {data}\n\n"
-                    last_update = current_time
-                    timeout_count = 0
+                    # Send update if there's new progress
+                    if current_time > last_update:
+                        yield sse_data(current_progress)
+                        last_update = current_time
+                        idle_deadline = loop.time() + max_idle
                     
-                    logger.debug(f"📊 Progress update sent for {analysis_id}: {current_progress.get('stage', 'unknown')} ({current_progress.get('progress', 0)}%)")
+                        logger.debug(f"📊 Progress update sent for {analysis_id}: {current_progress.get('stage', 'unknown')} ({current_progress.get('progress', 0)}%)")
                     
-                    # Check if analysis is complete or errored
-                    if current_progress.get('progress', 0) >= 100 or current_progress.get('stage') in ['complete', 'error']:
-                        logger.info(f"✅ Analysis stream completed for {analysis_id}")
-                        break
-                else:
-                    # Send heartbeat every 5 seconds
-                    if timeout_count % heartbeat_interval == 0:
-                        yield f"data: {json.dumps({'heartbeat': True, 'timestamp': time.time()})}\n\n"
-                    timeout_count += 1
+                        # Check if analysis is complete or errored
+                        if current_progress.get('progress', 0) >= 100 or current_progress.get('stage') in ['complete', 'error']:
+                            logger.info(f"✅ Analysis stream completed for {analysis_id}")
+                            break
                 
-                await asyncio.sleep(1)
+                    await wait_for_update(15)  # Returns as soon as new progress is recorded
                 
-            except Exception as e:
-                logger.error(f"❌ Error in progress stream for {analysis_id}: {e}")
-                # Send error to client but continue trying
-                error_data = json.dumps({
-                    'stage': 'error',
-                    'progress': 0,
-                    'message': f'Streaming error: {str(e)}',
-                    'timestamp': time.time()
-                })
-                yield f"data: {error_data}\n\n"
-                await asyncio.sleep(5)  # Wait longer on errors
+                except Exception as e:
+                    logger.error(f"❌ Error in progress stream for {analysis_id}: {e}")
+                    # Send error to client but continue trying
+                    yield sse_data({
+                        'stage': 'error',
+                        'progress': 0,
+                        'message': f'Streaming error: {str(e)}',
+                        'timestamp': time.time()
+                    })
+                    await asyncio.sleep(5)  # Wait longer on errors
                 
     except Exception as e:
         logger.error(f"❌ Critical error in progress stream for {analysis_id}: {e}")
         # Send final error message
-        error_data = json.dumps({
+        yield sse_data({
             'stage': 'error', 
             'progress': 0, 
             'message': f'Stream failed: {str(e)}',
             'timestamp': time.time()
         })
-        yield f"data: {error_data}\n\n"
     finally:
         # Send final completion message
         logger.info(f"🔚 Progress stream ended for {analysis_id}")
-        yield f"data: {json.dumps({'stage': 'stream_ended', 'progress': 100, 'message': 'Stream ended', 'timestamp': time.time()})}\n\n"
+        yield sse_data({'stage': 'stream_ended', 'progress': 100, 'message': 'Stream ended', 'timestamp': time.time()})
 
 # Request/Response Models
+def validate_budget_estimate(v: Optional[float]) -> Optional[float]:
+    """Shared budget bounds for text and PDF submissions; raises ValueError with the user-facing message"""
+    if v is not None:
+        if v < 0:
+            raise ValueError('Budget must be non-negative')
+        if v > 1_000_000_000:
+            raise ValueError('Budget cannot exceed $1 billion')
+        if 0 < v < 1000:
+            raise ValueError('Budget must be at least $1,000 for professional analysis')
+    return v
+
 class AnalysisRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     title: str
     screenplay_text: str
     genre: Optional[str] = None
@@ -189,15 +393,8 @@ class AnalysisRequest(BaseModel):
     
     @field_validator('budget_estimate')
     @classmethod
-    def validate_budget(cls, v):
-        if v is not None:
-            if v < 0:
-                raise ValueError('Budget must be non-negative')
-            if v > 1_000_000_000:
-                raise ValueError('Budget cannot exceed $1 billion')
-            if v > 0 and v < 1000:
-                raise ValueError('Budget must be at least $1,000 for professional analysis')
-        return v
+    def validate_budget(cls, v: Optional[float]) -> Optional[float]:
+        return validate_budget_estimate(v)
 
 class AnalysisResponse(BaseModel):
     analysis_id: str
@@ -214,12 +411,110 @@ class AnalysisStatusResponse(BaseModel):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
+    return AppJSONResponse({
         "status": "healthy",
         "service": "Quilty Screenplay Analysis Service",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
+    })
+
+# Initial analysis records: every result column starts out NULL, so the
+# endpoints only fill in the request-specific fields on top of a template
+_INITIAL_ANALYSIS_TEMPLATE: Dict[str, Any] = {
+    'status': 'processing',
+    'ai_model': 'Claude Opus 4.1',
+    'original_filename': None,
+    'file_path': None,
+    **dict.fromkeys((
+        'detected_genre', 'subgenre', 'overall_score', 'recommendation', 'one_line_verdict',
+        'logline', 'executive_summary', 'structural_analysis', 'character_analysis',
+        'thematic_depth', 'craft_evaluation', 'genre_mastery', 'top_strengths', 'key_weaknesses',
+        'suggestions', 'improvement_strategies', 'commercial_viability', 'target_audience',
+        'comparable_films', 'casting_suggestions', 'casting_vision', 'director_recommendation',
+        'grok_score', 'grok_recommendation', 'grok_verdict', 'grok_confidence',
+        'grok_cultural_analysis', 'grok_brutal_honesty', 'grok_controversy_analysis',
+        'grok_movie_poster_url', 'grok_poster_prompt', 'openai_score', 'openai_recommendation',
+        'openai_verdict', 'confidence_level', 'processing_time', 'cost', 'raw_api_request',
+        'raw_api_response'
+    ))
+}
+_INITIAL_TEXT_TEMPLATE: Dict[str, Any] = {
+    **_INITIAL_ANALYSIS_TEMPLATE,
+    **dict.fromkeys((
+        'piapi_poster_url', 'piapi_poster_prompt', 'piapi_poster_cost', 'piapi_poster_success', 'piapi_poster_error'
+    ))
+}
+_INITIAL_PDF_TEMPLATE: Dict[str, Any] = {
+    **_INITIAL_ANALYSIS_TEMPLATE,
+    **dict.fromkeys((
+        'grok_raw_response', 'openai_confidence', 'openai_commercial_assessment', 'openai_technical_craft',
+        'openai_industry_comparison', 'openai_raw_response', 'openai_movie_poster_url', 'openai_poster_prompt'
+    ))
+}
+
+async def start_text_analysis(
+    background_tasks: BackgroundTasks,
+    screenplay_text: str,
+    title: str,
+    genre: Optional[str],
+    user_id: str,
+    budget_estimate: Optional[float]
+) -> AnalysisResponse:
+    """Create the analysis record and queue it (or reuse an identical completed one)"""
+    
+    # Identical resubmissions reuse the completed analysis instead of re-running every model
+    cache_key = analysis_cache_key(
+        user_id, title, genre, budget_estimate,
+        screenplay_digest(screenplay_text)
+    )
+    cached_id = await analysis_cache.get(cache_key)
+    if cached_id:
+        cached = await asyncio.to_thread(db.get_analysis, cached_id)
+        if cached and cached.get('status') == 'completed' and cached.get('user_id') == user_id:
+            logger.info(f"♻️ Reusing completed analysis {cached_id} for identical submission")
+            update_progress(cached_id, "complete", 100, "Analysis complete! Reused results for identical screenplay.")
+            return AnalysisResponse(
+                analysis_id=cached_id,
+                status="completed",
+                message="Identical screenplay already analyzed; returning existing results"
+            )
+    
+    # Generate analysis ID
+    analysis_id = f"text_{ulid.new().str}"  # Time-ordered, so inserts land at the end of the primary key
+    
+    # Create initial database record
+    initial_data = {
+        **_INITIAL_TEXT_TEMPLATE,
+        'id': analysis_id,
+        'user_id': user_id,
+        'title': title,
+        'genre': genre,
+        'user_proposed_budget': budget_estimate,
+        'file_size': len(screenplay_text)
     }
+    
+    if not await asyncio.to_thread(db.insert_initial_analysis, initial_data):
+        raise HTTPException(status_code=500, detail="Failed to create analysis record")
+    
+    # Start queued background analysis; only the parked file's path waits in the queue
+    screenplay_text_path = await park_screenplay_text(analysis_id, screenplay_text)
+    background_tasks.add_task(
+        queued_analysis,
+        process_text_analysis,
+        analysis_id,
+        screenplay_text_path,
+        title,
+        genre,
+        user_id,
+        budget_estimate,
+        cache_key
+    )
+    
+    return AnalysisResponse(
+        analysis_id=analysis_id,
+        status="processing",
+        message="Analysis started successfully"
+    )
 
 # Text analysis endpoint
 @app.post("/analyze/text", response_model=AnalysisResponse)
@@ -232,75 +527,8 @@ async def analyze_text(
     logger.info(f"📝 Text analysis request: {request.title} (user: {request.user_id})")
     
     try:
-        # Generate analysis ID
-        analysis_id = f"text_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
-        
-        # Create initial database record
-        initial_data = {
-            'id': analysis_id,
-            'user_id': request.user_id,
-            'title': request.title,
-            'genre': request.genre,
-            'user_proposed_budget': request.budget_estimate,
-            'status': 'processing',
-            'ai_model': 'Claude Opus 4.1',
-            'original_filename': None,
-            'file_path': None,
-            'file_size': len(request.screenplay_text),
-            'detected_genre': None,
-            'subgenre': None,
-            'overall_score': None,
-            'recommendation': None,
-            'one_line_verdict': None,
-            'logline': None,
-            'executive_summary': None,
-            'structural_analysis': None,
-            'character_analysis': None,
-            'thematic_depth': None,
-            'craft_evaluation': None,
-            'genre_mastery': None,
-            'top_strengths': None,
-            'key_weaknesses': None,
-            'suggestions': None,
-            'improvement_strategies': None,
-            'commercial_viability': None,
-            'target_audience': None,
-            'comparable_films': None,
-            'casting_suggestions': None,
-            'casting_vision': None,
-            'director_recommendation': None,
-            'grok_score': None,
-            'grok_recommendation': None,
-            'grok_verdict': None,
-            'grok_confidence': None,
-            'grok_cultural_analysis': None,
-            'grok_brutal_honesty': None,
-            'grok_controversy_analysis': None,
-            'grok_movie_poster_url': None,
-            'grok_poster_prompt': None,
-            'openai_score': None,
-            'openai_recommendation': None,
-            'openai_verdict': None,
-            'piapi_poster_url': None,
-            'piapi_poster_prompt': None,
-            'piapi_poster_cost': None,
-            'piapi_poster_success': None,
-            'piapi_poster_error': None,
-            'confidence_level': None,
-            'processing_time': None,
-            'cost': None,
-            'raw_api_request': None,
-            'raw_api_response': None
-        }
-        
-        if not db.insert_initial_analysis(initial_data):
-            raise HTTPException(status_code=500, detail="Failed to create analysis record")
-        
-        # Start queued background analysis
-        background_tasks.add_task(
-            queued_analysis,
-            process_text_analysis,
-            analysis_id,
+        return await start_text_analysis(
+            background_tasks,
             request.screenplay_text,
             request.title,
             request.genre,
@@ -308,16 +536,44 @@ async def analyze_text(
             request.budget_estimate
         )
         
-        return AnalysisResponse(
-            analysis_id=analysis_id,
-            status="processing",
-            message="Analysis started successfully"
-        )
-        
     except Exception as e:
         logger.error(f"❌ Text analysis request failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Raw text analysis endpoint: the screenplay is the text/plain body, metadata is in the query
+# string, so large screenplays skip JSON parsing and model validation of the text
+@app.post("/analyze/text/raw", response_model=AnalysisResponse)
+async def analyze_text_raw(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    title: str,
+    user_id: str,
+    genre: Optional[str] = None,
+    budget_estimate: Optional[float] = None
+):
+    """Analyze screenplay sent as a raw text/plain request body"""
+    
+    try:
+        validate_budget_estimate(budget_estimate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        screenplay_text = (await request.body()).decode('utf-8')
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Screenplay text must be UTF-8")
+    if not screenplay_text.strip():
+        raise HTTPException(status_code=400, detail="Screenplay text is empty")
+    
+    logger.info(f"📝 Raw text analysis request: {title} (user: {user_id}, {len(screenplay_text):,} chars)")
+    
+    try:
+        return await start_text_analysis(background_tasks, screenplay_text, title, genre, user_id, budget_estimate)
+        
+    except Exception as e:
+        logger.error(f"❌ Raw text analysis request failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # PDF upload and analysis endpoint
 @app.post("/analyze/pdf", response_model=AnalysisResponse)
 async def analyze_pdf(
@@ -331,13 +587,10 @@ async def analyze_pdf(
     """Upload and analyze PDF screenplay with optional budget estimate"""
     
     # Validate budget estimate
-    if budget_estimate is not None:
-        if budget_estimate < 0:
-            raise HTTPException(status_code=400, detail="Budget must be non-negative")
-        if budget_estimate > 1_000_000_000:
-            raise HTTPException(status_code=400, detail="Budget cannot exceed $1 billion")
-        if budget_estimate > 0 and budget_estimate < 1000:
-            raise HTTPException(status_code=400, detail="Budget must be at least $1,000 for professional analysis")
+    try:
+        validate_budget_estimate(budget_estimate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     logger.info(f"📄 PDF analysis request: {title} (file: {file.filename}, user: {user_id})")
     
@@ -346,82 +599,45 @@ async def analyze_pdf(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are supported")
         
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        # Validate file size (50MB limit)
-        if file_size > 50 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File too large (max 50MB)")
+        # Stream the upload to disk (50MB limit enforced per chunk), hashing it on the way
+        hasher = hashlib.sha256()
+        try:
+            file_path, file_size = await pdf_processor.save_upload_stream(file, file.filename, user_id, hasher)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # Identical resubmissions reuse the completed analysis instead of re-running every model
+        cache_key = analysis_cache_key(user_id, title, genre, budget_estimate, hasher.hexdigest())
+        cached_id = await analysis_cache.get(cache_key)
+        if cached_id:
+            cached = await asyncio.to_thread(db.get_analysis, cached_id)
+            if cached and cached.get('status') == 'completed' and cached.get('user_id') == user_id:
+                logger.info(f"♻️ Reusing completed analysis {cached_id} for identical PDF")
+                await asyncio.to_thread(os.remove, file_path)
+                update_progress(cached_id, "complete", 100, "Analysis complete! Reused results for identical screenplay.")
+                return AnalysisResponse(
+                    analysis_id=cached_id,
+                    status="completed",
+                    message="Identical screenplay already analyzed; returning existing results"
+                )
         
         # Generate analysis ID
-        analysis_id = f"pdf_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
-        
-        # Save uploaded file
-        file_path = pdf_processor.save_uploaded_file(file_content, file.filename, user_id)
+        analysis_id = f"pdf_{ulid.new().str}"
         
         # Create initial database record
         initial_data = {
+            **_INITIAL_PDF_TEMPLATE,
             'id': analysis_id,
             'user_id': user_id,
             'title': title,
             'genre': genre,
             'user_proposed_budget': budget_estimate,
-            'status': 'processing',
-            'ai_model': 'Claude Opus 4.1',
             'original_filename': file.filename,
             'file_path': file_path,
-            'file_size': file_size,
-            'detected_genre': None,
-            'subgenre': None,
-            'overall_score': None,
-            'recommendation': None,
-            'one_line_verdict': None,
-            'logline': None,
-            'executive_summary': None,
-            'structural_analysis': None,
-            'character_analysis': None,
-            'thematic_depth': None,
-            'craft_evaluation': None,
-            'genre_mastery': None,
-            'top_strengths': None,
-            'key_weaknesses': None,
-            'suggestions': None,
-            'improvement_strategies': None,
-            'commercial_viability': None,
-            'target_audience': None,
-            'comparable_films': None,
-            'casting_suggestions': None,
-            'casting_vision': None,
-            'director_recommendation': None,
-            'grok_score': None,
-            'grok_recommendation': None,
-            'grok_verdict': None,
-            'grok_confidence': None,
-            'grok_cultural_analysis': None,
-            'grok_brutal_honesty': None,
-            'grok_controversy_analysis': None,
-            'grok_movie_poster_url': None,
-            'grok_poster_prompt': None,
-            'grok_raw_response': None,
-            'openai_score': None,
-            'openai_recommendation': None,
-            'openai_verdict': None,
-            'openai_confidence': None,
-            'openai_commercial_assessment': None,
-            'openai_technical_craft': None,
-            'openai_industry_comparison': None,
-            'openai_raw_response': None,
-            'openai_movie_poster_url': None,
-            'openai_poster_prompt': None,
-            'confidence_level': None,
-            'processing_time': None,
-            'cost': None,
-            'raw_api_request': None,
-            'raw_api_response': None
+            'file_size': file_size
         }
         
-        if not db.insert_initial_analysis(initial_data):
+        if not await asyncio.to_thread(db.insert_initial_analysis, initial_data):
             raise HTTPException(status_code=500, detail="Failed to create analysis record")
         
         # Start queued background analysis
@@ -429,12 +645,13 @@ async def analyze_pdf(
             queued_analysis,
             process_pdf_analysis,
             analysis_id,
-            file_content,
+            file_path,
             file.filename,
             title,
             genre,
             user_id,
-            budget_estimate
+            budget_estimate,
+            cache_key
         )
         
         return AnalysisResponse(
@@ -455,23 +672,18 @@ async def get_analysis(analysis_id: str):
     """Get analysis status and results"""
     
     try:
-        analysis = db.get_analysis(analysis_id)
+        analysis = await asyncio.to_thread(db.get_analysis, analysis_id)
         
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        # Convert datetime objects to strings for JSON serialization
-        if analysis.get('created_at'):
-            analysis['created_at'] = analysis['created_at'].isoformat()
-        if analysis.get('updated_at'):
-            analysis['updated_at'] = analysis['updated_at'].isoformat()
-        
-        return AnalysisStatusResponse(
-            analysis_id=analysis_id,
-            status=analysis['status'],
-            result=analysis if analysis['status'] == 'completed' else None,
-            error_message=analysis.get('error_message')
-        )
+        # Same shape as AnalysisStatusResponse, encoded directly without the jsonable_encoder walk
+        return AppJSONResponse({
+            "analysis_id": analysis_id,
+            "status": analysis['status'],
+            "result": analysis if analysis['status'] == 'completed' else None,
+            "error_message": analysis.get('error_message')
+        })
         
     except HTTPException:
         raise
@@ -485,20 +697,13 @@ async def get_user_analyses(user_id: str, limit: int = 50, offset: int = 0):
     """Get all analyses for a user"""
     
     try:
-        analyses = db.get_user_analyses(user_id, limit, offset)
+        analyses = await asyncio.to_thread(db.get_user_analyses, user_id, limit, offset)
         
-        # Convert datetime objects to strings
-        for analysis in analyses:
-            if analysis.get('created_at'):
-                analysis['created_at'] = analysis['created_at'].isoformat()
-            if analysis.get('updated_at'):
-                analysis['updated_at'] = analysis['updated_at'].isoformat()
-        
-        return {
+        return AppJSONResponse({
             "user_id": user_id,
             "analyses": analyses,
             "count": len(analyses)
-        }
+        })
         
     except Exception as e:
         logger.error(f"❌ Error getting user analyses: {e}")
@@ -510,7 +715,7 @@ async def get_user_usage(user_id: str):
     """Get user usage statistics and costs"""
     
     try:
-        usage_stats = db.get_user_usage_stats(user_id)
+        usage_stats = await asyncio.to_thread(db.get_user_usage_stats, user_id)
         
         if not usage_stats:
             # Return default stats for new users
@@ -525,13 +730,7 @@ async def get_user_usage(user_id: str):
                 'last_analysis_at': None
             }
         
-        # Convert datetime to string if present
-        if usage_stats.get('last_analysis_at'):
-            usage_stats['last_analysis_at'] = usage_stats['last_analysis_at'].isoformat()
-        if usage_stats.get('last_updated'):
-            usage_stats['last_updated'] = usage_stats['last_updated'].isoformat()
-        
-        return usage_stats
+        return AppJSONResponse(usage_stats)
         
     except Exception as e:
         logger.error(f"❌ Error getting user usage: {e}")
@@ -540,12 +739,11 @@ async def get_user_usage(user_id: str):
 @app.get("/analysis/{analysis_id}/progress")
 async def stream_progress(analysis_id: str):
     """Stream real-time progress updates for an analysis"""
-    return StreamingResponse(
+    # EventSourceResponse sets no-cache/keep-alive/X-Accel-Buffering and sends a ping every 15s
+    return EventSourceResponse(
         progress_stream(analysis_id),
-        media_type="text/event-stream",
+        ping=15,
         headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
             "Access-Control-Allow-Headers": "*",
         }
@@ -570,14 +768,168 @@ async def queued_analysis(analysis_func, *args, **kwargs):
         finally:
             logger.info(f"✅ Analysis completed. Available slots: {analysis_semaphore._value}")
 
+# Queued text submissions wait on disk rather than in memory (the PDF path already does)
+QUEUED_TEXT_DIR = "uploads/queued_text"
+
+async def park_screenplay_text(analysis_id: str, screenplay_text: str) -> str:
+    """Write a submitted screenplay to disk until its analysis gets a queue slot"""
+    await aiofiles.os.makedirs(QUEUED_TEXT_DIR, exist_ok=True)
+    path = os.path.join(QUEUED_TEXT_DIR, f"{analysis_id}.txt")
+    async with aiofiles.open(path, 'w', encoding='utf-8') as f:
+        await f.write(screenplay_text)
+    return path
+
+async def take_screenplay_text(path: str) -> str:
+    """Read a parked screenplay back and remove its file"""
+    async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+        screenplay_text = await f.read()
+    await aiofiles.os.remove(path)
+    return screenplay_text
+
+# Results stored with the analysis, in the column precedence the save path has always used
+DB_FORMATTERS = (
+    ('claude', get_claude_analyzer),
+    ('grok', get_grok_analyzer),
+    ('openai', get_openai_analyzer),
+    ('gpt5', get_gpt5_analyzer),
+    ('deepseek', get_deepseek_analyzer),
+    ('perplexity', get_perplexity_analyzer),
+    ('posters', get_poster_manager),
+    ('source', get_source_material_analyzer),
+)
+
+def database_format(factory, result) -> Dict[str, Any]:
+    """The analyzer's to_database_format output, memoized on the result so a repeated save doesn't re-walk it
+
+    Results are not modified once their analyzer returns, and callers merge the dict rather than mutate it.
+    """
+    cached = vars(result).get('_database_format')
+    if cached is None:
+        cached = result._database_format = factory().to_database_format(result)
+    return cached
+
+def build_db_data(results: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge every available analyzer's database columns and the record fields into one row dict"""
+    parts = [database_format(factory, results[name])
+             for name, factory in DB_FORMATTERS if results.get(name)]
+    parts.append(record)
+    return {key: value for part in parts for key, value in part.items()}
+
+def log_poster_columns(db_data: Dict[str, Any]):
+    """Log the poster columns about to be saved (skipped entirely below INFO)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    best_url = db_data.get('poster_best_url')
+    logger.info("🎨 Poster collection database data: %s", [key for key in db_data if key.startswith('poster_')])
+    logger.info("🎨 Poster success count: %s", db_data.get('poster_success_count', 'MISSING'))
+    logger.info("🎨 Poster best URL: %s...", best_url[:100] if best_url else 'MISSING')
+
+# Result name -> (api_provider, model_name) recorded by cost_tracker
+USAGE_MODELS = {
+    'claude': ("anthropic", "claude-opus-4-1-20250805"),
+    'grok': ("xai", "grok-4-latest"),
+    'openai': ("openai", "gpt-5"),
+}
+
+def usage_entries(results: Dict[str, Any], providers: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """cost_tracker usage entries for the listed analyzers that produced a result"""
+    return [
+        {
+            'api_provider': USAGE_MODELS[name][0],
+            'model_name': USAGE_MODELS[name][1],
+            'cost': results[name].cost,
+            'processing_time': results[name].processing_time
+        }
+        for name in providers if results.get(name)
+    ]
+
+# (result name, cost attribute) for every analyzer that bills per analysis
+COST_SOURCES = (
+    ('claude', 'cost'), ('grok', 'cost'), ('openai', 'cost'), ('gpt5', 'cost'),
+    ('deepseek', 'cost'), ('perplexity', 'cost'), ('posters', 'total_cost'), ('source', 'cost'),
+)
+
+# (completion detail key, result name, score attribute)
+SCORE_FIELDS = (
+    ("claude_score", 'claude', 'overall_score'),
+    ("grok_score", 'grok', 'score'),
+    ("openai_score", 'openai', 'score'),
+    ("gpt5_score", 'gpt5', 'score'),
+    ("deepseek_score", 'deepseek', 'overall_financial_score'),
+    ("perplexity_score", 'perplexity', 'market_opportunity_score'),
+)
+
+def total_analysis_cost(results: Dict[str, Any]) -> float:
+    """Sum the cost of every analyzer that produced a result"""
+    return sum(getattr(results[name], attr) for name, attr in COST_SOURCES if results.get(name))
+
+def completion_scores(results: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-analyzer scores for the completion progress event; None where an analyzer produced nothing"""
+    return {
+        key: getattr(results[name], attr) if results.get(name) else None
+        for key, name, attr in SCORE_FIELDS
+    }
+
+def serialize_json_columns(db_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode dict/list values as JSON text for their MySQL columns in one orjson pass"""
+    return {
+        key: orjson.dumps(value, default=orjson_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        if isinstance(value, (dict, list)) else value
+        for key, value in db_data.items()
+    }
+
+async def finalize_analysis(
+    analysis_id: str,
+    user_id: str,
+    label: str,
+    results: Dict[str, Any],
+    record: Dict[str, Any],
+    saving_progress: int,
+    tracked_usage: Tuple[str, ...],
+    cache_key: Optional[str] = None
+):
+    """Save a finished analysis with its API usage and report completion; raises if the save fails"""
+    # Convert to database format
+    update_progress(analysis_id, "saving", saving_progress, "Saving analysis results to database...")
+    db_data = build_db_data(results, record)
+    if results.get('posters'):
+        log_poster_columns(db_data)
+    else:
+        logger.warning("⚠️ No poster collection data to save")
+    
+    # Update database record
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("🔍 Saving analysis data: %s", list(db_data))
+    
+    # Ensure all dict values are properly JSON serialized
+    db_data = serialize_json_columns(db_data)
+    
+    # API usage is written in the same transaction as the analysis row
+    usage_rows = cost_tracker.usage_rows(user_id, analysis_id, usage_entries(results, tracked_usage))
+    
+    # run_in_executor hands the INSERT to a worker thread right away (a task would only start
+    # at the next await), so the completion summary below is built while it is in flight
+    save_future = asyncio.get_running_loop().run_in_executor(None, db.save_analysis_with_usage, db_data, usage_rows)
+    completion_details = completion_scores(results)
+    completion_details["total_cost"] = f"${total_analysis_cost(results):.4f}"
+    
+    if not await save_future:
+        raise Exception("Failed to save analysis results")
+    
+    update_progress(analysis_id, "complete", 100, "Analysis complete! Results saved successfully.", completion_details)
+    logger.info("✅ %s analysis completed: %s", label, analysis_id)
+    if cache_key:
+        await analysis_cache.set(cache_key, analysis_id)
+
 # Background task functions
 async def process_text_analysis(
     analysis_id: str,
-    screenplay_text: str,
+    screenplay_text_path: str,
     title: str,
     genre: Optional[str],
     user_id: str,
-    budget_estimate: Optional[float]
+    budget_estimate: Optional[float],
+    cache_key: Optional[str] = None
 ):
     """Background task to process text analysis"""
     
@@ -588,12 +940,14 @@ async def process_text_analysis(
     source_result = None
     
     try:
+        screenplay_text = await take_screenplay_text(screenplay_text_path)
+        
         # Start source material analysis (early - informs other analyses)
         update_progress(analysis_id, "source_analysis", 15, "Analyzing source material and IP...", {
             "model": "gpt-4o",
             "estimated_time": "10-15 seconds"
         })
-        source_result = await source_material_analyzer.analyze_source_material(
+        source_result = await get_source_material_analyzer().analyze_source_material(
             screenplay_text=screenplay_text,
             title=title
         )
@@ -657,7 +1011,7 @@ async def process_text_analysis(
             "text_length": len(screenplay_text),
             "estimated_time": "60-90 seconds"
         })
-        result = await claude_analyzer.analyze_screenplay(
+        result = await get_claude_analyzer().analyze_screenplay(
             screenplay_text=screenplay_text,
             title=title,
             genre=genre,
@@ -678,10 +1032,10 @@ async def process_text_analysis(
         })
         
         # Create parallel tasks
-        tasks = []
+        tasks: Dict[str, Any] = {}
         
         # Grok analysis task
-        tasks.append(grok_analyzer.analyze(
+        tasks['grok'] = gated("xai", get_grok_analyzer().analyze(
             screenplay_text=screenplay_text,
             title=title,
             genre=genre or result.genre,
@@ -689,7 +1043,7 @@ async def process_text_analysis(
         ))
         
         # OpenAI analysis task
-        tasks.append(openai_analyzer.analyze(
+        tasks['openai'] = gated("openai", get_openai_analyzer().analyze(
             screenplay_text=screenplay_text,
             title=title,
             genre=genre or result.genre,
@@ -697,7 +1051,7 @@ async def process_text_analysis(
         ))
         
         # GPT-5 Writing Excellence analysis task
-        tasks.append(gpt5_analyzer.analyze(
+        tasks['gpt5'] = gated("openai", get_gpt5_analyzer().analyze(
             screenplay_text=screenplay_text,
             title=title,
             genre=genre or result.genre,
@@ -705,7 +1059,7 @@ async def process_text_analysis(
         ))
         
         # DeepSeek financial analysis task
-        tasks.append(deepseek_analyzer.analyze_financial_potential(
+        tasks['deepseek'] = gated("deepseek", get_deepseek_analyzer().analyze_financial_potential(
             screenplay_text=screenplay_text,
             title=title,
             genre=genre or (result.genre if result else "Drama"),
@@ -714,7 +1068,7 @@ async def process_text_analysis(
         ))
         
         # Perplexity market research task
-        tasks.append(perplexity_analyzer.research_market_intelligence(
+        tasks['perplexity'] = gated("perplexity", get_perplexity_analyzer().research_market_intelligence(
             title=title,
             genre=genre or (result.genre if result else "Drama"),
             release_timeframe="next_12_months",
@@ -723,8 +1077,8 @@ async def process_text_analysis(
         ))
         
         # Enhanced poster collection generation task (feature-flagged)
-        if POSTER_GENERATION_ENABLED and poster_manager is not None:
-            tasks.append(poster_manager.generate_poster_collection(
+        if POSTER_GENERATION_ENABLED and get_poster_manager() is not None:
+            tasks['posters'] = gated("posters", get_poster_manager().generate_poster_collection(
                 title=title,
                 genre=genre or (result.genre if result else "Drama"),
                 analysis_data={
@@ -735,222 +1089,41 @@ async def process_text_analysis(
                     'main_characters': getattr(result, 'main_characters', []) if result else []
                 },
                 variations=['theatrical', 'character']  # Generate 2 main variations
-            ))
+            ), shared=False)
         
-        # Execute all tasks in parallel
         logger.info(f"🔧 Executing {len(tasks)} parallel tasks...")
-        parallel_results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.info(f"🔧 Parallel results count: {len(parallel_results)}")
-        if POSTER_GENERATION_ENABLED and poster_manager is not None:
-            grok_result, openai_result, gpt5_result, deepseek_result, perplexity_result, poster_collection = parallel_results
-        else:
-            grok_result, openai_result, gpt5_result, deepseek_result, perplexity_result = parallel_results
-            poster_collection = None
-        logger.info(f"🔧 Poster collection type: {type(poster_collection)}")
-        logger.info(f"🔧 Poster collection is Exception: {isinstance(poster_collection, Exception)}")
-        if hasattr(poster_collection, 'success_count'):
-            logger.info(f"🔧 Poster collection success count: {poster_collection.success_count}")
-        
-        # Handle Grok result
-        if isinstance(grok_result, Exception):
-            logger.error(f"Reality check analysis failed: {grok_result}")
-            grok_result = None
-        elif grok_result:
-            update_progress(analysis_id, "grok_complete", 70, f"Reality check complete! Score: {grok_result.score}/10", {
-                "score": grok_result.score,
-                "recommendation": grok_result.recommendation,
-                "cost": f"${grok_result.cost:.4f}"
-            })
-        
-        # Handle OpenAI result
-        if isinstance(openai_result, Exception):
-            logger.error(f"Commercial analysis failed: {openai_result}")
-            openai_result = None
-        elif openai_result:
-            update_progress(analysis_id, "openai_complete", 75, f"Commercial analysis complete! Score: {openai_result.score}/10", {
-                "score": openai_result.score,
-                "recommendation": openai_result.recommendation,
-                "cost": f"${openai_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "openai_skipped", 75, "Commercial analysis skipped (service unavailable)")
-        
-        # Handle GPT-5 result
-        if isinstance(gpt5_result, Exception):
-            logger.error(f"Excellence analysis failed: {gpt5_result}")
-            gpt5_result = None
-        elif gpt5_result:
-            update_progress(analysis_id, "gpt5_complete", 80, f"GPT-5 Writing Excellence complete! Score: {gpt5_result.score}/10", {
-                "score": gpt5_result.score,
-                "recommendation": gpt5_result.recommendation,
-                "reasoning_depth": gpt5_result.reasoning_depth,
-                "cost": f"${gpt5_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "gpt5_skipped", 80, "Excellence analysis skipped (service unavailable)")
-        
-        # Handle DeepSeek result
-        if isinstance(deepseek_result, Exception):
-            logger.error(f"DeepSeek analysis failed: {deepseek_result}")
-            deepseek_result = None
-        elif deepseek_result:
-            update_progress(analysis_id, "deepseek_complete", 82, f"Financial analysis complete! Score: {deepseek_result.overall_financial_score}/10", {
-                "financial_score": deepseek_result.overall_financial_score,
-                "recommendation": deepseek_result.recommendation,
-                "cost": f"${deepseek_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "deepseek_skipped", 82, "DeepSeek analysis skipped (API unavailable)")
-        
-        # Handle Perplexity result
-        if isinstance(perplexity_result, Exception):
-            logger.error(f"Perplexity research failed: {perplexity_result}")
-            perplexity_result = None
-        elif perplexity_result:
-            update_progress(analysis_id, "perplexity_complete", 84, f"Market research complete! Score: {perplexity_result.market_opportunity_score}/10", {
-                "market_score": perplexity_result.market_opportunity_score,
-                "recommendation": perplexity_result.market_recommendation,
-                "cost": f"${perplexity_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "perplexity_skipped", 84, "Perplexity research skipped (API unavailable)")
-        
-        # Handle Poster Collection result
-        if isinstance(poster_collection, Exception):
-            logger.error(f"Poster collection generation failed: {poster_collection}")
-            poster_collection = None
-        elif poster_collection and poster_collection.success_count > 0:
-            update_progress(analysis_id, "posters_complete", 85, f"Generated {poster_collection.success_count} movie posters!", {
-                "success_count": poster_collection.success_count,
-                "best_poster_url": poster_collection.best_poster_url,
-                "best_source": poster_collection.best_poster_source,
-                "total_cost": f"${poster_collection.total_cost:.4f}"
-            })
-        else:
-            reason = "Poster generation disabled" if not (POSTER_GENERATION_ENABLED and poster_manager is not None) else "Poster generation skipped (no APIs available)"
-            update_progress(analysis_id, "posters_skipped", 85, reason)
-        
-        # Convert to database format
-        update_progress(analysis_id, "saving", 92, "Saving analysis results to database...")
-        db_data = claude_analyzer.to_database_format(result)
-        
-        # Add Grok results if available
-        if grok_result:
-            grok_data = grok_analyzer.to_database_format(grok_result)
-            db_data.update(grok_data)
-        
-        # Add OpenAI results if available
-        if openai_result:
-            openai_data = openai_analyzer.to_database_format(openai_result)
-            db_data.update(openai_data)
-        
-        # Add GPT-5 results if available
-        if gpt5_result:
-            gpt5_data = gpt5_analyzer.to_database_format(gpt5_result)
-            db_data.update(gpt5_data)
-        
-        # Add DeepSeek results if available
-        if deepseek_result:
-            deepseek_data = deepseek_analyzer.to_database_format(deepseek_result)
-            db_data.update(deepseek_data)
-        
-        # Add Perplexity results if available
-        if perplexity_result:
-            perplexity_data = perplexity_analyzer.to_database_format(perplexity_result)
-            db_data.update(perplexity_data)
-        
-        # Add Poster Collection results if available
-        if poster_collection:
-            poster_data = poster_manager.to_database_format(poster_collection)
-            logger.info(f"🎨 Poster collection database data: {list(poster_data.keys())}")
-            logger.info(f"🎨 Poster success count: {poster_data.get('poster_success_count', 'MISSING')}")
-            logger.info(f"🎨 Poster best URL: {poster_data.get('poster_best_url', 'MISSING')[:100] if poster_data.get('poster_best_url') else 'MISSING'}...")
-            db_data.update(poster_data)
-        else:
-            logger.warning(f"⚠️ No poster collection data to save")
-        
-        # Add Source Material results if available
-        if source_result:
-            source_data = source_material_analyzer.to_database_format(source_result)
-            db_data.update(source_data)
-        
-        db_data.update({
-            'id': analysis_id,
-            'user_id': user_id,
-            'original_filename': None,
-            'file_path': None,
-            'file_size': len(screenplay_text),
-            # Budget information
-            'budget_category': budget_category,
-            'ai_budget_min': ai_budget_min,
-            'ai_budget_optimal': ai_budget_optimal,
-            'ai_budget_max': ai_budget_max,
-            'budget_notes': budget_notes
-        })
-        
-        # Update database record
-        logger.info(f"🔍 Saving analysis data: {list(db_data.keys())}")
-        
-        # Ensure all dict values are properly JSON serialized
-        import json
-        for key, value in db_data.items():
-            if isinstance(value, dict):
-                db_data[key] = json.dumps(value)
-            elif isinstance(value, list):
-                db_data[key] = json.dumps(value)
-        
-        if db.save_analysis(db_data):
-            total_cost = result.cost + (grok_result.cost if grok_result else 0) + (openai_result.cost if openai_result else 0) + (gpt5_result.cost if gpt5_result else 0) + (deepseek_result.cost if deepseek_result else 0) + (perplexity_result.cost if perplexity_result else 0) + (poster_collection.total_cost if poster_collection else 0) + (source_result.cost if source_result else 0)
-            update_progress(analysis_id, "complete", 100, "Analysis complete! Results saved successfully.", {
-                "claude_score": result.overall_score,
-                "grok_score": grok_result.score if grok_result else None,
-                "openai_score": openai_result.score if openai_result else None,
-                "gpt5_score": gpt5_result.score if gpt5_result else None,
-                "deepseek_score": deepseek_result.overall_financial_score if deepseek_result else None,
-                "perplexity_score": perplexity_result.market_opportunity_score if perplexity_result else None,
-                "total_cost": f"${total_cost:.4f}"
-            })
-            logger.info(f"✅ Text analysis completed: {analysis_id}")
-            
-            # Track API usage for all providers
-            cost_tracker.track_usage(
-                user_id=user_id,
-                analysis_id=analysis_id,
-                api_provider="anthropic",
-                model_name="claude-opus-4-1-20250805",
-                cost=result.cost,
-                processing_time=result.processing_time,
-                success=True
-            )
-            
-            if grok_result:
-                cost_tracker.track_usage(
-                    user_id=user_id,
-                    analysis_id=analysis_id,
-                    api_provider="xai",
-                    model_name="grok-4-latest",
-                    cost=grok_result.cost,
-                    processing_time=grok_result.processing_time,
-                    success=True
-                )
-            
-            if openai_result:
-                cost_tracker.track_usage(
-                    user_id=user_id,
-                    analysis_id=analysis_id,
-                    api_provider="openai",
-                    model_name="gpt-5",
-                    cost=openai_result.cost,
-                    processing_time=openai_result.processing_time,
-                    success=True
-                )
-        else:
-            raise Exception("Failed to save analysis results")
+        # Each result is reported as soon as its analyzer finishes, not after the slowest one
+        parallel_results = await run_parallel_analyses(
+            tasks, partial(report_parallel_result, analysis_id, TEXT_RESULT_SPECS), 55, 85
+        )
+        if 'posters' not in tasks:
+            update_progress(analysis_id, "posters_skipped", 85, "Poster generation disabled")
+        
+        await finalize_analysis(
+            analysis_id, user_id, "Text",
+            results={**parallel_results, 'claude': result, 'source': source_result},
+            record={
+                'id': analysis_id,
+                'user_id': user_id,
+                'original_filename': None,
+                'file_path': None,
+                'file_size': len(screenplay_text),
+                # Budget information
+                'budget_category': budget_category,
+                'ai_budget_min': ai_budget_min,
+                'ai_budget_optimal': ai_budget_optimal,
+                'ai_budget_max': ai_budget_max,
+                'budget_notes': budget_notes
+            },
+            saving_progress=92,
+            tracked_usage=('claude', 'grok', 'openai'),
+            cache_key=cache_key
+        )
             
     except Exception as e:
         logger.error(f"❌ Text analysis failed: {analysis_id} - {e}")
         update_progress(analysis_id, "error", 0, f"Analysis failed: {str(e)}", {"error": str(e)})
-        db.update_analysis_status(analysis_id, 'error', str(e))
+        await asyncio.to_thread(db.update_analysis_status, analysis_id, 'error', str(e))
         
         # Track failed usage
         cost_tracker.track_usage(
@@ -966,12 +1139,13 @@ async def process_text_analysis(
 
 async def process_pdf_analysis(
     analysis_id: str,
-    file_content: bytes,
+    file_path: str,
     filename: str,
     title: str,
     genre: Optional[str],
     user_id: str,
-    budget_estimate: Optional[float]
+    budget_estimate: Optional[float],
+    cache_key: Optional[str] = None
 ):
     """Background task to process PDF analysis"""
     
@@ -984,7 +1158,10 @@ async def process_pdf_analysis(
     try:
         # Extract text from PDF
         update_progress(analysis_id, "pdf_processing", 10, "Extracting text from PDF...")
+        # Read the saved upload only once the analysis holds a queue slot
+        file_content = await pdf_processor.read_saved_file(file_path)
         pdf_result = await pdf_processor.process_pdf(file_content, filename)
+        del file_content
         
         if not pdf_result.success:
             raise Exception(f"PDF processing failed: {pdf_result.error_message}")
@@ -997,7 +1174,7 @@ async def process_pdf_analysis(
             "model": "gpt-4o",
             "estimated_time": "10-15 seconds"
         })
-        source_result = await source_material_analyzer.analyze_source_material(
+        source_result = await get_source_material_analyzer().analyze_source_material(
             screenplay_text=pdf_result.extracted_text,
             title=title
         )
@@ -1065,7 +1242,7 @@ async def process_pdf_analysis(
                 "model": "claude-opus-4-1-20250805",
                 "estimated_time": "60-90 seconds (with retries if overloaded)"
             })
-            result = await claude_analyzer.analyze_screenplay(
+            result = await get_claude_analyzer().analyze_screenplay(
                 screenplay_text=pdf_result.extracted_text,
                 title=title,
                 genre=genre,
@@ -1112,10 +1289,10 @@ async def process_pdf_analysis(
         })
         
         # Create parallel tasks
-        tasks = []
+        tasks: Dict[str, Any] = {}
         
         # Grok analysis task
-        tasks.append(grok_analyzer.analyze(
+        tasks['grok'] = gated("xai", get_grok_analyzer().analyze(
             screenplay_text=pdf_result.extracted_text,
             title=title,
             genre=genre or (result.genre if result else "Drama"),
@@ -1123,7 +1300,7 @@ async def process_pdf_analysis(
         ))
         
         # OpenAI analysis task
-        tasks.append(openai_analyzer.analyze(
+        tasks['openai'] = gated("openai", get_openai_analyzer().analyze(
             screenplay_text=pdf_result.extracted_text,
             title=title,
             genre=genre or (result.genre if result else "Drama"),
@@ -1131,7 +1308,7 @@ async def process_pdf_analysis(
         ))
         
         # GPT-5 Writing Excellence analysis task
-        tasks.append(gpt5_analyzer.analyze(
+        tasks['gpt5'] = gated("openai", get_gpt5_analyzer().analyze(
             screenplay_text=pdf_result.extracted_text,
             title=title,
             genre=genre or (result.genre if result else "Drama"),
@@ -1139,7 +1316,7 @@ async def process_pdf_analysis(
         ))
         
         # DeepSeek financial analysis task (enhanced with incentive data)
-        tasks.append(deepseek_analyzer.analyze_financial_potential(
+        tasks['deepseek'] = gated("deepseek", get_deepseek_analyzer().analyze_financial_potential(
             screenplay_text=pdf_result.extracted_text,
             title=title,
             genre=genre or (result.genre if result else "Drama"),
@@ -1149,7 +1326,7 @@ async def process_pdf_analysis(
         ))
         
         # Perplexity market research task
-        tasks.append(perplexity_analyzer.research_market_intelligence(
+        tasks['perplexity'] = gated("perplexity", get_perplexity_analyzer().research_market_intelligence(
             title=title,
             genre=genre or (result.genre if result else "Drama"),
             release_timeframe="next_12_months",
@@ -1158,8 +1335,8 @@ async def process_pdf_analysis(
         ))
         
         # Enhanced poster collection generation task (feature-flagged)
-        if POSTER_GENERATION_ENABLED and poster_manager is not None:
-            tasks.append(poster_manager.generate_poster_collection(
+        if POSTER_GENERATION_ENABLED and get_poster_manager() is not None:
+            tasks['posters'] = gated("posters", get_poster_manager().generate_poster_collection(
                 title=title,
                 genre=genre or (result.genre if result else "Drama"),
                 analysis_data={
@@ -1170,186 +1347,41 @@ async def process_pdf_analysis(
                     'main_characters': getattr(result, 'main_characters', []) if result else []
                 },
                 variations=['theatrical', 'character']  # Generate 2 main variations
-            ))
+            ), shared=False)
         
-        # Execute all tasks in parallel
         logger.info(f"🔧 Executing {len(tasks)} parallel tasks...")
-        parallel_results = await asyncio.gather(*tasks, return_exceptions=True)
-        logger.info(f"🔧 Parallel results count: {len(parallel_results)}")
-        if POSTER_GENERATION_ENABLED and poster_manager is not None:
-            grok_result, openai_result, gpt5_result, deepseek_result, perplexity_result, poster_collection = parallel_results
-        else:
-            grok_result, openai_result, gpt5_result, deepseek_result, perplexity_result = parallel_results
-            poster_collection = None
-        logger.info(f"🔧 Poster collection type: {type(poster_collection)}")
-        logger.info(f"🔧 Poster collection is Exception: {isinstance(poster_collection, Exception)}")
-        if hasattr(poster_collection, 'success_count'):
-            logger.info(f"🔧 Poster collection success count: {poster_collection.success_count}")
-        
-        # Handle Grok result
-        if isinstance(grok_result, Exception):
-            logger.error(f"Reality check analysis failed: {grok_result}")
-            grok_result = None
-        elif grok_result:
-            update_progress(analysis_id, "grok_complete", 70, f"Reality check complete! Score: {grok_result.score}/10", {
-                "score": grok_result.score,
-                "recommendation": grok_result.recommendation,
-                "cost": f"${grok_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "grok_skipped", 70, "Reality check skipped (service unavailable)")
-        
-        # Handle OpenAI result
-        if isinstance(openai_result, Exception):
-            logger.error(f"Commercial analysis failed: {openai_result}")
-            openai_result = None
-        elif openai_result:
-            update_progress(analysis_id, "openai_complete", 75, f"Commercial analysis complete! Score: {openai_result.score}/10", {
-                "score": openai_result.score,
-                "recommendation": openai_result.recommendation,
-                "cost": f"${openai_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "openai_skipped", 75, "Commercial analysis skipped (service unavailable)")
-        
-        # Handle GPT-5 result
-        if isinstance(gpt5_result, Exception):
-            logger.error(f"Excellence analysis failed: {gpt5_result}")
-            gpt5_result = None
-        elif gpt5_result:
-            update_progress(analysis_id, "gpt5_complete", 78, f"Excellence analysis complete! Score: {gpt5_result.score}/10", {
-                "score": gpt5_result.score,
-                "recommendation": gpt5_result.recommendation,
-                "reasoning_depth": gpt5_result.reasoning_depth,
-                "cost": f"${gpt5_result.cost:.4f}"
-            })
-        else:
-            update_progress(analysis_id, "gpt5_skipped", 78, "GPT-5 analysis skipped (API unavailable)")
-        
-        # Handle Poster Collection result
-        if isinstance(poster_collection, Exception):
-            logger.error(f"Poster collection generation failed: {poster_collection}")
-            poster_collection = None
-        elif poster_collection and poster_collection.success_count > 0:
-            update_progress(analysis_id, "posters_complete", 80, f"Generated {poster_collection.success_count} movie posters!", {
-                "success_count": poster_collection.success_count,
-                "best_poster_url": poster_collection.best_poster_url,
-                "best_source": poster_collection.best_poster_source,
-                "total_cost": f"${poster_collection.total_cost:.4f}"
-            })
-        else:
-            reason = "Poster generation disabled" if not (POSTER_GENERATION_ENABLED and poster_manager is not None) else "Poster generation skipped (no APIs available)"
-            update_progress(analysis_id, "posters_skipped", 80, reason)
-        
-        # Convert to database format
-        update_progress(analysis_id, "saving", 90, "Saving analysis results to database...")
-        db_data = claude_analyzer.to_database_format(result)
-        
-        # Add Grok results if available
-        if grok_result:
-            grok_data = grok_analyzer.to_database_format(grok_result)
-            db_data.update(grok_data)
-        
-        # Add OpenAI results if available
-        if openai_result:
-            openai_data = openai_analyzer.to_database_format(openai_result)
-            db_data.update(openai_data)
-        
-        # Add GPT-5 results if available
-        if gpt5_result:
-            gpt5_data = gpt5_analyzer.to_database_format(gpt5_result)
-            db_data.update(gpt5_data)
-        
-        # Add DeepSeek results if available
-        if deepseek_result:
-            deepseek_data = deepseek_analyzer.to_database_format(deepseek_result)
-            db_data.update(deepseek_data)
-        
-        # Add Perplexity results if available
-        if perplexity_result:
-            perplexity_data = perplexity_analyzer.to_database_format(perplexity_result)
-            db_data.update(perplexity_data)
-        
-        # Add Poster Collection results if available
-        if poster_collection:
-            poster_data = poster_manager.to_database_format(poster_collection)
-            logger.info(f"🎨 Poster collection database data: {list(poster_data.keys())}")
-            logger.info(f"🎨 Poster success count: {poster_data.get('poster_success_count', 'MISSING')}")
-            logger.info(f"🎨 Poster best URL: {poster_data.get('poster_best_url', 'MISSING')[:100] if poster_data.get('poster_best_url') else 'MISSING'}...")
-            db_data.update(poster_data)
-        else:
-            logger.warning(f"⚠️ No poster collection data to save")
-        
-        # Add Source Material results if available
-        if source_result:
-            source_data = source_material_analyzer.to_database_format(source_result)
-            db_data.update(source_data)
-        
-        db_data.update({
-            'id': analysis_id,
-            'user_id': user_id,
-            'original_filename': filename,
-            'file_path': f"uploads/{user_id}_{int(time.time())}_{filename}",
-            'file_size': len(file_content),
-            # Budget information
-            'budget_category': budget_category,
-            'ai_budget_min': ai_budget_min,
-            'ai_budget_optimal': ai_budget_optimal,
-            'ai_budget_max': ai_budget_max,
-            'budget_notes': budget_notes
-        })
-        
-        # Update database record
-        # Ensure all dict values are properly JSON serialized
-        import json
-        for key, value in db_data.items():
-            if isinstance(value, dict):
-                db_data[key] = json.dumps(value)
-            elif isinstance(value, list):
-                db_data[key] = json.dumps(value)
-        
-        if db.save_analysis(db_data):
-            total_cost = result.cost + (grok_result.cost if grok_result else 0) + (openai_result.cost if openai_result else 0) + (gpt5_result.cost if gpt5_result else 0) + (deepseek_result.cost if deepseek_result else 0) + (perplexity_result.cost if perplexity_result else 0) + (poster_collection.total_cost if poster_collection else 0) + (source_result.cost if source_result else 0)
-            update_progress(analysis_id, "complete", 100, "Analysis complete! Results saved successfully.", {
-                "claude_score": result.overall_score,
-                "grok_score": grok_result.score if grok_result else None,
-                "openai_score": openai_result.score if openai_result else None,
-                "gpt5_score": gpt5_result.score if gpt5_result else None,
-                "deepseek_score": deepseek_result.overall_financial_score if deepseek_result else None,
-                "perplexity_score": perplexity_result.market_opportunity_score if perplexity_result else None,
-                "total_cost": f"${total_cost:.4f}"
-            })
-            logger.info(f"✅ PDF analysis completed: {analysis_id}")
-            
-            # Track Claude API usage
-            cost_tracker.track_usage(
-                user_id=user_id,
-                analysis_id=analysis_id,
-                api_provider="anthropic",
-                model_name="claude-opus-4-1-20250805",
-                cost=result.cost,
-                processing_time=result.processing_time,
-                success=True
-            )
-            
-            # Track Grok API usage if available
-            if grok_result:
-                cost_tracker.track_usage(
-                    user_id=user_id,
-                    analysis_id=analysis_id,
-                    api_provider="xai",
-                    model_name="grok-4-latest",
-                    cost=grok_result.cost,
-                    processing_time=grok_result.processing_time,
-                    success=True
-                )
-        else:
-            raise Exception("Failed to save analysis results")
+        # Each result is reported as soon as its analyzer finishes, not after the slowest one
+        parallel_results = await run_parallel_analyses(
+            tasks, partial(report_parallel_result, analysis_id, PDF_RESULT_SPECS), 55, 80
+        )
+        if 'posters' not in tasks:
+            update_progress(analysis_id, "posters_skipped", 80, "Poster generation disabled")
+        
+        await finalize_analysis(
+            analysis_id, user_id, "PDF",
+            results={**parallel_results, 'claude': result, 'source': source_result},
+            record={
+                'id': analysis_id,
+                'user_id': user_id,
+                'original_filename': filename,
+                'file_path': file_path,
+                'file_size': pdf_result.file_size,
+                # Budget information
+                'budget_category': budget_category,
+                'ai_budget_min': ai_budget_min,
+                'ai_budget_optimal': ai_budget_optimal,
+                'ai_budget_max': ai_budget_max,
+                'budget_notes': budget_notes
+            },
+            saving_progress=90,
+            tracked_usage=('claude', 'grok'),
+            cache_key=cache_key
+        )
             
     except Exception as e:
         logger.error(f"❌ PDF analysis failed: {analysis_id} - {e}")
         update_progress(analysis_id, "error", 0, f"Analysis failed: {str(e)}", {"error": str(e)})
-        db.update_analysis_status(analysis_id, 'error', str(e))
+        await asyncio.to_thread(db.update_analysis_status, analysis_id, 'error', str(e))
         
         # Track failed usage
         cost_tracker.track_usage(
@@ -1456,7 +1488,7 @@ async def incentive_calculator(budget: float, min_percentage: float = 15.0):
         
         logger.info(f"💰 Calculated incentives for ${budget:,.0f} budget - found {len(savings_data)} options")
         
-        return {
+        return AppJSONResponse({
             "success": True,
             "budget": budget,
             "min_percentage": min_percentage,
@@ -1467,7 +1499,7 @@ async def incentive_calculator(budget: float, min_percentage: float = 15.0):
                 "best_location": f"{best_savings['country']}, {best_savings['region']}" if best_savings and best_savings['region'] else best_savings['country'] if best_savings else None,
                 "total_potential_savings": total_potential_savings
             }
-        }
+        })
         
     except HTTPException:
         raise
@@ -1484,11 +1516,11 @@ async def get_analysis_incentives(analysis_id: str):
         
         logger.info(f"📊 Retrieved incentive data for analysis {analysis_id}")
         
-        return {
+        return AppJSONResponse({
             "success": True,
             "analysis_id": analysis_id,
             "incentive_data": incentive_data
-        }
+        })
         
     except Exception as e:
         logger.error(f"❌ Error retrieving incentives for analysis {analysis_id}: {e}")
@@ -1515,7 +1547,7 @@ async def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
         # Return basic dashboard stats
-        total_analyses = len(await get_user_analyses("default"))
+        total_analyses = len(await asyncio.to_thread(db.get_user_analyses, "default"))
         
         return {
             "success": True,
@@ -1536,8 +1568,10 @@ async def get_dashboard_stats():
 @app.get("/api/grants")
 async def get_all_grants(active_only: bool = True, grant_type: Optional[str] = None):
     """Get all film grants and awards"""
+    connection = None
     try:
-        cursor = incentive_db.get_connection().cursor(dictionary=True)
+        connection = incentive_db.get_connection()
+        cursor = connection.cursor(dictionary=True)
         
         query = """
             SELECT id, name, organization, country, region, grant_type, 
@@ -1571,20 +1605,20 @@ async def get_all_grants(active_only: bool = True, grant_type: Optional[str] = N
             # Parse JSON fields
             if row['eligibility_requirements']:
                 try:
-                    row['eligibility_requirements'] = json.loads(row['eligibility_requirements']) if isinstance(row['eligibility_requirements'], str) else row['eligibility_requirements']
-                except (json.JSONDecodeError, TypeError):
+                    row['eligibility_requirements'] = orjson.loads(row['eligibility_requirements']) if isinstance(row['eligibility_requirements'], str) else row['eligibility_requirements']
+                except (orjson.JSONDecodeError, TypeError):
                     row['eligibility_requirements'] = {}
             
             if row['target_demographics']:
                 try:
-                    row['target_demographics'] = json.loads(row['target_demographics']) if isinstance(row['target_demographics'], str) else row['target_demographics']
-                except (json.JSONDecodeError, TypeError):
+                    row['target_demographics'] = orjson.loads(row['target_demographics']) if isinstance(row['target_demographics'], str) else row['target_demographics']
+                except (orjson.JSONDecodeError, TypeError):
                     row['target_demographics'] = []
             
             if row['genre_focus']:
                 try:
-                    row['genre_focus'] = json.loads(row['genre_focus']) if isinstance(row['genre_focus'], str) else row['genre_focus']
-                except (json.JSONDecodeError, TypeError):
+                    row['genre_focus'] = orjson.loads(row['genre_focus']) if isinstance(row['genre_focus'], str) else row['genre_focus']
+                except (orjson.JSONDecodeError, TypeError):
                     row['genre_focus'] = []
             
             grants.append(row)
@@ -1600,6 +1634,9 @@ async def get_all_grants(active_only: bool = True, grant_type: Optional[str] = N
     except Exception as e:
         logger.error(f"❌ Error retrieving grants: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve grants: {str(e)}")
+    finally:
+        if connection:
+            connection.close()
 
 @app.get("/api/grants/eligibility")
 async def check_grant_eligibility(
@@ -1610,8 +1647,10 @@ async def check_grant_eligibility(
     location: Optional[str] = None
 ):
     """Check grant eligibility based on filmmaker and project criteria"""
+    connection = None
     try:
-        cursor = incentive_db.get_connection().cursor(dictionary=True)
+        connection = incentive_db.get_connection()
+        cursor = connection.cursor(dictionary=True)
         
         query = """
             SELECT id, name, organization, country, region, grant_type, 
@@ -1638,12 +1677,12 @@ async def check_grant_eligibility(
             
             try:
                 if grant['target_demographics']:
-                    target_demographics = json.loads(grant['target_demographics']) if isinstance(grant['target_demographics'], str) else grant['target_demographics']
+                    target_demographics = orjson.loads(grant['target_demographics']) if isinstance(grant['target_demographics'], str) else grant['target_demographics']
                 if grant['genre_focus']:
-                    genre_focus = json.loads(grant['genre_focus']) if isinstance(grant['genre_focus'], str) else grant['genre_focus']
+                    genre_focus = orjson.loads(grant['genre_focus']) if isinstance(grant['genre_focus'], str) else grant['genre_focus']
                 if grant['eligibility_requirements']:
-                    requirements = json.loads(grant['eligibility_requirements']) if isinstance(grant['eligibility_requirements'], str) else grant['eligibility_requirements']
-            except (json.JSONDecodeError, TypeError):
+                    requirements = orjson.loads(grant['eligibility_requirements']) if isinstance(grant['eligibility_requirements'], str) else grant['eligibility_requirements']
+            except (orjson.JSONDecodeError, TypeError):
                 pass
             
             # Check demographics match
@@ -1703,6 +1742,9 @@ async def check_grant_eligibility(
     except Exception as e:
         logger.error(f"❌ Error checking grant eligibility: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to check grant eligibility: {str(e)}")
+    finally:
+        if connection:
+            connection.close()
 
 # ==================== AUTH ENDPOINTS REMOVED ====================
 # Auth is now handled by SvelteKit endpoints in src/routes/api/auth/
@@ -1715,12 +1757,24 @@ if __name__ == "__main__":
     # Get port from environment or default to 8001
     port = int(os.getenv("SERVICE_PORT", 8001))
     
-    logger.info(f"🚀 Starting Quilty Screenplay Analysis Service on port {port}")
+    # One worker unless SERVICE_WORKERS says otherwise. Every limit in this module is per process:
+    # the analysis queue (3 analyses), the analyzer/provider semaphores, the 20-connection analysis
+    # pool and the 8-connection incentive pool. N workers multiply all of them by N, so size
+    # SERVICE_WORKERS against MySQL max_connections (default 151) and provider rate limits.
+    # More than one worker also needs REDIS_URL so progress streams can see every worker's analyses.
+    workers = int(os.getenv("SERVICE_WORKERS", "1"))
+    if workers > 1 and not os.getenv("REDIS_URL"):
+        logger.warning("⚠️ SERVICE_WORKERS > 1 without REDIS_URL: progress streams only see their own worker's analyses")
+    
+    logger.info(f"🚀 Starting Quilty Screenplay Analysis Service on port {port} ({workers} worker(s))")
     
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         reload=False,  # Disable reload to prevent constant crashes
         log_level="info"
     )
@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
+from api_retry import post_with_backoff
 from budget_utils import format_budget_context_for_ai, estimate_budget_from_screenplay, get_casting_suggestions_by_budget
 
 load_dotenv()
@@ -44,7 +46,8 @@ class OpenAIResult:
 class OpenAIAnalyzer:
     """OpenAI ChatGPT-5 API integration for screenplay analysis"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_url = "https://api.openai.com/v1/chat/completions"
         self.dalle_url = "https://api.openai.com/v1/images/generations"
@@ -276,22 +279,25 @@ Provide analysis as JSON with these exact keys:
             "stream": False
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                self.api_url,
-                headers=headers,
-                json=payload
-            )
+        client = self._http_client or get_shared_http_client()
+        response = await post_with_backoff(
+            client,
+            self.api_url,
+            "OpenAI",
+            headers=headers,
+            json=payload,
+            timeout=60.0
+        )
             
-            if response.status_code != 200:
-                raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
+        if response.status_code != 200:
+            raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
             
-            data = response.json()
+        data = response.json()
             
-            if 'choices' not in data or not data['choices']:
-                raise Exception("Invalid OpenAI API response format")
+        if 'choices' not in data or not data['choices']:
+            raise Exception("Invalid OpenAI API response format")
             
-            return data['choices'][0]['message']['content']
+        return data['choices'][0]['message']['content']
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse OpenAI response into structured data"""
@@ -732,24 +738,24 @@ Provide analysis as JSON with these exact keys:
                 "style": "vivid"      # More cinematic and dramatic
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(self.dalle_url, headers=headers, json=payload)
+            client = self._http_client or get_shared_http_client()
+            response = await client.post(self.dalle_url, headers=headers, json=payload, timeout=60.0)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('data') and len(result['data']) > 0:
-                        image_url = result['data'][0]['url']
-                        logger.info(f"🎨 DALL-E 3 poster generated successfully")
-                        # Save image locally for reliable serving
-                        saved_url = await self._save_poster_image(image_url, title)
-                        return saved_url or image_url
-                    else:
-                        logger.error(f"❌ DALL-E 3 returned no image data")
-                        return None
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('data') and len(result['data']) > 0:
+                    image_url = result['data'][0]['url']
+                    logger.info(f"🎨 DALL-E 3 poster generated successfully")
+                    # Save image locally for reliable serving
+                    saved_url = await self._save_poster_image(image_url, title)
+                    return saved_url or image_url
                 else:
-                    error_text = response.text
-                    logger.error(f"❌ DALL-E 3 API error {response.status_code}: {error_text}")
+                    logger.error(f"❌ DALL-E 3 returned no image data")
                     return None
+            else:
+                error_text = response.text
+                logger.error(f"❌ DALL-E 3 API error {response.status_code}: {error_text}")
+                return None
                     
         except Exception as e:
             logger.error(f"❌ DALL-E 3 API call failed: {e}")
@@ -764,15 +770,15 @@ Provide analysis as JSON with these exact keys:
             safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip().replace(' ', '_')
             filename = f"openai_{safe_title}_{int(time.time())}.png"
             filepath = os.path.join(poster_dir, filename)
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(image_url)
-                if response.status_code == 200:
-                    with open(filepath, 'wb') as f:
-                        f.write(response.content)
-                    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                        relative_url = f"/uploads/posters/{filename}"
-                        logger.info(f"✅ OpenAI poster saved: {relative_url} ({os.path.getsize(filepath)} bytes)")
-                        return relative_url
+            client = self._http_client or get_shared_http_client()
+            response = await client.get(image_url, timeout=30.0)
+            if response.status_code == 200:
+                with open(filepath, 'wb') as f:
+                    f.write(response.content)
+                if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+                    relative_url = f"/uploads/posters/{filename}"
+                    logger.info(f"✅ OpenAI poster saved: {relative_url} ({os.path.getsize(filepath)} bytes)")
+                    return relative_url
         except Exception as e:
             logger.warning(f"⚠️  Failed to save OpenAI poster locally: {e}")
         return None
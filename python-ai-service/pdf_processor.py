@@ -5,11 +5,14 @@ Supports multiple extraction methods with fallback strategies
 
 import os
 import io
+import asyncio
 import logging
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import time
 from pathlib import Path
+import aiofiles
+import aiofiles.os
 
 # PDF processing libraries
 try:
@@ -35,6 +38,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 @dataclass
 class PDFProcessingResult:
     """Result from PDF processing"""
@@ -94,7 +100,8 @@ class PDFProcessor:
         for method_name, method_func in methods:
             try:
                 logger.info(f"🔄 Trying {method_name}...")
-                text, page_count = await method_func(pdf_content)
+                # Extraction is CPU-bound; keep it off the event loop so progress streams stay live
+                text, page_count = await asyncio.to_thread(method_func, pdf_content)
                 
                 if text and len(text.strip()) >= self.min_text_length:
                     processing_time = time.time() - start_time
@@ -127,7 +134,7 @@ class PDFProcessor:
             error_message="All extraction methods failed"
         )
     
-    async def _extract_with_pdfplumber(self, pdf_content: bytes) -> Tuple[str, int]:
+    def _extract_with_pdfplumber(self, pdf_content: bytes) -> Tuple[str, int]:
         """Extract text using pdfplumber (best for most PDFs)"""
         if not PDFPLUMBER_AVAILABLE:
             raise ImportError("pdfplumber not available")
@@ -145,7 +152,7 @@ class PDFProcessor:
         
         return '\n'.join(text_parts), page_count
     
-    async def _extract_with_pypdf2(self, pdf_content: bytes) -> Tuple[str, int]:
+    def _extract_with_pypdf2(self, pdf_content: bytes) -> Tuple[str, int]:
         """Extract text using PyPDF2 (fallback method)"""
         if not PYPDF2_AVAILABLE:
             raise ImportError("PyPDF2 not available")
@@ -162,7 +169,7 @@ class PDFProcessor:
         
         return '\n'.join(text_parts), page_count
     
-    async def _extract_with_ocr(self, pdf_content: bytes) -> Tuple[str, int]:
+    def _extract_with_ocr(self, pdf_content: bytes) -> Tuple[str, int]:
         """Extract text using OCR (for scanned PDFs)"""
         if not OCR_AVAILABLE:
             raise ImportError("OCR libraries not available")
@@ -224,6 +231,42 @@ class PDFProcessor:
         logger.info(f"💾 File saved: {file_path}")
         return str(file_path)
     
+    async def save_upload_stream(self, upload, filename: str, user_id: str, hasher) -> Tuple[str, int]:
+        """Stream an upload to disk in 1MB chunks, feeding hasher; raises ValueError past max_file_size"""
+        
+        uploads_dir = Path("uploads")
+        uploads_dir.mkdir(exist_ok=True)
+        
+        # Same naming as save_uploaded_file
+        timestamp = int(time.time())
+        safe_filename = "".join(c for c in filename if c.isalnum() or c in '._-')
+        file_path = uploads_dir / f"{user_id}_{timestamp}_{safe_filename}"
+        
+        file_size = 0
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > self.max_file_size:
+                        raise ValueError(f"File too large (max {self.max_file_size // (1024 * 1024)}MB)")
+                    hasher.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            # Never leave a partial upload behind
+            try:
+                await aiofiles.os.remove(file_path)
+            except OSError:
+                pass
+            raise
+        
+        logger.info(f"💾 File saved: {file_path} ({file_size:,} bytes)")
+        return str(file_path), file_size
+    
+    async def read_saved_file(self, file_path: str) -> bytes:
+        """Read a saved upload without blocking the event loop"""
+        async with aiofiles.open(file_path, 'rb') as f:
+            return await f.read()
+    
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Get information about a saved file"""
         try:
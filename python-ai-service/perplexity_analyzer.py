@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
+from api_retry import post_with_backoff
 
 load_dotenv()
 
@@ -46,7 +48,8 @@ class PerplexityResult:
 class PerplexityAnalyzer:
     """Simple Perplexity AI integration"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("PERPLEXITY_API_KEY")
         self.api_url = "https://api.perplexity.ai/chat/completions"
         self.model = "sonar"
@@ -155,18 +158,18 @@ Please provide specific examples, box office data where available, and actionabl
         }
         
         timeout = httpx.Timeout(connect=30.0, read=60.0, write=30.0, pool=30.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(self.api_url, headers=headers, json=payload)
+        client = self._http_client or get_shared_http_client()
+        response = await post_with_backoff(client, self.api_url, "Perplexity", headers=headers, json=payload, timeout=timeout)
             
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('choices') and len(result['choices']) > 0:
-                    return result['choices'][0]['message']['content']
-                else:
-                    raise Exception("No response content from Perplexity")
+        if response.status_code == 200:
+            result = response.json()
+            if result.get('choices') and len(result['choices']) > 0:
+                return result['choices'][0]['message']['content']
             else:
-                error_text = response.text
-                raise Exception(f"Perplexity API error {response.status_code}: {error_text}")
+                raise Exception("No response content from Perplexity")
+        else:
+            error_text = response.text
+            raise Exception(f"Perplexity API error {response.status_code}: {error_text}")
     
     def to_database_format(self, result: PerplexityResult) -> Dict[str, Any]:
         """Convert to database format"""
@@ -0,0 +1,152 @@
+"""
+Analysis Progress Store
+Progress snapshots shared between background analyses and SSE progress streams
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Set, Tuple, AsyncIterator, Callable, Awaitable
+
+import orjson
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Progress entries expire an hour after their last update; the in-process copy is also capped
+PROGRESS_TTL_SECONDS = 3600
+PROGRESS_MAX_LOCAL_ENTRIES = 10_000
+
+class ProgressStore:
+    """Progress by analysis ID; Redis-backed (any worker can stream) when configured, else in-process"""
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = PROGRESS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        # analysis ID -> (expires at, payload), kept in last-update order
+        self._local: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # One writer task per analysis drains its latest unsent snapshot, so Redis sees updates in order
+        self._outbox: Dict[str, Dict[str, Any]] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self._listeners: Dict[str, Set[asyncio.Event]] = {}
+        self._redis = None
+
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = redis.from_url(redis_url)
+            logger.info("📡 Progress store using Redis")
+        elif redis_url:
+            logger.warning("⚠️ REDIS_URL is set but the redis package is not installed; keeping progress in-process")
+
+    @staticmethod
+    def _key(analysis_id: str) -> str:
+        return f"progress:{analysis_id}"
+
+    def set(self, analysis_id: str, payload: Dict[str, Any]):
+        """Record progress; the Redis write/publish runs in the background so callers never wait on it"""
+        now = time.monotonic()
+        self._local.pop(analysis_id, None)  # Re-insert so the dict stays ordered by last update
+        self._local[analysis_id] = (now + self.ttl_seconds, payload)
+        self._prune_local(now)
+        for event in self._listeners.get(analysis_id, ()):
+            event.set()
+        if self._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (e.g. a sync caller); the local copy is all we can do
+        self._outbox[analysis_id] = payload  # Replaces any snapshot the writer hasn't sent yet
+        if analysis_id not in self._writers:
+            self._writers[analysis_id] = loop.create_task(self._drain(analysis_id))
+
+    def _prune_local(self, now: float):
+        """Drop expired (or excess) entries; the oldest update is always first, so this stops early"""
+        while self._local:
+            analysis_id, (expires_at, _) = next(iter(self._local.items()))
+            if expires_at > now and len(self._local) <= PROGRESS_MAX_LOCAL_ENTRIES:
+                break
+            del self._local[analysis_id]
+
+    async def _drain(self, analysis_id: str):
+        """Push queued snapshots for one analysis one at a time until none is left"""
+        try:
+            while analysis_id in self._outbox:
+                await self._push(analysis_id, self._outbox.pop(analysis_id))
+        finally:
+            # No await since the last outbox check, so a later set() always finds this gone and starts a writer
+            self._writers.pop(analysis_id, None)
+
+    async def _push(self, analysis_id: str, payload: Dict[str, Any]):
+        """Store the snapshot with a TTL and notify subscribed streams"""
+        key = self._key(analysis_id)
+        data = orjson.dumps(payload)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, data, ex=self.ttl_seconds)
+                pipe.publish(key, data)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Failed to publish progress for {analysis_id}: {e}")
+
+    async def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Latest progress snapshot, or None if the analysis is unknown"""
+        if self._redis is not None:
+            try:
+                data = await self._redis.get(self._key(analysis_id))
+                if data:
+                    return orjson.loads(data)
+            except Exception as e:
+                logger.error(f"❌ Failed to read progress for {analysis_id}: {e}")
+        entry = self._local.get(analysis_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    @asynccontextmanager
+    async def updates(self, analysis_id: str) -> AsyncIterator[Callable[[float], Awaitable[None]]]:
+        """Yield wait(timeout), which returns once progress may have changed or the timeout passes"""
+        if self._redis is None:
+            # One event per stream so concurrent streams of the same analysis don't clear each other's wakeups
+            event = asyncio.Event()
+            self._listeners.setdefault(analysis_id, set()).add(event)
+
+            async def wait(timeout: float):
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return
+                event.clear()
+
+            try:
+                yield wait
+            finally:
+                listeners = self._listeners.get(analysis_id)
+                if listeners is not None:
+                    listeners.discard(event)
+                    if not listeners:
+                        del self._listeners[analysis_id]
+            return
+
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self._key(analysis_id))
+
+        async def wait(timeout: float):
+            await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+
+        try:
+            yield wait
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def close(self):
+        """Flush pending writes and close the Redis connection"""
+        if self._writers:
+            await asyncio.gather(*self._writers.values(), return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import httpx
 from dotenv import load_dotenv
+from http_client import get_shared_http_client
 
 load_dotenv()
 
@@ -44,7 +45,8 @@ class SourceMaterialResult:
 class SourceMaterialAnalyzer:
     """AI-powered source material detection and analysis"""
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        self._http_client = http_client  # Defaults to the shared provider client
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.api_url = "https://api.openai.com/v1/chat/completions"
         self.model = "gpt-4o"  # Use GPT-4o for better text analysis
@@ -261,18 +263,18 @@ Be thorough but concise. If no clear source material is indicated, mark as "orig
                 "response_format": {"type": "json_object"}
             }
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(self.api_url, headers=headers, json=payload)
+            client = self._http_client or get_shared_http_client()
+            response = await client.post(self.api_url, headers=headers, json=payload, timeout=60.0)
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('choices') and len(result['choices']) > 0:
-                        return result['choices'][0]['message']['content']
-                    else:
-                        raise Exception("No response content from OpenAI")
+            if response.status_code == 200:
+                result = response.json()
+                if result.get('choices') and len(result['choices']) > 0:
+                    return result['choices'][0]['message']['content']
                 else:
-                    error_text = response.text
-                    raise Exception(f"OpenAI API error {response.status_code}: {error_text}")
+                    raise Exception("No response content from OpenAI")
+            else:
+                error_text = response.text
+                raise Exception(f"OpenAI API error {response.status_code}: {error_text}")
                     
         except Exception as e:
             logger.error(f"❌ OpenAI API call failed: {e}")
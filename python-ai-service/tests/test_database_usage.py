@@ -0,0 +1,62 @@
+"""Tests for the batched API usage writes in ScreenplayDatabase"""
+
+import re
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from database import ScreenplayDatabase, _INSERT_API_USAGE_SQL, _UPSERT_USER_USAGE_SUMMARY_SQL
+
+_VALUES_GROUP = re.compile(r"VALUES\s*\((.*?)\)\s*(?:ON DUPLICATE|$)", re.I | re.S)
+
+class FakeCursor:
+    """Records statements and enforces mysql-connector's parameter rules
+
+    executemany() on an INSERT is rewritten into a multi-row insert built from the
+    VALUES(...) group only, so every parameter has to belong to that group.
+    """
+
+    def __init__(self):
+        self.executed = []
+        self.executed_many = []
+
+    def execute(self, operation, params=()):
+        assert operation.count("%s") == len(params), "Not all parameters were used in the SQL statement"
+        self.executed.append((operation, params))
+
+    def executemany(self, operation, seq_params):
+        values_group = _VALUES_GROUP.search(operation).group(1)
+        named = set(re.findall(r"%\((\w+)\)s", values_group))
+        for params in seq_params:
+            if isinstance(params, dict):
+                assert named <= params.keys()
+            else:
+                assert values_group.count("%s") == len(params), "Not all parameters were used in the SQL statement"
+        self.executed_many.append((operation, list(seq_params)))
+
+def _usage_row(user_id, cost, tokens):
+    return {
+        'user_id': user_id, 'analysis_id': 'text_1', 'api_provider': 'anthropic',
+        'model_name': 'claude', 'input_tokens': tokens, 'output_tokens': 0,
+        'total_tokens': tokens, 'cost': cost, 'request_type': 'screenplay_analysis',
+        'processing_time': 1.0, 'success': True, 'error_message': None
+    }
+
+def test_write_api_usage_batches_rows_and_upserts_summary_per_user():
+    cursor = FakeCursor()
+    rows = [_usage_row('alice', 0.5, 10), _usage_row('alice', 0.25, 5), _usage_row('bob', 1.0, 7)]
+
+    ScreenplayDatabase._write_api_usage(cursor, rows)
+
+    assert cursor.executed_many == [(_INSERT_API_USAGE_SQL, rows)]
+    assert [op for op, _ in cursor.executed] == [_UPSERT_USER_USAGE_SUMMARY_SQL] * 2
+    alice, bob = (params for _, params in cursor.executed)
+    assert alice[:4] == ('alice', 2, 0.75, 15)
+    assert bob[:4] == ('bob', 1, 1.0, 7)
+
+def test_write_api_usage_without_rows_does_nothing():
+    cursor = FakeCursor()
+    ScreenplayDatabase._write_api_usage(cursor, [])
+    assert cursor.executed == [] and cursor.executed_many == []
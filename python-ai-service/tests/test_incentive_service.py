@@ -0,0 +1,45 @@
+"""Tests for location matching in IncentiveLookupService"""
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+pytest.importorskip("dotenv")
+
+from incentive_service import IncentiveLookupService
+
+def _incentive(country, region=None):
+    return {
+        'country': country, 'region': region, 'percentage': 10.0, 'final_savings': 100000.0,
+        'qualifying_spend': 1000000.0, 'requirements': {}, 'processing_time_days': None
+    }
+
+def _location_scores(incentives, locations):
+    service = IncentiveLookupService.__new__(IncentiveLookupService)  # Scoring needs no DB pool
+    enhanced = service._enhance_incentive_analysis(incentives, None, locations, None)
+    return {(row['country'], row['region']): row['location_match_score'] for row in enhanced}
+
+def test_empty_country_matches_any_location():
+    scores = _location_scores([_incentive(''), _incentive('Canada')], ['Atlanta, Georgia'])
+    assert scores[('', None)] == 1.2
+    assert scores[('Canada', None)] == 0.8
+
+def test_region_match_and_empty_region():
+    scores = _location_scores(
+        [_incentive('United States', 'Georgia'), _incentive('France', '')],
+        ['Atlanta, Georgia']
+    )
+    assert scores[('United States', 'Georgia')] == 1.2
+    assert scores[('France', '')] == 0.8
+
+def test_cached_analysis_echoes_each_callers_genre(monkeypatch):
+    import incentive_service
+
+    monkeypatch.setattr(incentive_service, '_optimal_incentives_cache', {})
+    monkeypatch.setattr(incentive_service, 'find_best_incentives_for_budget', lambda *a, **k: [_incentive('Canada')])
+    service = IncentiveLookupService.__new__(IncentiveLookupService)
+
+    first = service.find_optimal_incentives_for_production(1000000.0, genre='Horror')
+    second = service.find_optimal_incentives_for_production(1000000.0, genre='horror')
+
+    assert first['genre'] == 'Horror'
+    assert second['genre'] == 'horror'